@@ -0,0 +1,541 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import defaultdict
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pdf_parser import get_worker_context, parse_fields_from_text, write_to_csv
+from multi_backend import suppress_stdout, extract_with_fallback, parse_backend_list
+from page_isolation import get_worker_sandbox, extract_pages_isolated
+from parser_metrics import ParseMetrics, write_prometheus
+from field_record import page_line_starts
+from text_store import TextStore, document_key
+from document_triage import triage_document, write_manifest
+from document_profiles import select_profile
+from page_router import extract_pages_routed, route_summary
+from page_headers import strip_running_lines
+from page_store import get_page_store
+from parse_cache import get_parse_cache
+from batch_scheduler import plan_tasks, choose_workers, schedule_report
+
+_verbose = False
+_text_stores = {}
+
+def _init_worker(verbose):
+    """Process pool initializer: builds the worker's ExtractionContext up front."""
+    global _verbose
+    _verbose = verbose
+    get_worker_context()
+
+def _quiet():
+    """Silences the parser's DEBUG output unless the batch was started with --verbose."""
+    return suppress_stdout(_verbose)
+
+def _stored_pages(store_path, pdf_path):
+    """Reads a document's pages from this process's mapping of the text store."""
+    store = _text_stores.get(store_path)
+    if store is None:
+        store = _text_stores[store_path] = TextStore(store_path)
+    else:
+        # A document stored again since the last read must not be served from its old offsets.
+        store.refresh_if_changed()
+    doc = document_key(pdf_path)
+    if doc not in store:
+        raise KeyError(f"'{doc}' is not in the text store '{store_path}'")
+    return store.pages(doc)
+
+def process_document(pdf_path, csv_path, backends=None, concurrent_backends=False,
+                     page_timeout=None, page_rss_limit_mb=None, collect_metrics=False, from_store=None,
+                     triage=False, return_pages=False, route_pages=False, strip_headers=False,
+                     dedupe_pages=False, page_store=None, parse_cache=None):
+    """
+    Extracts, parses and writes one PDF using this process's long-lived ExtractionContext.
+
+    With `backends`, the document goes through multi_backend.extract_with_fallback instead
+    and the record names the backend that won. With `page_timeout` or `page_rss_limit_mb`,
+    pages are extracted in this worker's PageSandbox and pages over the limits become
+    placeholders listed under 'page_failures'. With `collect_metrics`, the parser's branch
+    counters for the document are stored under 'parse_metrics' (pdfminer path only). With
+    `from_store`, the page texts are read from that text store instead of the PDF. With
+    `triage`, documents that do not look like data-file guides (see document_triage.py)
+    are rejected before extraction; the decision is stored under 'triage'. The default
+    pdfminer path then extracts from the document triage parsed, without interpreting
+    the sampled pages again. The document profile picked from the PDF's metadata (read
+    from the document the extraction opened; not available with `from_store`) and caption
+    style is stored under 'profile'.
+    With `return_pages`, the extracted page texts are returned under 'page_texts'. With
+    `route_pages`, simple pages are extracted with PyPDF2 and the rest with pdfminer (see
+    page_router.py); pages and seconds per backend are stored under 'routes'. With
+    `strip_headers`, running headers, footers and page numbers are blanked before parsing
+    (see page_headers.py) and the number of lines removed is stored under 'running_lines_removed'.
+    With `dedupe_pages`, pages already extracted by this worker (or found in the `page_store`
+    directory, which implies it) are copied instead of extracted again (see page_store.py).
+    With `parse_cache` (a parse_cache.py SQLite file), sections whose text and parser are
+    unchanged are not parsed again; the hits and misses are stored under 'parse_cache'.
+
+    Returns:
+        dict: A profile record for the document, including the worker's cache counters.
+    """
+    context = _use_page_store(dedupe_pages, page_store)
+    record = {'pdf_file': pdf_path, 'csv_file': csv_path, 'worker': os.getpid()}
+    with ExitStack() as stack:
+        sample = {}
+        if triage:
+            in_file = None
+            if not (backends or from_store or page_timeout or page_rss_limit_mb or route_pages):
+                # The default path goes on from the document triage parsed and the pages it sampled.
+                try:
+                    in_file = stack.enter_context(open(pdf_path, 'rb'))
+                except OSError:
+                    pass  # triage reports the file as unreadable
+            record['triage'] = triage_document(pdf_path, in_file=in_file, sample=sample)
+            if not record['triage']['accepted']:
+                record.update({'status': 'rejected', 'error': f"{record['triage']['reason']}: {record['triage']['detail']}"})
+                record['worker_stats'] = context.stats()
+                return record
+        if backends:
+            return _process_with_fallback(record, backends, concurrent_backends, context)
+        try:
+            t0 = time.perf_counter()
+            metadata = None
+            if from_store:
+                page_texts, skipped = _stored_pages(from_store, pdf_path), []
+            elif page_timeout or page_rss_limit_mb:
+                sandbox = get_worker_sandbox(page_timeout, page_rss_limit_mb)
+                page_texts, record['page_failures'] = extract_pages_isolated(pdf_path, sandbox)
+                skipped = list(sandbox.skipped_pages)
+                metadata = sandbox.metadata
+            elif route_pages:
+                page_texts, routes = extract_pages_routed(pdf_path, context)
+                record['routes'] = route_summary(routes)
+                skipped = [entry['page'] for entry in routes if entry['skipped']]
+                metadata = context.metadata
+            else:
+                if 'document' in sample:
+                    page_texts = context.extract_pages(in_file, sample['document'], sample['texts'])
+                else:
+                    with open(pdf_path, 'rb') as pdf_file:
+                        page_texts = context.extract_pages(pdf_file)
+                skipped = list(context.skipped_pages)
+                metadata = context.metadata
+            t1 = time.perf_counter()
+            record.update({
+                'pages': len(page_texts),
+                'pages_skipped': skipped,
+                'extract_seconds': round(t1 - t0, 4),
+            })
+            _parse_and_write(record, page_texts, collect_metrics, strip_headers, parse_cache, metadata)
+            if return_pages:
+                record['page_texts'] = page_texts
+        except Exception as e:
+            record.update({'status': 'error', 'error': str(e)})
+    record['worker_stats'] = context.stats()
+    return record
+
+def _parse_and_write(record, page_texts, collect_metrics=False, strip_headers=False, parse_cache=None, metadata=None):
+    """
+    Parses a document's page texts and writes its CSV, filling in the record's parse results.
+    The profile is picked from the text and `metadata` (the Title and Producer read when the
+    document was extracted), or from the text alone without it.
+    """
+    t1 = time.perf_counter()
+    csv_path = record['csv_file']
+    parse_pages = page_texts
+    if strip_headers:
+        parse_pages, header_report = strip_running_lines(page_texts)
+        record['running_lines_removed'] = header_report['lines_removed']
+    metrics = ParseMetrics() if collect_metrics else None
+    text = ''.join(parse_pages)
+    profile = select_profile(text, metadata)
+    cache = get_parse_cache(parse_cache) if parse_cache else None
+    before = (cache.hits, cache.misses) if cache else None
+    with _quiet():
+        structured_data = parse_fields_from_text(text, metrics, page_line_starts(parse_pages), profile, cache=cache)
+    t2 = time.perf_counter()
+    if cache is not None:
+        record['parse_cache'] = {'hits': cache.hits - before[0], 'misses': cache.misses - before[1]}
+    with _quiet():
+        written = write_to_csv(structured_data, csv_path) if structured_data else True
+    record.update({
+        'status': 'ok' if written else 'write_failed',
+        'fields': len(structured_data),
+        'profile': profile.name,
+        'parse_seconds': round(t2 - t1, 4),
+    })
+    if metrics is not None:
+        record['parse_metrics'] = metrics.summary()
+
+def _use_page_store(dedupe_pages, page_store):
+    """This process's ExtractionContext, with its page store set for the next document."""
+    context = get_worker_context()
+    context.page_store = get_page_store(page_store) if dedupe_pages or page_store else None
+    return context
+
+def extract_page_range(pdf_path, start, stop, dedupe_pages=False, page_store=None):
+    """
+    Extracts pages [start, stop) of a PDF with this process's ExtractionContext: one task
+    of a document the scheduler split into page ranges (see batch_scheduler.py). The
+    worker parses the file once for all of its ranges (ExtractionContext.open_page_range).
+
+    Returns:
+        dict: 'page_texts', 'pages_skipped' (1-based), 'metadata' (the document's Title and
+              Producer), 'extract_seconds', 'worker' and 'worker_stats', or 'error' if the
+              range could not be extracted.
+    """
+    context = _use_page_store(dedupe_pages, page_store)
+    result = {'worker': os.getpid()}
+    try:
+        t0 = time.perf_counter()
+        page_texts, skipped = [], []
+        for number, page in enumerate(context.open_page_range(pdf_path, start, stop), start + 1):
+            before = context.pages_skipped
+            page_texts.append(context.extract_page(page))
+            if context.pages_skipped != before:
+                skipped.append(number)
+        result.update({'page_texts': page_texts, 'pages_skipped': skipped, 'metadata': context.metadata,
+                       'extract_seconds': round(time.perf_counter() - t0, 4)})
+    except Exception as e:
+        result['error'] = str(e)
+    result['worker_stats'] = context.stats()
+    return result
+
+def _finish_split_document(pdf_path, csv_path, ranges, collect_metrics=False, strip_headers=False, parse_cache=None):
+    """Joins a split document's page ranges in page order, then parses and writes it in this process."""
+    ranges = [result for _, result in sorted(ranges, key=lambda item: item[0])]
+    last = ranges[-1]
+    record = {'pdf_file': pdf_path, 'csv_file': csv_path, 'worker': last['worker'],
+              'page_ranges': len(ranges), 'range_workers': sorted({r['worker'] for r in ranges})}
+    errors = [r['error'] for r in ranges if 'error' in r]
+    if errors:
+        record.update({'status': 'error', 'error': errors[0]})
+    else:
+        page_texts = [text for r in ranges for text in r['page_texts']]
+        record.update({
+            'pages': len(page_texts),
+            'pages_skipped': [page for r in ranges for page in r['pages_skipped']],
+            # Summed over the ranges: worker time, not the document's wall time.
+            'extract_seconds': round(sum(r['extract_seconds'] for r in ranges), 4),
+        })
+        try:
+            _parse_and_write(record, page_texts, collect_metrics, strip_headers, parse_cache, ranges[0].get('metadata'))
+        except Exception as e:
+            record.update({'status': 'error', 'error': str(e)})
+    record['worker_stats'] = last['worker_stats']
+    return record
+
+def _timed(fn, *args, **kwargs):
+    """Runs a pool task and returns (result, worker pid, start, end) for the schedule report."""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, os.getpid(), started, time.perf_counter()
+
+def _process_with_fallback(record, backends, concurrent_backends, context):
+    try:
+        t0 = time.perf_counter()
+        result = extract_with_fallback(record['pdf_file'], backends, concurrent=concurrent_backends, verbose=_verbose)
+        t1 = time.perf_counter()
+        rows = result['rows']
+        with _quiet():
+            written = write_to_csv(rows, record['csv_file']) if rows else True
+        record.update({
+            'status': ('ok' if result['backend'] else 'no_valid_backend') if written else 'write_failed',
+            'backend': result['backend'],
+            'attempts': result['attempts'],
+            'fields': len(rows),
+            'extract_seconds': round(t1 - t0, 4),
+        })
+    except Exception as e:
+        record.update({'status': 'error', 'error': str(e)})
+    record['worker_stats'] = context.stats()
+    return record
+
+def find_pdfs(input_dir):
+    """Returns the PDF files directly inside input_dir, sorted by name."""
+    return sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith('.pdf')
+    )
+
+def csv_path_for(pdf_path, output_dir):
+    base = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(output_dir, base + '.csv')
+
+def build_profile_report(records, wall_seconds):
+    """Aggregates per-document records into the profile report written by --profile_report."""
+    workers = {}
+    for record in records:
+        # Worker counters are cumulative, so the largest document count is the latest snapshot.
+        stats = record.get('worker_stats', {})
+        current = workers.get(record['worker'])
+        if current is None or stats.get('documents', 0) >= current.get('documents', 0):
+            workers[record['worker']] = stats
+    hits = sum(s.get('font_cache_hits', 0) for s in workers.values())
+    misses = sum(s.get('font_cache_misses', 0) for s in workers.values())
+    shared = sum(s.get('font_cache_shared_hits', 0) for s in workers.values())
+    page_hits = sum(s.get('page_store_hits', 0) for s in workers.values())
+    parse_hits = sum(r.get('parse_cache', {}).get('hits', 0) for r in records)
+    parse_misses = sum(r.get('parse_cache', {}).get('misses', 0) for r in records)
+    page_misses = sum(s.get('page_store_misses', 0) for s in workers.values())
+    backend_wins = {}
+    for record in records:
+        if record.get('backend'):
+            backend_wins[record['backend']] = backend_wins.get(record['backend'], 0) + 1
+    return {
+        'wall_seconds': round(wall_seconds, 4),
+        'backend_wins': backend_wins,
+        'pages': sum(r.get('pages', 0) for r in records),
+        'pages_skipped': sum(len(r.get('pages_skipped', [])) for r in records),
+        'pages_failed': sum(len(r.get('page_failures', [])) for r in records),
+        'running_lines_removed': sum(r.get('running_lines_removed', 0) for r in records),
+        'documents': [{k: v for k, v in r.items() if k not in ('worker_stats', 'parse_metrics')} for r in records],
+        'rejected': sum(1 for r in records if r.get('status') == 'rejected'),
+        'parse_metrics': {r['pdf_file']: r['parse_metrics'] for r in records if 'parse_metrics' in r},
+        'workers': {str(pid): stats for pid, stats in workers.items()},
+        'font_cache': {
+            'hits': hits,
+            'misses': misses,
+            'shared_hits': shared,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        },
+        'page_dedup': {
+            'hits': page_hits,
+            'misses': page_misses,
+            'hit_rate': round(page_hits / (page_hits + page_misses), 4) if page_hits + page_misses else 0.0,
+            'seconds_saved': round(sum(s.get('page_store_seconds_saved', 0.0) for s in workers.values()), 4),
+            'hash_seconds': round(sum(s.get('page_store_hash_seconds', 0.0) for s in workers.values()), 4),
+        },
+        'parse_cache': {
+            'hits': parse_hits,
+            'misses': parse_misses,
+            'hit_rate': round(parse_hits / (parse_hits + parse_misses), 4) if parse_hits + parse_misses else 0.0,
+            'parse_seconds': round(sum(r.get('parse_seconds', 0.0) for r in records), 4),
+        },
+    }
+
+def _run_scheduled(jobs, workers, verbose, options):
+    """
+    Runs the batch largest first (see batch_scheduler.plan_tasks). Documents are split into
+    page ranges only on the plain pdfminer path: the other modes extract whole documents.
+    Ranges are extracted by the pool and joined, parsed and written here as soon as a
+    document's last range arrives.
+
+    Returns:
+        tuple: (records in job order, schedule report).
+    """
+    splittable = not any(options[key] for key in ('backends', 'page_timeout', 'page_rss_limit_mb',
+                                                  'from_store', 'triage', 'route_pages'))
+    pdf_paths = [pdf_path for pdf_path, _ in jobs]
+    csv_paths = dict(jobs)
+    if not workers:
+        workers = choose_workers()
+    tasks = plan_tasks(pdf_paths, workers, split=splittable)
+    workers = max(1, min(workers, len(tasks)))
+    records, task_times = [], []
+    ranges = defaultdict(list)
+    _init_worker(verbose)
+    start = time.perf_counter()
+
+    def collect(task, result):
+        if task['start'] is None:
+            records.append(result)
+            return
+        ranges[task['pdf_file']].append((task['start'], result))
+        if len(ranges[task['pdf_file']]) == task['parts']:
+            records.append(_finish_split_document(task['pdf_file'], csv_paths[task['pdf_file']],
+                                                  ranges.pop(task['pdf_file']), options['collect_metrics'],
+                                                  options['strip_headers'], options['parse_cache']))
+
+    def call(task):
+        if task['start'] is None:
+            return (process_document, task['pdf_file'], csv_paths[task['pdf_file']]), options
+        return ((extract_page_range, task['pdf_file'], task['start'], task['stop']),
+                {'dedupe_pages': options['dedupe_pages'], 'page_store': options['page_store']})
+
+    if workers <= 1:
+        for task in tasks:
+            args, kwargs = call(task)
+            result, worker, started, finished = _timed(*args, **kwargs)
+            task_times.append((worker, started, finished))
+            collect(task, result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(verbose,)) as pool:
+            futures = {}
+            for task in tasks:
+                args, kwargs = call(task)
+                futures[pool.submit(_timed, *args, **kwargs)] = task
+            for future in as_completed(futures):
+                result, worker, started, finished = future.result()
+                task_times.append((worker, started, finished))
+                collect(futures[future], result)
+    order = {pdf_path: i for i, pdf_path in enumerate(pdf_paths)}
+    records.sort(key=lambda r: order[r['pdf_file']])
+    stats = schedule_report(task_times, time.perf_counter() - start, workers)
+    stats['split_documents'] = sum(1 for r in records if r.get('page_ranges'))
+    return records, stats
+
+def run_batch(pdf_paths, output_dir, workers=1, verbose=False, backends=None, concurrent_backends=False,
+              page_timeout=None, page_rss_limit_mb=None, collect_metrics=False, from_store=None,
+              triage=False, triage_manifest=None, route_pages=False, strip_headers=False, schedule=False,
+              dedupe_pages=False, page_store=None, parse_cache=None):
+    """
+    Processes pdf_paths, writing one CSV per document into output_dir.
+
+    Args:
+        pdf_paths (list): Input PDF files.
+        output_dir (str): Directory for the output CSV files.
+        workers (int): Number of worker processes; 1 runs everything in this process.
+        verbose (bool): Keep the parser's DEBUG output.
+        backends (tuple, optional): Backend names for fallback mode (see multi_backend.py).
+        concurrent_backends (bool): In fallback mode, race the backends instead of trying them in order.
+        page_timeout (float, optional): Per-page time limit in seconds (see page_isolation.py).
+        page_rss_limit_mb (int, optional): Per-page resident memory limit for the page worker.
+        collect_metrics (bool): Record parser branch counters per document (see parser_metrics.py).
+        from_store (str, optional): Parse page texts from this text store (see text_store.py) instead of extracting.
+        triage (bool): Reject documents that do not look like data-file guides before extraction.
+        triage_manifest (str, optional): With triage, append each document's decision to this JSON-lines file.
+        route_pages (bool): Extract simple pages with PyPDF2 and the rest with pdfminer (see page_router.py).
+        strip_headers (bool): Blank running headers, footers and page numbers before parsing (see page_headers.py).
+        schedule (bool): Dispatch the largest documents first and split very large ones into page
+            ranges (see batch_scheduler.py); the report's 'schedule' gives the makespan and
+            worker utilization. workers=None then picks the worker count from CPUs and memory.
+        dedupe_pages (bool): Extract pages shared between documents once per worker (see page_store.py).
+        page_store (str, optional): Directory of extracted pages shared by all workers and runs; implies dedupe_pages.
+        parse_cache (str, optional): Parse result cache file (see parse_cache.py) shared by all workers and runs.
+
+    Returns:
+        dict: The profile report (see build_profile_report).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(path, csv_path_for(path, output_dir)) for path in pdf_paths]
+    start = time.perf_counter()
+    options = {'backends': backends, 'concurrent_backends': concurrent_backends,
+               'page_timeout': page_timeout, 'page_rss_limit_mb': page_rss_limit_mb,
+               'collect_metrics': collect_metrics, 'from_store': from_store, 'triage': triage,
+               'route_pages': route_pages, 'strip_headers': strip_headers,
+               'dedupe_pages': dedupe_pages, 'page_store': page_store, 'parse_cache': parse_cache}
+    records = []
+    schedule_stats = None
+    if schedule:
+        records, schedule_stats = _run_scheduled(jobs, workers, verbose, options)
+    elif not workers or workers <= 1:
+        _init_worker(verbose)
+        for pdf_path, csv_path in jobs:
+            records.append(process_document(pdf_path, csv_path, **options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(verbose,)) as pool:
+            futures = [pool.submit(process_document, pdf_path, csv_path, **options) for pdf_path, csv_path in jobs]
+            for future in as_completed(futures):
+                records.append(future.result())
+        order = {pdf_path: i for i, (pdf_path, _) in enumerate(jobs)}
+        records.sort(key=lambda r: order[r['pdf_file']])
+    if triage and triage_manifest:
+        write_manifest([r['triage'] for r in records if 'triage' in r], triage_manifest)
+    report = build_profile_report(records, time.perf_counter() - start)
+    if schedule_stats is not None:
+        report['schedule'] = schedule_stats
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract and parse every PDF in a directory into per-document CSV files.")
+    parser.add_argument("--input_dir", type=str, required=True, help="Directory containing the input PDF files.")
+    parser.add_argument("--output_dir", type=str, required=True, help="Directory for the output CSV files.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count; with --schedule, chosen from CPUs and available memory).")
+    parser.add_argument("--profile_report", type=str, default=None, help="Optional path for a JSON profile report.")
+    parser.add_argument("--backends", type=str, default=None,
+                        help="Comma-separated backends to fall back across, e.g. 'pdfminer,pdfplumber,pypdf2'. Default: pdfminer only.")
+    parser.add_argument("--concurrent_backends", action="store_true", help="With --backends, race all backends and keep the first valid result.")
+    parser.add_argument("--page_timeout", type=float, default=None, help="Optional per-page time limit in seconds; slow pages become placeholders.")
+    parser.add_argument("--page_rss_limit_mb", type=int, default=None, help="Optional per-page resident memory limit (MB) for the page worker (Linux only).")
+    parser.add_argument("--metrics_file", type=str, default=None,
+                        help="Optional path for parser branch counters and timings in Prometheus text format.")
+    parser.add_argument("--from_store", type=str, default=None,
+                        help="Parse the page texts stored in this text store (see text_store.py) instead of extracting the PDFs.")
+    parser.add_argument("--triage", action="store_true",
+                        help="Reject PDFs that do not look like data-file guides (outline, metadata, sampled pages) before extracting them.")
+    parser.add_argument("--triage_manifest", type=str, default=None,
+                        help="With --triage, JSON-lines file the decisions are appended to (default: OUTPUT_DIR/triage_manifest.jsonl).")
+    parser.add_argument("--route_pages", action="store_true",
+                        help="Extract single-column pages with PyPDF2 and table, caption and multi-column pages with pdfminer.")
+    parser.add_argument("--strip_headers", action="store_true",
+                        help="Remove running headers, footers and page numbers (lines repeated at the same page position) before parsing.")
+    parser.add_argument("--dedupe_pages", action="store_true",
+                        help="Fingerprint each page's content and resources and extract identical pages only once per worker.")
+    parser.add_argument("--page_store", type=str, default=None,
+                        help="Directory of extracted pages shared by all workers and later runs (implies --dedupe_pages).")
+    parser.add_argument("--parse_cache", type=str, default=None,
+                        help="Parse result cache (SQLite file, see parse_cache.py); sections whose text and parser are unchanged are not parsed again.")
+    parser.add_argument("--schedule", action="store_true",
+                        help="Dispatch the largest PDFs first, split very large ones into page ranges, and report makespan and worker utilization.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the parser's DEBUG output.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    if args.from_store and not os.path.exists(args.from_store):
+        print(f"Error: Text store not found: {args.from_store}")
+        sys.exit(1)
+    pdf_paths = find_pdfs(args.input_dir)
+    if not pdf_paths:
+        print(f"No PDF files found in '{args.input_dir}'.")
+        sys.exit(0)
+
+    workers = args.workers or (choose_workers() if args.schedule else os.cpu_count() or 1)
+    print(f"Processing {len(pdf_paths)} PDF files with {workers} worker(s)...")
+    backends = parse_backend_list(args.backends) if args.backends else None
+    triage_manifest = args.triage_manifest or os.path.join(args.output_dir, 'triage_manifest.jsonl')
+    report = run_batch(pdf_paths, args.output_dir, workers=workers, verbose=args.verbose,
+                       backends=backends, concurrent_backends=args.concurrent_backends,
+                       page_timeout=args.page_timeout, page_rss_limit_mb=args.page_rss_limit_mb,
+                       collect_metrics=bool(args.metrics_file), from_store=args.from_store, triage=args.triage,
+                       triage_manifest=triage_manifest, route_pages=args.route_pages, strip_headers=args.strip_headers,
+                       schedule=args.schedule, dedupe_pages=args.dedupe_pages, page_store=args.page_store,
+                       parse_cache=args.parse_cache)
+    for doc in report['documents']:
+        if doc['status'] == 'ok' and doc.get('backend'):
+            print(f"  {doc['pdf_file']}: {doc['fields']} fields (backend: {doc['backend']})")
+        elif doc['status'] == 'rejected':
+            print(f"  {doc['pdf_file']}: rejected by triage ({doc['error']})")
+        elif doc['status'] == 'ok':
+            routed = (f" ({doc['routes']['pypdf2']['pages']} via PyPDF2)" if doc.get('routes') else "")
+            print(f"  {doc['pdf_file']}: {doc['fields']} fields from {doc['pages']} pages{routed}")
+        else:
+            print(f"  {doc['pdf_file']}: {doc['status']} {doc.get('error', '')}".rstrip())
+    cache = report['font_cache']
+    if report['pages']:
+        print(f"Skipped {report['pages_skipped']} of {report['pages']} pages with no text.")
+    if report['running_lines_removed']:
+        print(f"Removed {report['running_lines_removed']} running header/footer line(s) before parsing.")
+    dedup = report['page_dedup']
+    if dedup['hits'] + dedup['misses']:
+        print(f"Page dedupe: {dedup['hits']} of {dedup['hits'] + dedup['misses']} pages reused (hit rate {dedup['hit_rate']}), "
+              f"{dedup['seconds_saved']}s of extraction saved, {dedup['hash_seconds']}s spent hashing.")
+    cached = report['parse_cache']
+    if cached['hits'] + cached['misses']:
+        print(f"Parse cache: {cached['hits']} of {cached['hits'] + cached['misses']} sections reused (hit rate {cached['hit_rate']}), "
+              f"{cached['parse_seconds']}s parsing in total.")
+    if report['pages_failed']:
+        print(f"{report['pages_failed']} page(s) hit the page limits or failed and were replaced by placeholders.")
+    if 'schedule' in report:
+        schedule = report['schedule']
+        print(f"Makespan {schedule['makespan_seconds']}s for {schedule['tasks']} task(s) on {schedule['workers']} worker(s), "
+              f"utilization {schedule['utilization']:.0%} ({schedule['split_documents']} document(s) split into page ranges).")
+    print(f"Done in {report['wall_seconds']}s. Font cache: {cache['hits']} hits, {cache['misses']} misses (hit rate {cache['hit_rate']}).")
+
+    if args.profile_report:
+        with open(args.profile_report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile report saved to {args.profile_report}")
+
+    if args.metrics_file:
+        write_prometheus(report['parse_metrics'], args.metrics_file)
+        print(f"Parser metrics saved to {args.metrics_file}")
+
+    if report['rejected']:
+        print(f"{report['rejected']} document(s) rejected by triage; see {triage_manifest}")
+    if any(doc['status'] not in ('ok', 'rejected') for doc in report['documents']):
+        sys.exit(1)
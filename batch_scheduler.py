@@ -0,0 +1,165 @@
+import os
+import sys
+import math
+import heapq
+import argparse
+
+# Used when a PDF's page tree cannot be read: a rough page count from the file size.
+_BYTES_PER_PAGE_ESTIMATE = 50 * 1024
+
+def page_count(pdf_path):
+    """
+    Reads a PDF's page count from its page tree (/Root /Pages /Count) without building or
+    interpreting any page. Falls back to an estimate from the file size if the document
+    cannot be parsed, so a broken file still gets a place in the schedule.
+
+    Returns:
+        tuple: (pages, exact): exact is False for a size estimate.
+    """
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdftypes import resolve1
+    try:
+        with open(pdf_path, 'rb') as in_file:
+            doc = PDFDocument(PDFParser(in_file))
+            return int(resolve1(resolve1(doc.catalog['Pages'])['Count'])), True
+    except Exception:
+        try:
+            size = os.path.getsize(pdf_path)
+        except OSError:
+            size = 0
+        return max(1, size // _BYTES_PER_PAGE_ESTIMATE), False
+
+def available_cpus():
+    """CPUs this process may run on (its affinity mask where the platform has one)."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def available_memory_mb():
+    """MemAvailable from /proc/meminfo in MB, or None where /proc is unavailable."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def choose_workers(tasks=None, worker_memory_mb=300, reserve_mb=512, max_workers=None):
+    """
+    Picks the number of worker processes: one per available CPU, but no more than fit in the
+    available memory (after keeping reserve_mb free) at worker_memory_mb each, and no more
+    than there are tasks. Without /proc/meminfo only the CPU count applies.
+    """
+    workers = available_cpus()
+    memory = available_memory_mb()
+    if memory is not None:
+        workers = min(workers, max(1, (memory - reserve_mb) // worker_memory_mb))
+    if max_workers:
+        workers = min(workers, max_workers)
+    if tasks is not None:
+        workers = min(workers, max(1, tasks))
+    return max(1, workers)
+
+def plan_tasks(pdf_paths, workers, split=True, min_chunk_pages=16, page_counts=None):
+    """
+    Orders the batch largest first and splits very large documents into page ranges.
+
+    With split, a document of more pages than the chunk size is cut into page-range tasks
+    of at most that size. The chunk size is half an even share of the batch per worker
+    (at least min_chunk_pages), so one long guide cannot keep a worker busy after the
+    others run out of work. Tasks are sorted by page count, largest first.
+
+    Args:
+        page_counts (dict, optional): pdf_path -> (pages, exact), as from page_count;
+            missing documents are counted here.
+
+    Returns:
+        list: One dict per task with 'pdf_file', 'start', 'stop' (0-based page range, or
+              None for the whole document), 'pages', 'exact' and 'part'/'parts'.
+    """
+    counts = dict(page_counts or {})
+    for pdf_path in pdf_paths:
+        if pdf_path not in counts:
+            counts[pdf_path] = page_count(pdf_path)
+    total = sum(pages for pages, _ in counts.values())
+    chunk = max(min_chunk_pages, math.ceil(total / (max(1, workers) * 2)))
+    tasks = []
+    for pdf_path in pdf_paths:
+        pages, exact = counts[pdf_path]
+        if split and exact and workers > 1 and pages > chunk:
+            parts = math.ceil(pages / chunk)
+            size = math.ceil(pages / parts)
+            for part, start in enumerate(range(0, pages, size)):
+                stop = min(pages, start + size)
+                tasks.append({'pdf_file': pdf_path, 'start': start, 'stop': stop, 'pages': stop - start,
+                              'exact': exact, 'part': part, 'parts': parts})
+        else:
+            tasks.append({'pdf_file': pdf_path, 'start': None, 'stop': None, 'pages': pages,
+                          'exact': exact, 'part': 0, 'parts': 1})
+    # Stable: equal sizes keep directory order, and a split document's ranges stay in order.
+    tasks.sort(key=lambda task: -task['pages'])
+    return tasks
+
+def estimate_makespan(costs, workers):
+    """
+    Makespan of handing out tasks with the given costs, in this order, each to the first
+    worker to become free (what a process pool does).
+    """
+    finish = [0] * max(1, workers)
+    for cost in costs:
+        heapq.heapreplace(finish, finish[0] + cost)
+    return max(finish)
+
+def schedule_report(task_times, wall_seconds, workers):
+    """
+    Makespan and worker utilization for a run.
+
+    Args:
+        task_times (list): (worker, started, finished) per task, perf_counter seconds.
+        wall_seconds (float): Time from the first dispatch to the last result.
+        workers (int): Pool size.
+
+    Returns:
+        dict: 'workers', 'tasks', 'makespan_seconds', 'busy_seconds', 'utilization'
+              (busy time over workers x makespan) and per-worker busy seconds.
+    """
+    busy = {}
+    for worker, started, finished in task_times:
+        busy[worker] = busy.get(worker, 0.0) + (finished - started)
+    total_busy = sum(busy.values())
+    capacity = max(1, workers) * wall_seconds
+    return {
+        'workers': workers,
+        'tasks': len(task_times),
+        'makespan_seconds': round(wall_seconds, 4),
+        'busy_seconds': round(total_busy, 4),
+        'utilization': round(min(1.0, total_busy / capacity), 4) if capacity else 0.0,
+        'worker_busy_seconds': {str(worker): round(seconds, 4) for worker, seconds in busy.items()},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the largest-first schedule batch_parser.py --schedule would use for a directory.")
+    parser.add_argument("--input_dir", type=str, required=True, help="Directory containing the input PDF files.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of workers (default: chosen from CPUs and available memory).")
+    parser.add_argument("--worker_memory_mb", type=int, default=300, help="Memory to budget per worker when choosing the worker count (default: 300).")
+    parser.add_argument("--min_chunk_pages", type=int, default=16, help="Smallest page range a document is split into (default: 16).")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    pdf_paths = sorted(os.path.join(args.input_dir, name) for name in os.listdir(args.input_dir) if name.lower().endswith('.pdf'))
+    counts = {pdf_path: page_count(pdf_path) for pdf_path in pdf_paths}
+    workers = args.workers or choose_workers(worker_memory_mb=args.worker_memory_mb)
+    tasks = plan_tasks(pdf_paths, workers, min_chunk_pages=args.min_chunk_pages, page_counts=counts)
+    for task in tasks:
+        pages = f"pages {task['start'] + 1}-{task['stop']}" if task['start'] is not None else "all pages"
+        estimate = "" if task['exact'] else " (estimated from file size)"
+        print(f"  {task['pages']:>6}  {task['pdf_file']} ({pages}){estimate}")
+    in_order = estimate_makespan([counts[p][0] for p in pdf_paths], workers)
+    planned = estimate_makespan([task['pages'] for task in tasks], workers)
+    print(f"{len(tasks)} task(s) for {len(pdf_paths)} PDF(s) on {workers} worker(s). "
+          f"Estimated makespan in pages: {planned} largest first, {in_order} in directory order.")
@@ -0,0 +1,56 @@
+"""
+Memory and CSV-writing cost of FieldRecord rows against the plain dicts they replace.
+
+    python benchmarks/bench_field_record.py --rows 200000
+"""
+import io
+import os
+import csv
+import sys
+import time
+import pickle
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from field_record import FieldRecord, FIELDNAMES
+
+def _fields(count, sections):
+    for i in range(count):
+        # Section names are rebuilt per row, as they are when sliced out of extracted text.
+        yield ''.join(['SECTION_', str(i % sections)]), f'FIELD_{i:06d}', f'Description of field {i}.'
+
+def _build_dicts(count, sections):
+    return [{'Section': s, 'Field Name': n, 'Field Description': d} for s, n, d in _fields(count, sections)]
+
+def _build_records(count, sections):
+    return [FieldRecord(s, n, d, line=i) for i, (s, n, d) in enumerate(_fields(count, sections))]
+
+def _traced(build, *args):
+    tracemalloc.start()
+    rows = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, current
+
+def _csv_seconds(rows):
+    out = io.StringIO()
+    start = time.perf_counter()
+    writer = csv.DictWriter(out, fieldnames=list(FIELDNAMES))
+    writer.writeheader()
+    writer.writerows(rows)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FieldRecord rows against dict rows.")
+    parser.add_argument("--rows", type=int, default=200000, help="Number of rows.")
+    parser.add_argument("--sections", type=int, default=40, help="Number of distinct section names.")
+    args = parser.parse_args()
+
+    print(f"{'rows':<10} {'MB':>8} {'bytes/row':>10} {'csv s':>7} {'pickle MB':>10}")
+    for name, build in (('dict', _build_dicts), ('record', _build_records)):
+        rows, size = _traced(build, args.rows, args.sections)
+        pickled = len(pickle.dumps(rows, protocol=pickle.HIGHEST_PROTOCOL))
+        print(f"{name:<10} {size / 2**20:>8.1f} {size / args.rows:>10.0f} {_csv_seconds(rows):>7.3f} {pickled / 2**20:>10.1f}")
+        del rows
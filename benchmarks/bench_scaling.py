@@ -0,0 +1,119 @@
+"""
+How parsing and extraction scale with input size, on synthetic guides from synthetic_guides.py.
+
+    python benchmarks/bench_scaling.py --fields 1000,10000,50000 --pages 10,100,500 --plot output/scaling.png
+
+"parse" rows time parse_fields_from_text on one section of N fields (the parsed rows are
+checked against the generator's expected rows). "extract" rows time the pdfminer
+ExtractionContext on a PDF of N pages, built by cycling through the pages of a sample PDF
+with the PyPDF2 writer. Peak memory comes from a separate tracemalloc run. Results are
+printed, optionally written to --results_csv, and plotted with matplotlib if it is installed.
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from synthetic_guides import generate_guide, replicate_pages
+from pdf_parser import parse_fields_from_text, ExtractionContext
+from multi_backend import suppress_stdout
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D.SEC.Data.Guide.pdf')
+
+def _measure(run):
+    # Timing and memory are taken in separate runs: tracemalloc slows allocation-heavy code.
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+def bench_parse(field_counts, wrap):
+    results = []
+    for count in field_counts:
+        lines, expected = generate_guide(sections=1, fields_per_section=count, wrap=wrap)
+        text = "\n".join(lines)
+
+        def run():
+            with suppress_stdout():
+                return parse_fields_from_text(text)
+        rows, seconds, peak = _measure(run)
+        results.append({'benchmark': 'parse', 'size': count, 'unit': 'fields', 'seconds': round(seconds, 4),
+                        'peak_mb': round(peak / 2**20, 2), 'correct': rows == expected})
+    return results
+
+def bench_extract(page_counts, source_pdf):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in page_counts:
+            pdf_path = os.path.join(tmp, f'pages_{count}.pdf')
+            replicate_pages(source_pdf, pdf_path, count)
+
+            def run():
+                with open(pdf_path, 'rb') as in_file:
+                    return ExtractionContext().extract_pages(in_file)
+            pages, seconds, peak = _measure(run)
+            results.append({'benchmark': 'extract', 'size': count, 'unit': 'pages', 'seconds': round(seconds, 4),
+                            'peak_mb': round(peak / 2**20, 2), 'correct': len(pages) == count})
+    return results
+
+def plot(results, path):
+    """Plots seconds and peak MB against size for each benchmark. Returns False without matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+    benchmarks = sorted({r['benchmark'] for r in results})
+    fig, axes = plt.subplots(len(benchmarks), 2, figsize=(10, 4 * len(benchmarks)), squeeze=False)
+    for row, name in zip(axes, benchmarks):
+        points = [r for r in results if r['benchmark'] == name]
+        sizes = [r['size'] for r in points]
+        for ax, key, label in ((row[0], 'seconds', 'seconds'), (row[1], 'peak_mb', 'peak MB')):
+            ax.plot(sizes, [r[key] for r in points], marker='o')
+            ax.set_xlabel(points[0]['unit'])
+            ax.set_ylabel(label)
+            ax.set_title(f"{name}: {label}")
+            ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path)
+    return True
+
+def _sizes(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parsing and extraction against input size.")
+    parser.add_argument("--fields", type=_sizes, default=[1000, 5000, 10000], help="Comma-separated section sizes in fields.")
+    parser.add_argument("--pages", type=_sizes, default=[10, 50, 100], help="Comma-separated PDF sizes in pages.")
+    parser.add_argument("--wrap", type=str, default="mixed", help="Wrap pattern of the synthetic rows (see synthetic_guides.py).")
+    parser.add_argument("--source_pdf", type=str, default=SAMPLE_PDF, help="PDF whose pages are replicated for the extraction runs.")
+    parser.add_argument("--results_csv", type=str, default=None, help="Write the results to this CSV file.")
+    parser.add_argument("--plot", type=str, default=None, help="Plot the results to this image file (needs matplotlib).")
+    args = parser.parse_args()
+
+    results = bench_parse(args.fields, args.wrap) + bench_extract(args.pages, args.source_pdf)
+    print(f"{'benchmark':<10} {'size':>8} {'unit':<7} {'seconds':>9} {'peak MB':>9} {'correct':>8}")
+    for r in results:
+        print(f"{r['benchmark']:<10} {r['size']:>8} {r['unit']:<7} {r['seconds']:>9.3f} {r['peak_mb']:>9.1f} {str(r['correct']):>8}")
+    if args.results_csv:
+        with open(args.results_csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Results saved to {args.results_csv}")
+    if args.plot:
+        if plot(results, args.plot):
+            print(f"Plot saved to {args.plot}")
+        else:
+            print("matplotlib is not installed; no plot written (use --results_csv for the numbers).")
@@ -0,0 +1,71 @@
+"""
+Compares returning parsed rows from worker processes by pickling (the default) with
+shared_results' shared memory transport, measured in the parent process.
+
+    python benchmarks/bench_shared_results.py --rows 200000 --jobs 8
+
+For each transport it reports the parent's CPU time and peak traced allocations while
+receiving the results ("receive") and while also reading every row once ("consume").
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shared_results import publish_rows, SharedRows
+
+def _make_rows(count, section):
+    return [{'Section': section, 'Field Name': f'FIELD_{i:06d}',
+             'Field Description': f'Description of field {i}, as found in the {section} data file.'}
+            for i in range(count)]
+
+def _job(args):
+    count, section, use_shared_memory = args
+    rows = _make_rows(count, section)
+    return publish_rows(rows) if use_shared_memory else rows
+
+def _receive(pool, jobs, use_shared_memory, consume):
+    results = list(pool.map(_job, [job + (use_shared_memory,) for job in jobs]))
+    if use_shared_memory:
+        results = [SharedRows(handle) for handle in results]
+    total = sum(len(rows) for rows in results)
+    if consume:
+        total_chars = 0
+        for rows in results:
+            for row in rows:
+                total_chars += len(row['Field Description'])
+    return results, total
+
+def _measure(pool, jobs, use_shared_memory, consume):
+    # Timing and memory are taken in separate runs: tracemalloc slows allocation-heavy code.
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    results, total = _receive(pool, jobs, use_shared_memory, consume)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    del results
+    tracemalloc.start()
+    results, _ = _receive(pool, jobs, use_shared_memory, consume)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return total, cpu, wall, peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pickled vs shared memory result transfer.")
+    parser.add_argument("--rows", type=int, default=200000, help="Total rows produced by the workers.")
+    parser.add_argument("--jobs", type=int, default=8, help="Number of worker tasks (one per section).")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes.")
+    args = parser.parse_args()
+
+    jobs = [(args.rows // args.jobs, f'SECTION_{i}') for i in range(args.jobs)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pool.map(_job, [(1, 'WARMUP', False)] * args.workers)
+        print(f"{'transport':<10} {'mode':<8} {'rows':>8} {'parent cpu s':>13} {'wall s':>8} {'peak MB':>9}")
+        for consume in (False, True):
+            for name, use_shared_memory in (('pickle', False), ('shm', True)):
+                total, cpu, wall, peak = _measure(pool, jobs, use_shared_memory, consume)
+                mode = 'consume' if consume else 'receive'
+                print(f"{name:<10} {mode:<8} {total:>8} {cpu:>13.3f} {wall:>8.3f} {peak / 2**20:>9.1f}")
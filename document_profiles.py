@@ -0,0 +1,171 @@
+import re
+
+# Parsing rules shared by every profile. Profiles copy these and add or drop entries.
+BASE_COLUMN_KEYWORDS = frozenset({
+    "ALPHANUMERIC", "NUMERIC", "DATE", "BOOLEAN", "EDGAR", "XBRL", "TEXT",
+    "VARCHAR", "INTEGER"
+})
+BASE_POTENTIAL_COLUMN_KEYWORDS = frozenset({"YES", "NO", "*"})
+# The column keywords that are data types; EDGAR and XBRL end descriptions but are Source values.
+BASE_FIELD_TYPES = frozenset({"ALPHANUMERIC", "NUMERIC", "DATE", "BOOLEAN", "TEXT", "VARCHAR", "INTEGER"})
+# Made more permissive for field names like 'series', 'total', 'verbose'
+BASE_FIELD_NAME_REGEX = r"^[A-Z0-9_]{3,}$"
+# Known acronyms or specific case-sensitive names are never lowercased.
+BASE_CASE_SENSITIVE_NAMES = frozenset({"CIK", "XBRL", "EDGAR", "ABS", "CRS", "DEFRS", "MFRR"})
+BASE_DESC_START_WORDS = frozenset({
+    "THE", "A", "AN", "THIS", "IF", "FOR", "AND", "OF", "IN", "TO", "IS", "ARE", "AS", "FIELD",
+    "MAX", "SIZE", "MAY", "BE", "NULL", "KEY", "SOURCE", "FORMAT", "DATA", "TYPE",
+    "LENGTH", "COMMENTS", "NAME", "DESCRIPTION", "FIELDNAME", "FIELDTYPE",
+    "NOTE", "CONTINUATION", "CODE"
+})
+BASE_SECTION_START_REGEX = r"Figure \d+\.[^\n]*?Fields in the\s+([A-Z0-9_]+(?:\s+[A-Z0-9_]+)*)\s+data (?:file|set)"
+
+# Used only to fingerprint a document, so it looks at a caption's last words and nothing else.
+_caption_style_pattern = re.compile(r"Figure \d+\.[^\n]*?Fields in the\s+[A-Z0-9_ ]+?\s+data (file|set)", re.IGNORECASE)
+
+class DocumentProfile:
+    """
+    The parsing rules for one family of data-file guides, built once when the profile is created.
+
+    Keyword sets are frozen and every pattern is compiled up front, so parse_section does no
+    per-call or per-line setup. `title_pattern`, `producer_pattern` and `caption_style` are
+    only used by select_profile to recognise the family from a document_fingerprint.
+    """
+    __slots__ = ('name', 'column_keywords', 'potential_column_keywords', 'field_types', 'desc_start_words',
+                 'case_sensitive_names', 'field_name_pattern', 'section_start_pattern',
+                 'column_keyword_prefixes', 'column_keyword_split_pattern',
+                 'title_pattern', 'producer_pattern', 'caption_style')
+
+    def __init__(self, name, column_keywords=BASE_COLUMN_KEYWORDS,
+                 potential_column_keywords=BASE_POTENTIAL_COLUMN_KEYWORDS, field_types=BASE_FIELD_TYPES,
+                 desc_start_words=BASE_DESC_START_WORDS, case_sensitive_names=BASE_CASE_SENSITIVE_NAMES,
+                 field_name_regex=BASE_FIELD_NAME_REGEX, section_start_regex=BASE_SECTION_START_REGEX,
+                 title_regex=None, producer_regex=None, caption_style=None):
+        self.name = name
+        self.column_keywords = frozenset(kw.upper() for kw in column_keywords)
+        self.potential_column_keywords = frozenset(potential_column_keywords)
+        self.field_types = frozenset(t.upper() for t in field_types)
+        self.desc_start_words = frozenset(w.upper() for w in desc_start_words)
+        self.case_sensitive_names = frozenset(case_sensitive_names)
+        self.field_name_pattern = re.compile(field_name_regex)
+        self.section_start_pattern = re.compile(section_start_regex, re.IGNORECASE | re.DOTALL)
+        # str.startswith takes a tuple; sorted so the order is the same in every process.
+        self.column_keyword_prefixes = tuple(sorted(self.column_keywords))
+        # The earliest " KEYWORD" in a line, in one search instead of one search per keyword.
+        self.column_keyword_split_pattern = re.compile(
+            r"\s+\b(?:" + "|".join(re.escape(kw) for kw in self.column_keyword_prefixes) + r")\b", re.IGNORECASE)
+        self.title_pattern = re.compile(title_regex, re.IGNORECASE) if title_regex else None
+        self.producer_pattern = re.compile(producer_regex, re.IGNORECASE) if producer_regex else None
+        self.caption_style = caption_style
+
+    def score(self, fingerprint):
+        """How well a document_fingerprint matches this profile; 0 means not at all."""
+        score = 0
+        if self.title_pattern and fingerprint.get('title') and self.title_pattern.search(fingerprint['title']):
+            score += 2
+        if self.producer_pattern and fingerprint.get('producer') and self.producer_pattern.search(fingerprint['producer']):
+            score += 1
+        if self.caption_style and fingerprint.get('caption_style') == self.caption_style:
+            score += 1
+        return score
+
+    def rules_key(self):
+        """
+        A stable string of the rules parse_section uses (not the name or the selection
+        patterns), so profiles with the same rules share cached parse results (see parse_cache.py).
+        """
+        return repr((sorted(self.column_keywords), sorted(self.potential_column_keywords), sorted(self.field_types),
+                     sorted(self.desc_start_words), sorted(self.case_sensitive_names),
+                     self.field_name_pattern.pattern, self.section_start_pattern.pattern))
+
+    def __repr__(self):
+        return f"DocumentProfile({self.name!r})"
+
+DEFAULT_PROFILE = DocumentProfile('default')
+
+_profiles = {}
+
+def register_profile(profile):
+    """Adds (or replaces) a profile in the registry used by select_profile and get_profile."""
+    _profiles[profile.name] = profile
+    return profile
+
+def get_profile(name):
+    """Returns the registered profile called name. Raises KeyError for an unknown name."""
+    return _profiles[name]
+
+def profile_names():
+    return list(_profiles)
+
+register_profile(DEFAULT_PROFILE)
+# Form D: "Figure N. Fields in the ISSUERS data file" captions, no Source column.
+register_profile(DocumentProfile('form_d', title_regex=r"\bForm\s+D\b", caption_style='file'))
+# The financial statement style data-set guides (MFRR, financial statement and notes):
+# "Figure N. Fields in the SUB data set" captions and an EDGAR/XBRL Source column.
+register_profile(DocumentProfile('data_sets', title_regex=r"\bData\s+Sets?\b|Risk/Return", caption_style='set'))
+
+def _decode(value):
+    if isinstance(value, bytes):
+        if value.startswith(b'\xfe\xff'):
+            return value[2:].decode('utf-16-be', 'ignore')
+        return value.decode('latin-1')
+    return value if isinstance(value, str) else ''
+
+def document_metadata(doc):
+    """Returns the Title and Producer of a parsed pdfminer PDFDocument's info dictionary ('' when missing)."""
+    from pdfminer.pdftypes import resolve1
+    metadata = {'title': '', 'producer': ''}
+    try:
+        for info in doc.info:
+            for key in ('Title', 'Producer'):
+                value = _decode(resolve1(info.get(key)))
+                if value and not metadata[key.lower()]:
+                    metadata[key.lower()] = value.strip()
+    except Exception:
+        pass
+    return metadata
+
+def read_metadata(pdf_path):
+    """
+    Returns the Title and Producer of a PDF's info dictionary ('' when missing or unreadable).
+    This parses the file; when the document is already open, use document_metadata instead
+    (ExtractionContext keeps it as `metadata`).
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+    try:
+        with open(pdf_path, 'rb') as in_file:
+            return document_metadata(PDFDocument(PDFParser(in_file)))
+    except Exception:
+        return {'title': '', 'producer': ''}
+
+def document_fingerprint(text=None, metadata=None, sample_chars=200000):
+    """
+    A cheap description of a document used to pick its profile.
+
+    Returns:
+        dict: {'title', 'producer', 'caption_style'}. caption_style is 'file' or 'set' after
+              the first "Fields in the X data file/set" caption in the first `sample_chars`
+              of text, or None.
+    """
+    metadata = metadata or {}
+    match = _caption_style_pattern.search(text, 0, sample_chars) if text else None
+    return {'title': metadata.get('title', ''), 'producer': metadata.get('producer', ''),
+            'caption_style': match.group(1).lower() if match else None}
+
+def select_profile(text=None, metadata=None, fingerprint=None):
+    """
+    Picks the registered profile that best matches a document, or DEFAULT_PROFILE if none does.
+
+    Pass the extracted text and/or the document's metadata (document_metadata, or the
+    `metadata` of the ExtractionContext that extracted it), or a precomputed fingerprint.
+    Ties go to the profile registered first.
+    """
+    if fingerprint is None:
+        fingerprint = document_fingerprint(text, metadata)
+    best, best_score = DEFAULT_PROFILE, 0
+    for profile in _profiles.values():
+        score = profile.score(fingerprint)
+        if score > best_score:
+            best, best_score = profile, score
+    return best
@@ -0,0 +1,177 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from contextlib import nullcontext
+
+from pdfminer.pdfdocument import PDFDocument, PDFNoOutlines, PDFEncryptionError, PDFPasswordIncorrect
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from pdf_parser import ExtractionContext, pages_in_range, section_start_pattern, header_pattern
+from page_triage import page_has_text
+
+# Outline entries found in data-file guides ("5 File Header Definitions", "5 Table Definitions",
+# "Fields in the ISSUERS data file", "4 File Formats").
+outline_pattern = re.compile(
+    r"\b(?:data\s+(?:files?|sets?)|file\s+(?:formats?|header\s+definitions?)|(?:table|field)\s+definitions?)\b",
+    re.IGNORECASE)
+metadata_pattern = re.compile(r"\bdata\s+(?:guides?|files?|sets?)\b", re.IGNORECASE)
+_METADATA_KEYS = ('Title', 'Subject', 'Keywords')
+
+def _decode(value):
+    value = resolve1(value)
+    if isinstance(value, bytes):
+        if value.startswith(b'\xfe\xff'):
+            return value[2:].decode('utf-16-be', 'ignore')
+        return value.decode('latin-1')
+    return value if isinstance(value, str) else ''
+
+def _outline_titles(doc, limit=200):
+    titles = []
+    try:
+        for _, title, _, _, _ in doc.get_outlines():
+            titles.append(_decode(title))
+            if len(titles) >= limit:
+                break
+    except PDFNoOutlines:
+        pass
+    except Exception:
+        # A broken outline is not a reason to reject; fall through to the text sample.
+        pass
+    return titles
+
+def _page_count(doc):
+    """The page count from the page tree's /Count, without building the pages."""
+    try:
+        count = resolve1(resolve1(doc.catalog['Pages']).get('Count'))
+    except Exception:
+        count = None
+    if isinstance(count, int) and count >= 0:
+        return count
+    return sum(1 for _ in PDFPage.create_pages(doc))
+
+_triage_context = None
+
+def get_triage_context():
+    """
+    This process's ExtractionContext for sampled pages. It is not the worker's extraction
+    context, so pages triage samples and fonts it decodes stay out of that context's counters.
+    """
+    global _triage_context
+    if _triage_context is None:
+        _triage_context = ExtractionContext()
+    return _triage_context
+
+def _sample_indexes(page_count, first_pages, spread_pages):
+    """The first `first_pages` pages plus `spread_pages` evenly spaced later ones."""
+    indexes = list(range(min(first_pages, page_count)))
+    remaining = page_count - len(indexes)
+    for k in range(1, spread_pages + 1):
+        index = first_pages + (remaining * k) // (spread_pages + 1)
+        if remaining > 0 and index < page_count and index not in indexes:
+            indexes.append(index)
+    return indexes
+
+def triage_document(pdf_path, context=None, first_pages=3, spread_pages=2, in_file=None, sample=None):
+    """
+    Cheaply decides whether pdf_path looks like a data-file guide before full extraction.
+
+    The checks run cheapest first and stop at the first match: the document outline,
+    the Title/Subject/Keywords metadata, and finally the text of a few sampled pages
+    (the first `first_pages` plus `spread_pages` spread through the rest), searched for
+    a "Fields in the X data file" caption or a "Field Name Field Description" header.
+    Only the sampled pages are built, and they are extracted with get_triage_context()
+    unless a `context` is given.
+
+    With `in_file` (pdf_path, opened in binary mode by the caller and kept open) the
+    document is read from it, and `sample`, if given, is filled with the parsed
+    'document' and the 'texts' of the sampled pages by 0-based index, so the caller can
+    extract the document without parsing the file or the sampled pages again (see
+    ExtractionContext.extract_pages).
+
+    Returns:
+        dict: {'pdf_file', 'accepted', 'reason', 'detail', 'pages', 'sampled_pages', 'seconds'}.
+              'reason' is 'outline', 'metadata' or 'text_sample' when accepted, and
+              'unreadable', 'encrypted', 'no_pages', 'no_text' or 'no_markers' when rejected.
+    """
+    start = time.perf_counter()
+    context = context or get_triage_context()
+    result = {'pdf_file': pdf_path, 'accepted': False, 'reason': None, 'detail': '', 'pages': 0, 'sampled_pages': []}
+
+    def decide(accepted, reason, detail=''):
+        result.update({'accepted': accepted, 'reason': reason, 'detail': detail,
+                       'seconds': round(time.perf_counter() - start, 4)})
+        return result
+
+    try:
+        with (nullcontext(in_file) if in_file is not None else open(pdf_path, 'rb')) as pdf_file:
+            doc = PDFDocument(PDFParser(pdf_file))
+            texts = {}
+            if sample is not None:
+                sample.update({'document': doc, 'texts': texts})
+            page_count = _page_count(doc)
+            result['pages'] = page_count
+            if not page_count:
+                return decide(False, 'no_pages')
+            for title in _outline_titles(doc):
+                if outline_pattern.search(title):
+                    return decide(True, 'outline', title.strip())
+            for info in doc.info:
+                for key in _METADATA_KEYS:
+                    value = _decode(info.get(key)) if isinstance(info, dict) else ''
+                    if value and metadata_pattern.search(value):
+                        return decide(True, 'metadata', f"{key}: {value.strip()}")
+            if hasattr(context.rsrcmgr, 'begin_document'):
+                context.rsrcmgr.begin_document()
+            any_text = False
+            for index in _sample_indexes(page_count, first_pages, spread_pages):
+                result['sampled_pages'].append(index + 1)
+                page = pages_in_range(doc, index, index + 1)
+                if not page or not page_has_text(page[0]):
+                    continue
+                any_text = True
+                text = texts[index] = context.extract_page(page[0])
+                match = section_start_pattern.search(text) or header_pattern.search(text)
+                if match:
+                    return decide(True, 'text_sample', f"page {index + 1}: {' '.join(match.group(0).split())[:80]}")
+            if not any_text:
+                return decide(False, 'no_text', "sampled pages have no text (scanned or image-only?)")
+            return decide(False, 'no_markers', "no data-file caption or field table header in outline, metadata or sampled pages")
+    except (PDFEncryptionError, PDFPasswordIncorrect) as e:
+        return decide(False, 'encrypted', str(e))
+    except Exception as e:
+        return decide(False, 'unreadable', str(e))
+
+def write_manifest(entries, manifest_path):
+    """Appends triage results to a JSON-lines manifest, one document per line."""
+    with open(manifest_path, 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check whether PDFs look like data-file guides before parsing them.")
+    parser.add_argument("pdf_files", nargs='*', help="PDF files to check.")
+    parser.add_argument("--input_dir", type=str, default=None, help="Check every PDF in this directory.")
+    parser.add_argument("--manifest", type=str, default=None, help="Append the decisions to this JSON-lines manifest.")
+    parser.add_argument("--first_pages", type=int, default=3, help="Leading pages to sample (default: 3).")
+    parser.add_argument("--spread_pages", type=int, default=2, help="Additional pages sampled across the rest of the document (default: 2).")
+    args = parser.parse_args()
+
+    pdf_paths = list(args.pdf_files)
+    if args.input_dir:
+        from batch_parser import find_pdfs
+        pdf_paths.extend(find_pdfs(args.input_dir))
+    if not pdf_paths:
+        print("No PDF files given.")
+        sys.exit(1)
+    entries = [triage_document(path, first_pages=args.first_pages, spread_pages=args.spread_pages) for path in pdf_paths]
+    for entry in entries:
+        verdict = 'accept' if entry['accepted'] else 'reject'
+        print(f"  {entry['pdf_file']}: {verdict} ({entry['reason']}) {entry['detail']}".rstrip())
+    if args.manifest:
+        write_manifest(entries, args.manifest)
+        print(f"Manifest updated: {args.manifest}")
@@ -2,19 +2,73 @@ import re
 import csv
 import argparse
 import pdfplumber
+from contextlib import contextmanager
+from page_triage import page_has_text
+from layout_snapshot import load_snapshot, SnapshotPage
+from field_record import FieldRecord, FullFieldRecord, COLUMN_SETS
+from document_profiles import DEFAULT_PROFILE
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file using pdfplumber, attempting layout=True for all pages with keep_blank_chars=False."""
+# Bump when extract_fields' rules change: results cached by earlier versions
+# (see parse_cache.py) are then never returned.
+PARSER_VERSION = 2
+
+# First upper-case data type in a table row: where the Format column starts.
+_field_type_pattern = re.compile(r"\b(?:" + "|".join(sorted(DEFAULT_PROFILE.field_types)) + r")\b")
+
+def _continue_format(record, line):
+    """A format split over rows ("(nnnnnnnnnn-", "nn-nnnnnn)") is the last token of the following lines."""
+    tokens = line.split()
+    if tokens and record.field_type:
+        record.continue_format(tokens[-1])
+
+@contextmanager
+def _open_pages(pdf_path, snapshot_cache=None, document=None):
+    """The PDF's pdfplumber pages, or its SnapshotPages when a snapshot cache directory is given.
+    With a document (pdf_document.SharedDocument), its pdfplumber view is used instead of opening the file."""
+    if document is not None and snapshot_cache is None:
+        pages = document.plumber().pages
+        try:
+            yield pages
+        finally:
+            # The document outlives this call; drop the layout objects pdfplumber cached per page.
+            for page in pages:
+                page.close()
+        return
+    if snapshot_cache is None:
+        with pdfplumber.open(pdf_path) as pdf:
+            yield pdf.pages
+        return
+    pages, cached = load_snapshot(pdf_path, snapshot_cache)
+    print(f"{'Replaying' if cached else 'Wrote'} layout snapshot for '{pdf_path}'.", flush=True)
+    yield pages
+
+def _page_has_text(page):
+    if isinstance(page, SnapshotPage):
+        return page.has_text
+    return page_has_text(page.page_obj)
+
+def extract_text_from_pdf(pdf_path, snapshot_cache=None, document=None):
+    """Extract text from PDF file using pdfplumber, attempting layout=True for all pages with keep_blank_chars=False.
+    Pages with no text-showing operators are skipped before layout analysis and added as empty pages.
+    With snapshot_cache (a directory), the pages' layout is read from a cached layout snapshot
+    (see layout_snapshot.py), written there on the first run, so later runs do not interpret the PDF.
+    With a document (pdf_document.SharedDocument), the PDF parsed by another backend is reused."""
     text = ""
+    skipped_pages = []
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
+        with _open_pages(pdf_path, snapshot_cache, document) as pages:
+            total_pages = len(pages)
             print(f"Processing {total_pages} pages from PDF '{pdf_path}' (keep_blank_chars=False)...", flush=True)
-            for i, page in enumerate(pdf.pages):
+            for i, page in enumerate(pages):
                 page_num = i + 1
                 page_text_content = None # Initialize for each page
                 
                 # print(f"  Attempting to process page {page_num}/{total_pages} with layout=True...", flush=True) # Less verbose
+                if not _page_has_text(page):
+                    print(f"    No text operators on page {page_num}/{total_pages}. Skipping layout analysis.", flush=True)
+                    skipped_pages.append(page_num)
+                    text += '\n'
+                    continue
                 try:
                     page_text_content = page.extract_text(x_tolerance=3, y_tolerance=3, layout=True, keep_blank_chars=False)
                     if page_text_content is not None:
@@ -24,7 +78,8 @@ def extract_text_from_pdf(pdf_path):
                         page_text_content = f"[PAGE_EXTRACTION_RETURNED_NONE:{page_num}]\n"
                 except Exception as page_e:
                     print(f"    Error extracting text from page {page_num}/{total_pages} (layout=True): {page_e}. Adding placeholder.", flush=True)
-                    page_text_content = f"[ERROR_EXTRACTING_PAGE:{page_num}:{str(page_e).replace('\n', ' ')}]\n"
+                    page_error = str(page_e).replace('\n', ' ')
+                    page_text_content = f"[ERROR_EXTRACTING_PAGE:{page_num}:{page_error}]\n"
 
                 # Ensure page_text_content is a string before appending
                 if isinstance(page_text_content, str):
@@ -35,13 +90,25 @@ def extract_text_from_pdf(pdf_path):
                     print(f"    page_text_content was unexpectedly None for page {page_num}/{total_pages} after processing. Adding placeholder.", flush=True)
                     text += f"[UNEXPECTED_NONE_PAGE_CONTENT:{page_num}]\n"
 
+            if skipped_pages:
+                print(f"Skipped {len(skipped_pages)} of {total_pages} pages with no text: {skipped_pages}", flush=True)
         # print(f"[DEBUG extract_text_from_pdf] Total extracted text length: {len(text)}", flush=True) # Optional: less verbose
     except Exception as e:
         print(f"[DEBUG extract_text_from_pdf] General error during PDF processing: {e}", flush=True)
     return text
 
-def extract_fields(text):
-    """Extract field names and descriptions from the text."""
+def extract_fields(text, columns='basic', cache=None):
+    """Extract field names and descriptions from the text. With columns='all', each row's
+    Format, Max Size, May be NULL and Key values are read from the same line (FullFieldRecord rows).
+    With a `cache` (parse_cache.ParseCache), text already parsed by this PARSER_VERSION returns its stored rows."""
+    if columns not in COLUMN_SETS:
+        raise ValueError(f"columns must be one of {', '.join(COLUMN_SETS)}")
+    if cache is not None:
+        # Section names are taken from the raw text, so only line endings are normalized.
+        return cache.memoize('extract_fields_only.extract_fields', PARSER_VERSION,
+                             f"{columns}\0{DEFAULT_PROFILE.rules_key()}", text,
+                             lambda: extract_fields(text, columns), strip_lines=False)
+    fill_columns = columns == 'all'
     fields = []
     
     # Split text into sections based on "Figure X. Fields in the ... data file"
@@ -72,6 +139,7 @@ def extract_fields(text):
         format_start = header.find('Format') # Find the start of the 'Format' column
         
         # Process each line after the header
+        last_row = None
         for line in lines[header_line + 1:]:
             # Skip lines that are part of the header or separators
             if not line or '----' in line or '...' in line:
@@ -124,11 +192,16 @@ def extract_fields(text):
             
             # Only process if we have a valid field name (allow mixed case)
             if field_name and len(field_name) >= 2:
-                fields.append({
-                    'Section': section_name,
-                    'Field Name': field_name,
-                    'Field Description': ' '.join(field_desc.split())
-                })
+                if fill_columns:
+                    last_row = FullFieldRecord(section_name, field_name, ' '.join(field_desc.split()))
+                    type_match = _field_type_pattern.search(line, name_start if name_start > 0 else 0)
+                    if type_match:
+                        last_row.fill_columns(line[type_match.start():], DEFAULT_PROFILE.field_types)
+                    fields.append(last_row)
+                else:
+                    fields.append(FieldRecord(section_name, field_name, ' '.join(field_desc.split())))
+            elif last_row is not None:
+                _continue_format(last_row, line)
     
     return fields
     
@@ -137,7 +210,7 @@ def extract_fields(text):
 def write_to_csv(fields, output_file):
     """Write fields to a CSV file."""
     with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['Section', 'Field Name', 'Field Description'])
+        writer = csv.DictWriter(f, fieldnames=list(COLUMN_SETS['all' if fields and isinstance(fields[0], FullFieldRecord) else 'basic']))
         writer.writeheader()
         writer.writerows(fields)
 
@@ -145,13 +218,24 @@ def main():
     parser = argparse.ArgumentParser(description='Extract field names and descriptions from PDF')
     parser.add_argument('input_pdf', help='Input PDF file')
     parser.add_argument('output_csv', help='Output CSV file')
+    parser.add_argument('--columns', default='basic', choices=list(COLUMN_SETS),
+                        help="'basic' (section, name, description; default) or 'all' (adds Field Type, Max Size, May be NULL and Key)")
+    parser.add_argument('--snapshot_cache', default=None,
+                        help='Directory of cached layout snapshots; reuses the PDF\'s snapshot instead of re-running layout analysis')
+    parser.add_argument('--parse_cache', default=None,
+                        help='Parse result cache (SQLite file, see parse_cache.py); unchanged text is not parsed again')
     args = parser.parse_args()
     
     print("Extracting text from {}...".format(args.input_pdf), flush=True)
-    text = extract_text_from_pdf(args.input_pdf)
+    text = extract_text_from_pdf(args.input_pdf, args.snapshot_cache)
     
     print("Extracting fields...", flush=True)
-    fields = extract_fields(text)
+    if args.parse_cache:
+        from parse_cache import ParseCache
+        with ParseCache(args.parse_cache) as parse_cache:
+            fields = extract_fields(text, args.columns, parse_cache)
+    else:
+        fields = extract_fields(text, args.columns)
     
     print(f"Writing {len(fields)} fields to {args.output_csv}", flush=True)
     write_to_csv(fields, args.output_csv)
@@ -0,0 +1,198 @@
+import sys
+import bisect
+from collections.abc import Mapping
+
+FIELDNAMES = ('Section', 'Field Name', 'Field Description')
+_ATTRIBUTES = {'Section': 'section', 'Field Name': 'name', 'Field Description': 'description'}
+# Every record has the same keys, so they share one (C-implemented, ordered) keys view.
+_KEYS = _ATTRIBUTES.keys()
+
+ALL_FIELDNAMES = FIELDNAMES + ('Field Type', 'Max Size', 'May be NULL', 'Key')
+_ALL_ATTRIBUTES = dict(_ATTRIBUTES, **{'Field Type': 'field_type', 'Max Size': 'max_size',
+                                       'May be NULL': 'nullable', 'Key': 'key'})
+_ALL_KEYS = _ALL_ATTRIBUTES.keys()
+# The `columns` option of the parsers: which table columns a row carries.
+COLUMN_SETS = {'basic': FIELDNAMES, 'all': ALL_FIELDNAMES}
+
+class FieldRecord(Mapping):
+    """
+    One parsed field: a slotted record that also reads like the row dicts the parsers used
+    to return.
+
+    As a mapping it has exactly the CSV columns ('Section', 'Field Name', 'Field
+    Description'), so csv.DictWriter writes it directly and it compares equal to the
+    equivalent dict. Section names are interned, so every row of a section shares one
+    string. `page` and `line` record where the field starts when the parser knows it
+    (1-based, otherwise None); they are attributes, not mapping keys.
+    """
+    __slots__ = ('section', 'name', 'description', 'page', 'line')
+    _attributes = _ATTRIBUTES
+    _keys = _KEYS
+    _fieldnames = FIELDNAMES
+
+    def __init__(self, section, name, description, page=None, line=None):
+        self.section = sys.intern(section)
+        self.name = name
+        self.description = description
+        self.page = page
+        self.line = line
+
+    @classmethod
+    def from_mapping(cls, row):
+        """Builds a record from any row with the three CSV keys (e.g. a dict read by csv.DictReader)."""
+        if isinstance(row, cls):
+            return row
+        return cls(row['Section'], row['Field Name'], row['Field Description'])
+
+    def __getitem__(self, key):
+        return getattr(self, self._attributes[key])
+
+    def get(self, key, default=None):
+        attribute = self._attributes.get(key)
+        return default if attribute is None else getattr(self, attribute)
+
+    def keys(self):
+        return self._keys
+
+    def __iter__(self):
+        return iter(self._fieldnames)
+
+    def __len__(self):
+        return len(self._fieldnames)
+
+    def __contains__(self, key):
+        return key in self._attributes
+
+    def __eq__(self, other):
+        if isinstance(other, FieldRecord):
+            return (self.section, self.name, self.description) == (other.section, other.name, other.description)
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        # Same text as the dicts it replaces, so the parsers' DEBUG output is unchanged.
+        return repr({'Section': self.section, 'Field Name': self.name, 'Field Description': self.description})
+
+    def __reduce__(self):
+        return (FieldRecord, (self.section, self.name, self.description, self.page, self.line))
+
+class FullFieldRecord(FieldRecord):
+    """
+    A FieldRecord that also carries the rest of the table row: 'Field Type' (with a format
+    such as "(DD-MMM-YY)" when it follows the type), 'Max Size', 'May be NULL' and 'Key'.
+    Returned by the parsers with columns='all'. Columns the text does not give are ''.
+    """
+    __slots__ = ('field_type', 'max_size', 'nullable', 'key')
+    _attributes = _ALL_ATTRIBUTES
+    _keys = _ALL_KEYS
+    _fieldnames = ALL_FIELDNAMES
+
+    def __init__(self, section, name, description, page=None, line=None,
+                 field_type='', max_size='', nullable='', key=''):
+        super().__init__(section, name, description, page, line)
+        self.field_type = field_type
+        self.max_size = max_size
+        self.nullable = nullable
+        self.key = key
+
+    @classmethod
+    def from_mapping(cls, row):
+        if isinstance(row, cls):
+            return row
+        return cls(row['Section'], row['Field Name'], row['Field Description'],
+                   field_type=row.get('Field Type', ''), max_size=row.get('Max Size', ''),
+                   nullable=row.get('May be NULL', ''), key=row.get('Key', ''))
+
+    def has_columns(self):
+        return bool(self.field_type or self.max_size or self.nullable or self.key)
+
+    def fill_columns(self, text, field_types):
+        """
+        Fills the still-empty columns from a run of column values, e.g. "ALPHANUMERIC 20 No *"
+        or "DATE (DD-MMM-YY) 8 Yes". The type is the first upper-case token in field_types;
+        tokens in parentheses right after it are its format. Returns False if text held no
+        column value.
+        """
+        found = False
+        tokens = text.split()
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            upper = token.upper()
+            if token.isupper() and upper in field_types and not self.field_type:
+                value = token
+                while i + 1 < len(tokens) and (tokens[i + 1].startswith('(') or value.count('(') > value.count(')')):
+                    i += 1
+                    value += ' ' + tokens[i]
+                self.field_type = value
+                found = True
+            elif token.isdigit() and not self.max_size:
+                self.max_size = token
+                found = True
+            elif upper in ('YES', 'NO') and not self.nullable:
+                self.nullable = token.capitalize()
+                found = True
+            elif token == '*' and not self.key:
+                self.key = token
+                found = True
+            i += 1
+        return found
+
+    def continue_format(self, text):
+        """
+        Adds the next piece of a format split over lines ("(nnnnnnnnnn-nn-", "nnnnnn)") to the
+        Field Type. Formats are split at their hyphens, so an open format must end with '-',
+        a piece must close it or end with '-' itself, and a piece that opens a format must
+        hold a hyphen; "(if" or "(CIK)" is description. Returns the text after the piece
+        (the rest of the row's column values), or None if text does not continue the format.
+        """
+        field_type = self.field_type
+        if field_type.count('(') > field_type.count(')') and field_type.endswith('-'):
+            separator = ''
+        elif field_type and '(' not in field_type and text.startswith('('):
+            separator = ' '
+        else:
+            return None
+        piece, close, rest = text.partition(')')
+        tokens = piece.split()
+        if (not tokens or not all(token.endswith('-') for token in tokens[:-1])
+                or not (close or tokens[-1].endswith('-')) or (separator and '-' not in piece)):
+            return None
+        self.field_type = field_type + separator + ''.join(tokens) + close
+        return rest
+
+    def __eq__(self, other):
+        if isinstance(other, FullFieldRecord):
+            return ((self.section, self.name, self.description, self.field_type, self.max_size, self.nullable, self.key) ==
+                    (other.section, other.name, other.description, other.field_type, other.max_size, other.nullable, other.key))
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        return (FullFieldRecord, (self.section, self.name, self.description, self.page, self.line,
+                                  self.field_type, self.max_size, self.nullable, self.key))
+
+def page_line_starts(page_texts):
+    """
+    Returns the line number (1-based) on which each page starts in ''.join(page_texts),
+    for parse_fields_from_text(page_line_starts=...).
+    """
+    starts = []
+    line = 1
+    for text in page_texts:
+        starts.append(line)
+        line += text.count('\n')
+    return starts
+
+def assign_pages(records, line_starts):
+    """Sets each record's page (1-based) from its line and page_line_starts()."""
+    for record in records:
+        if record.line is not None:
+            record.page = bisect.bisect_right(line_starts, record.line)
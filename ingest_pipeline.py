@@ -0,0 +1,208 @@
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_parser import get_worker_context, parse_fields_from_text, write_to_csv
+from multi_backend import suppress_stdout
+from batch_parser import find_pdfs, csv_path_for
+from shared_results import publish_rows, publish_text, read_text, SharedRows, SegmentNames
+
+_DONE = object()
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _extract_bytes(pdf_bytes, text_segment=None):
+    """
+    Pool task: extracts the pages of an in-memory PDF with this worker's ExtractionContext.
+    With `text_segment`, the text is published under that shared memory name and its handle
+    returned in place of the text.
+    """
+    context = get_worker_context()
+    page_texts = context.extract_pages(io.BytesIO(pdf_bytes))
+    text = ''.join(page_texts)
+    if text_segment is not None:
+        text = publish_text(text, text_segment)
+    return text, len(page_texts), list(context.skipped_pages), os.getpid()
+
+def _parse_text(text, verbose=False, rows_segment=None):
+    """
+    Pool task: parses extracted text into field rows. With `rows_segment`, `text` is a
+    publish_text handle and the rows are published under that name; their handle is returned.
+    """
+    if rows_segment is not None:
+        text = read_text(text)
+    with suppress_stdout(verbose):
+        rows = parse_fields_from_text(text)
+    return publish_rows(rows, rows_segment) if rows_segment is not None else rows
+
+def csv_sink(output_dir, verbose=False):
+    """
+    Returns a sink that writes each document's rows to output_dir/<pdf name>.csv.
+
+    A sink is any callable (record, rows) -> bool; it runs in a thread so it may block.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    def write(record, rows):
+        record['csv_file'] = csv_path_for(record['pdf_file'], output_dir)
+        with suppress_stdout(verbose):
+            return write_to_csv(rows, record['csv_file']) if rows else True
+    return write
+
+async def _run_stage(inbox, outbox, handler, concurrency):
+    """Runs `concurrency` consumers of inbox; forwards handler results and then _DONE to outbox."""
+    async def consume():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                # Put the marker back for the sibling consumers.
+                await inbox.put(_DONE)
+                return
+            result = await handler(item)
+            if outbox is not None:
+                await outbox.put(result)
+    await asyncio.gather(*(consume() for _ in range(concurrency)))
+    if outbox is not None:
+        await outbox.put(_DONE)
+
+async def run_pipeline(pdf_paths, sink, workers=None, queue_size=4, executor=None, verbose=False,
+                       shared_memory=False):
+    """
+    Ingests pdf_paths through four stages joined by bounded asyncio queues:
+
+        load (read bytes, in a thread) -> extract (process pool) -> parse (process pool) -> sink (thread)
+
+    Each queue holds at most `queue_size` documents, so a slow stage makes the stages
+    before it wait instead of buffering the whole corpus in memory. One document's failure
+    is recorded in its record and does not stop the others.
+
+    Args:
+        pdf_paths (list): Input PDF files.
+        sink (callable): (record, rows) -> bool, e.g. csv_sink(output_dir).
+        workers (int, optional): Process pool size when no executor is given (default: CPU count).
+        queue_size (int): Capacity of each inter-stage queue.
+        executor (Executor, optional): An existing executor for the extract and parse stages.
+        verbose (bool): Keep the parser's DEBUG output.
+        shared_memory (bool): Pass the extracted text from the extract to the parse workers, and
+            the parsed rows back from the pool, through shared memory instead of pickling them
+            through this process; the sink then receives a lazily decoded shared_results.SharedRows.
+            Segments that are never attached (a task failed) are unlinked when the run ends.
+
+    Returns:
+        list: One record per document, in input order, with 'status', 'pages', 'fields'
+              and per-stage timings.
+    """
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    loaded, extracted, parsed = (asyncio.Queue(maxsize=queue_size) for _ in range(3))
+    segments = SegmentNames() if shared_memory else None
+    records = [{'pdf_file': path, 'status': 'pending'} for path in pdf_paths]
+
+    async def load():
+        for record in records:
+            try:
+                t0 = time.perf_counter()
+                record['data'] = await asyncio.to_thread(_read_file, record['pdf_file'])
+                record['load_seconds'] = round(time.perf_counter() - t0, 4)
+            except OSError as e:
+                record.update({'status': 'error', 'error': str(e)})
+            await loaded.put(record)
+        await loaded.put(_DONE)
+
+    async def extract(record):
+        if record['status'] == 'pending':
+            try:
+                t0 = time.perf_counter()
+                record['text'], record['pages'], record['pages_skipped'], record['worker'] = \
+                    await loop.run_in_executor(executor, _extract_bytes, record.pop('data'),
+                                               segments.new() if segments is not None else None)
+                record['extract_seconds'] = round(time.perf_counter() - t0, 4)
+            except Exception as e:
+                record.update({'status': 'error', 'error': str(e)})
+        record.pop('data', None)
+        return record
+
+    async def parse(record):
+        rows = []
+        if record['status'] == 'pending':
+            try:
+                t0 = time.perf_counter()
+                rows = await loop.run_in_executor(executor, _parse_text, record.pop('text'), verbose,
+                                                  segments.new() if segments is not None else None)
+                if segments is not None:
+                    rows = SharedRows(rows)
+                record['parse_seconds'] = round(time.perf_counter() - t0, 4)
+                record['fields'] = len(rows)
+            except Exception as e:
+                record.update({'status': 'error', 'error': str(e)})
+        record.pop('text', None)
+        return record, rows
+
+    async def write(item):
+        record, rows = item
+        if record['status'] == 'pending':
+            try:
+                written = await asyncio.to_thread(sink, record, rows)
+                record['status'] = 'ok' if written else 'write_failed'
+            except Exception as e:
+                record.update({'status': 'error', 'error': str(e)})
+        if isinstance(rows, SharedRows):
+            rows.close()
+
+    try:
+        await asyncio.gather(
+            load(),
+            _run_stage(loaded, extracted, extract, workers),
+            _run_stage(extracted, parsed, parse, workers),
+            _run_stage(parsed, None, write, 1),
+        )
+    finally:
+        if own_executor:
+            executor.shutdown()
+        if segments is not None:
+            # Segments of failed tasks, whose handles never reached a reader.
+            segments.unlink_all()
+    return records
+
+def ingest(pdf_paths, output_dir, workers=None, queue_size=4, verbose=False, shared_memory=False):
+    """Synchronous wrapper: runs the pipeline with a CSV sink and returns the records."""
+    return asyncio.run(run_pipeline(pdf_paths, csv_sink(output_dir, verbose), workers=workers,
+                                    queue_size=queue_size, verbose=verbose, shared_memory=shared_memory))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a directory of PDFs through an asyncio load/extract/parse/write pipeline.")
+    parser.add_argument("--input_dir", type=str, required=True, help="Directory containing the input PDF files.")
+    parser.add_argument("--output_dir", type=str, required=True, help="Directory for the output CSV files.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--queue_size", type=int, default=4, help="Documents buffered between stages before upstream stages wait (default: 4).")
+    parser.add_argument("--shared_memory", action="store_true", help="Pass extracted text and parsed rows between processes through shared memory instead of pickling them.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the parser's DEBUG output.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    pdf_paths = find_pdfs(args.input_dir)
+    if not pdf_paths:
+        print(f"No PDF files found in '{args.input_dir}'.")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    records = ingest(pdf_paths, args.output_dir, workers=args.workers, queue_size=args.queue_size, verbose=args.verbose,
+                     shared_memory=args.shared_memory)
+    for record in records:
+        if record['status'] == 'ok':
+            print(f"  {record['pdf_file']}: {record['fields']} fields from {record['pages']} pages")
+        else:
+            print(f"  {record['pdf_file']}: {record['status']} {record.get('error', '')}".rstrip())
+    print(f"Done in {round(time.perf_counter() - start, 4)}s.")
+    if any(record['status'] != 'ok' for record in records):
+        sys.exit(1)
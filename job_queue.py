@@ -0,0 +1,305 @@
+import os
+import sys
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+
+from batch_parser import _init_worker, process_document, find_pdfs, csv_path_for
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    pdf_file TEXT NOT NULL UNIQUE,
+    csv_file TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    node TEXT,
+    lease_expires REAL,
+    claimed_at REAL,
+    finished_at REAL,
+    status TEXT,
+    error TEXT,
+    pages INTEGER,
+    fields INTEGER,
+    seconds REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+"""
+
+def default_node_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class JobTable:
+    """
+    A table of document jobs in a SQLite file that several nodes share.
+
+    The coordinator enqueues one job per PDF. Each node claims a job, which takes a lease
+    on it for `lease_seconds`. The node renews the lease with heartbeats while it works,
+    then marks the job complete or failed. A job whose lease runs out (the node died or
+    hung) can be claimed again by any node. A job that fails or expires `max_attempts`
+    times is left in state 'failed'.
+
+    Claims run in BEGIN IMMEDIATE transactions, so two nodes never claim the same job.
+    The file can live on shared storage, as long as that storage supports SQLite's
+    file locks. Leases use wall-clock time, so node clocks should be roughly in sync.
+
+    Job states: 'pending', 'running', 'done', 'failed'.
+    """
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def enqueue(self, jobs, max_attempts=3):
+        """
+        Adds (pdf_file, csv_file) jobs. Jobs already in the table are left as they are.
+
+        Returns:
+            int: Number of jobs added.
+        """
+        before = self._conn.total_changes
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (pdf_file, csv_file, max_attempts) VALUES (?, ?, ?)",
+                [(pdf_file, csv_file, max_attempts) for pdf_file, csv_file in jobs])
+        return self._conn.total_changes - before
+
+    def _transaction(self):
+        return _Immediate(self._conn)
+
+    def claim(self, node, lease_seconds=60.0):
+        """
+        Claims the next pending (or lease-expired) job for node.
+
+        Returns:
+            dict: The job row, or None if there is nothing to claim.
+        """
+        now = time.time()
+        with self._transaction():
+            # Expired jobs that used up their attempts fail instead of being handed out again.
+            self._conn.execute(
+                "UPDATE jobs SET state = 'failed', error = 'lease expired', finished_at = ? "
+                "WHERE state = 'running' AND lease_expires < ? AND attempts >= max_attempts", (now, now))
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE state = 'pending' OR (state = 'running' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET state = 'running', node = ?, attempts = attempts + 1, lease_expires = ?, "
+                "claimed_at = ? WHERE id = ?", (node, now + lease_seconds, now, row['id']))
+            return dict(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone())
+
+    def heartbeat(self, job_id, node, lease_seconds=60.0):
+        """Extends node's lease on a job. Returns False if the node no longer holds it."""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND node = ? AND state = 'running'",
+                (time.time() + lease_seconds, job_id, node))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, node, record):
+        """Marks a job done with its batch_parser record. Returns False if node lost the lease."""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'done', finished_at = ?, status = ?, error = ?, pages = ?, fields = ?, "
+                "seconds = ? WHERE id = ? AND node = ? AND state = 'running'",
+                (time.time(), record.get('status'), record.get('error'), record.get('pages', 0),
+                 record.get('fields', 0), record.get('seconds'), job_id, node))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, node, error):
+        """Releases a failed job for retry, or marks it failed after max_attempts. Returns False if node lost the lease."""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                "error = ?, finished_at = ?, lease_expires = NULL WHERE id = ? AND node = ? AND state = 'running'",
+                (error, time.time(), job_id, node))
+        return cursor.rowcount == 1
+
+    def counts(self):
+        """Number of jobs in each state."""
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for row in self._conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"):
+            counts[row['state']] = row['n']
+        return counts
+
+    def jobs(self):
+        return [dict(row) for row in self._conn.execute("SELECT * FROM jobs ORDER BY id")]
+
+    def node_report(self):
+        """
+        Per-node throughput of finished jobs.
+
+        Returns:
+            dict: {node: {'documents', 'pages', 'fields', 'busy_seconds', 'span_seconds',
+                   'documents_per_minute', 'pages_per_second'}}. The span runs from the node's
+                   first claim to its last finish; throughput is measured over it.
+        """
+        report = {}
+        for row in self._conn.execute(
+                "SELECT node, COUNT(*) AS documents, SUM(pages) AS pages, SUM(fields) AS fields, "
+                "SUM(finished_at - claimed_at) AS busy, MIN(claimed_at) AS first, MAX(finished_at) AS last "
+                "FROM jobs WHERE state = 'done' GROUP BY node ORDER BY node"):
+            span = (row['last'] - row['first']) if row['last'] and row['first'] else 0.0
+            report[row['node']] = {
+                'documents': row['documents'],
+                'pages': row['pages'] or 0,
+                'fields': row['fields'] or 0,
+                'busy_seconds': round(row['busy'] or 0.0, 3),
+                'span_seconds': round(span, 3),
+                'documents_per_minute': round(row['documents'] * 60 / span, 2) if span else 0.0,
+                'pages_per_second': round((row['pages'] or 0) / span, 2) if span else 0.0,
+            }
+        return report
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class _Immediate:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK on error): takes the write lock up front."""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+class _Heartbeat(threading.Thread):
+    """Renews a job's lease every `interval` seconds until stopped, on its own connection."""
+    def __init__(self, table_path, job_id, node, lease_seconds, interval):
+        super().__init__(daemon=True)
+        self.table_path, self.job_id, self.node = table_path, job_id, node
+        self.lease_seconds, self.interval = lease_seconds, interval
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        with JobTable(self.table_path) as table:
+            while not self._stop_event.wait(self.interval):
+                if not table.heartbeat(self.job_id, self.node, self.lease_seconds):
+                    self.lost = True
+                    return
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def run_node(table_path, node=None, lease_seconds=60.0, heartbeat_interval=None, idle_exit=0.0,
+             poll_interval=1.0, verbose=False, **options):
+    """
+    Claims and processes jobs from the table until none are left.
+
+    The node waits up to `idle_exit` seconds for more jobs before it stops. Extra `options`
+    are passed on to batch_parser.process_document.
+
+    Returns:
+        dict: {'node', 'done', 'failed', 'lost'} counts for this node.
+    """
+    node = node or default_node_name()
+    heartbeat_interval = heartbeat_interval or lease_seconds / 3
+    _init_worker(verbose)
+    summary = {'node': node, 'done': 0, 'failed': 0, 'lost': 0}
+    idle_since = None
+    with JobTable(table_path) as table:
+        while True:
+            job = table.claim(node, lease_seconds)
+            if job is None:
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(poll_interval)
+                continue
+            idle_since = None
+            os.makedirs(os.path.dirname(job['csv_file']) or '.', exist_ok=True)
+            heartbeat = _Heartbeat(table_path, job['id'], node, lease_seconds, heartbeat_interval)
+            heartbeat.start()
+            start = time.perf_counter()
+            try:
+                record = process_document(job['pdf_file'], job['csv_file'], **options)
+            except Exception as e:
+                record = {'status': 'error', 'error': str(e)}
+            finally:
+                heartbeat.stop()
+            record['seconds'] = round(time.perf_counter() - start, 4)
+            if record.get('status') in ('ok', 'rejected'):
+                held = table.complete(job['id'], node, record)
+                summary['done' if held else 'lost'] += 1
+            else:
+                held = table.fail(job['id'], node, record.get('error') or record.get('status'))
+                summary['failed' if held else 'lost'] += 1
+            if not held:
+                print(f"  [{node}] lost the lease on {job['pdf_file']}; another node has it.")
+            elif verbose:
+                print(f"  [{node}] {job['pdf_file']}: {record.get('status')} in {record['seconds']}s")
+    return summary
+
+def _node_process(table_path, node, kwargs):
+    run_node(table_path, node=node, **kwargs)
+
+def run_local_nodes(table_path, nodes=2, **kwargs):
+    """Runs `nodes` worker nodes as local processes against one table and waits for them."""
+    processes = [multiprocessing.Process(target=_node_process, args=(table_path, f"{socket.gethostname()}:node{i}", kwargs))
+                 for i in range(nodes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return [process.exitcode for process in processes]
+
+def print_report(table):
+    counts = table.counts()
+    print(f"Jobs: {counts['done']} done, {counts['failed']} failed, {counts['running']} running, {counts['pending']} pending.")
+    for node, stats in table.node_report().items():
+        print(f"  {node}: {stats['documents']} documents, {stats['pages']} pages in {stats['span_seconds']}s "
+              f"({stats['documents_per_minute']} docs/min, {stats['pages_per_second']} pages/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distribute PDF parsing over several nodes through a shared SQLite job table.")
+    parser.add_argument("--table", type=str, required=True, help="Path of the SQLite job table, on storage all nodes can reach.")
+    parser.add_argument("--input_dir", type=str, default=None, help="Enqueue every PDF in this directory (requires --output_dir).")
+    parser.add_argument("--output_dir", type=str, default=None, help="Directory for the output CSV files of enqueued jobs.")
+    parser.add_argument("--max_attempts", type=int, default=3, help="Attempts per job before it is marked failed (default: 3).")
+    parser.add_argument("--work", action="store_true", help="Run a worker node that processes jobs until the table is drained.")
+    parser.add_argument("--nodes", type=int, default=1, help="With --work, run this many local worker nodes (default: 1).")
+    parser.add_argument("--node_name", type=str, default=None, help="With --work and one node, the name recorded for this node (default: host:pid).")
+    parser.add_argument("--lease_seconds", type=float, default=60.0, help="Job lease length; heartbeats renew it every third of it (default: 60).")
+    parser.add_argument("--idle_exit", type=float, default=0.0, help="With --work, wait this long for new jobs before stopping (default: 0).")
+    parser.add_argument("--report", action="store_true", help="Print job counts and per-node throughput.")
+    parser.add_argument("--verbose", action="store_true", help="Print each finished job.")
+    args = parser.parse_args()
+
+    if args.input_dir:
+        if not args.output_dir:
+            print("Error: --input_dir requires --output_dir.")
+            sys.exit(1)
+        if not os.path.isdir(args.input_dir):
+            print(f"Error: Input directory not found: {args.input_dir}")
+            sys.exit(1)
+        os.makedirs(args.output_dir, exist_ok=True)
+        with JobTable(args.table) as table:
+            jobs = [(os.path.abspath(p), os.path.abspath(csv_path_for(p, args.output_dir))) for p in find_pdfs(args.input_dir)]
+            print(f"Enqueued {table.enqueue(jobs, args.max_attempts)} of {len(jobs)} PDF(s) into {args.table}.")
+    if args.work:
+        options = {'lease_seconds': args.lease_seconds, 'idle_exit': args.idle_exit, 'verbose': args.verbose}
+        if args.nodes > 1:
+            run_local_nodes(args.table, nodes=args.nodes, **options)
+        else:
+            summary = run_node(args.table, node=args.node_name, **options)
+            print(f"Node {summary['node']}: {summary['done']} done, {summary['failed']} failed, {summary['lost']} lost leases.")
+    if args.report or args.work:
+        with JobTable(args.table) as table:
+            print_report(table)
@@ -0,0 +1,214 @@
+import os
+import sys
+import json
+import zlib
+import struct
+import hashlib
+import argparse
+from array import array
+
+# Layout (little-endian):
+#   magic | zlib-compressed body
+#   body: page count, string count, string blob size in bytes (uint32 each)
+#         string offsets (string count + 1, uint32), in characters into the decoded blob
+#         string blob: every distinct char text and font name, UTF-8 encoded
+#         per page: has_text (uint8), char count (uint32), width, height, bbox (4 x float64)
+#                   char count x (text index, font index, upright) as uint32
+#                   char count x (x0, x1, top, bottom, doctop, size) as float64
+# Coordinates are stored as float64, so text rebuilt from a snapshot is exactly what
+# pdfplumber would have produced from the PDF.
+_MAGIC = b'PDFLAYOUT1\n'
+_COUNTS = struct.Struct('<III')
+_PAGE = struct.Struct('<BI6d')
+_CHAR_INTS = 3
+_CHAR_FLOATS = ('x0', 'x1', 'top', 'bottom', 'doctop', 'size')
+
+# Bumped whenever the layout above, or what a snapshot is taken from, changes: old cache
+# entries are then simply not found.
+FORMAT_VERSION = 1
+
+class SnapshotPage:
+    """
+    A page replayed from a layout snapshot, usable where a position-aware parser expects a
+    pdfplumber page: `chars`, `width`, `height`, `bbox`, `page_number`, extract_text(),
+    extract_words(), crop() and within_bbox() behave as pdfplumber's do, without touching
+    the PDF. `has_text` is False for pages that had no text-showing operators.
+    """
+    def __init__(self, page_number, chars, width, height, bbox, has_text=True):
+        self.page_number = page_number
+        self.chars = chars
+        self.width = width
+        self.height = height
+        self.bbox = bbox
+        self.has_text = has_text
+
+    def extract_text(self, **kwargs):
+        from pdfplumber import utils
+        defaults = {'layout_bbox': self.bbox}
+        if 'layout_width_chars' not in kwargs:
+            defaults['layout_width'] = self.width
+        if 'layout_height_chars' not in kwargs:
+            defaults['layout_height'] = self.height
+        return utils.chars_to_textmap(self.chars, **{**defaults, **kwargs}).as_string
+
+    def extract_words(self, **kwargs):
+        from pdfplumber import utils
+        return utils.extract_words(self.chars, **kwargs)
+
+    def crop(self, bbox):
+        from pdfplumber import utils
+        return self._cropped(bbox, utils.crop_to_bbox(self.chars, bbox))
+
+    def within_bbox(self, bbox):
+        from pdfplumber import utils
+        return self._cropped(bbox, utils.within_bbox(self.chars, bbox))
+
+    def _cropped(self, bbox, chars):
+        x0, top, x1, bottom = bbox
+        return SnapshotPage(self.page_number, chars, x1 - x0, bottom - top, tuple(bbox), self.has_text)
+
+    def __repr__(self):
+        return f"<SnapshotPage:{self.page_number} {len(self.chars)} chars>"
+
+def take_snapshot(pdf_path):
+    """
+    Runs pdfplumber's layout analysis once over every page and returns the pages as
+    SnapshotPages. Pages without text-showing operators (page_triage.page_has_text) are
+    not analysed and come back empty with has_text=False.
+    """
+    import pdfplumber
+    from page_triage import page_has_text
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            has_text = page_has_text(page.page_obj)
+            chars = [{'text': c['text'], 'fontname': c['fontname'], 'upright': bool(c['upright']),
+                      **{key: float(c[key]) for key in _CHAR_FLOATS}}
+                     for c in page.chars] if has_text else []
+            pages.append(SnapshotPage(page.page_number, chars, float(page.width), float(page.height),
+                                      tuple(float(v) for v in page.bbox), has_text))
+    return pages
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+def encode_snapshot(pages):
+    """Encodes SnapshotPages into the layout above. Returns bytes."""
+    strings = {}
+    body = bytearray()
+    for page in pages:
+        ints = array('I')
+        floats = array('d')
+        for char in page.chars:
+            ints.append(strings.setdefault(char['text'], len(strings)))
+            ints.append(strings.setdefault(char['fontname'], len(strings)))
+            ints.append(1 if char['upright'] else 0)
+            floats.extend(char[key] for key in _CHAR_FLOATS)
+        body += _PAGE.pack(page.has_text, len(page.chars), page.width, page.height, *page.bbox)
+        body += _little_endian(ints).tobytes()
+        body += _little_endian(floats).tobytes()
+    offsets = array('I', [0])
+    for value in strings:
+        offsets.append(offsets[-1] + len(value))
+    blob = ''.join(strings).encode('utf-8')
+    head = _COUNTS.pack(len(pages), len(strings), len(blob)) + _little_endian(offsets).tobytes() + blob
+    return _MAGIC + zlib.compress(head + bytes(body))
+
+def decode_snapshot(data):
+    """Decodes bytes written by encode_snapshot into a list of SnapshotPages."""
+    if not data.startswith(_MAGIC):
+        raise ValueError("not a layout snapshot")
+    body = memoryview(zlib.decompress(data[len(_MAGIC):]))
+    page_count, string_count, blob_size = _COUNTS.unpack_from(body, 0)
+    pos = _COUNTS.size
+    offsets = array('I')
+    offsets.frombytes(body[pos:pos + 4 * (string_count + 1)])
+    _little_endian(offsets)
+    pos += 4 * (string_count + 1)
+    blob = str(body[pos:pos + blob_size], 'utf-8')
+    strings = [blob[offsets[i]:offsets[i + 1]] for i in range(string_count)]
+    pos += blob_size
+    pages = []
+    for page_number in range(1, page_count + 1):
+        has_text, count, width, height, *bbox = _PAGE.unpack_from(body, pos)
+        pos += _PAGE.size
+        ints = array('I')
+        ints.frombytes(body[pos:pos + 4 * _CHAR_INTS * count])
+        pos += 4 * _CHAR_INTS * count
+        floats = array('d')
+        floats.frombytes(body[pos:pos + 8 * len(_CHAR_FLOATS) * count])
+        pos += 8 * len(_CHAR_FLOATS) * count
+        _little_endian(ints)
+        _little_endian(floats)
+        chars = []
+        for i in range(count):
+            text, font, upright = ints[i * _CHAR_INTS:(i + 1) * _CHAR_INTS]
+            x0, x1, top, bottom, doctop, size = floats[i * len(_CHAR_FLOATS):(i + 1) * len(_CHAR_FLOATS)]
+            chars.append({'text': strings[text], 'fontname': strings[font], 'upright': bool(upright),
+                          'x0': x0, 'x1': x1, 'top': top, 'bottom': bottom, 'doctop': doctop, 'size': size,
+                          'width': x1 - x0, 'height': bottom - top, 'page_number': page_number,
+                          'object_type': 'char'})
+        pages.append(SnapshotPage(page_number, chars, width, height, tuple(bbox), bool(has_text)))
+    return pages
+
+def pdf_digest(pdf_path):
+    """sha256 of the PDF's bytes: a snapshot follows the document, not its path or mtime."""
+    hasher = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def snapshot_path(cache_dir, pdf_path, params=None):
+    """
+    Where the snapshot of `pdf_path` is cached: `<cache_dir>/<PDF sha256>-<parameter hash>.layout`.
+
+    `params` is whatever else the snapshot depends on (e.g. the extraction settings of the
+    caller); together with FORMAT_VERSION it is hashed into the name, so changing either
+    never returns a stale snapshot.
+    """
+    key = json.dumps({'format': FORMAT_VERSION, **(params or {})}, sort_keys=True)
+    params_hash = hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{pdf_digest(pdf_path)}-{params_hash}.layout")
+
+def load_snapshot(pdf_path, cache_dir, params=None):
+    """
+    Returns the PDF's SnapshotPages, from the cache if a snapshot is there, otherwise by
+    running take_snapshot and caching the result.
+
+    Returns:
+        tuple: (pages, cached): cached is True when no PDF interpretation was needed.
+    """
+    path = snapshot_path(cache_dir, pdf_path, params)
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                return decode_snapshot(f.read()), True
+        except (ValueError, zlib.error, struct.error, UnicodeDecodeError):
+            # A corrupt or truncated entry is replaced below.
+            pass
+    pages = take_snapshot(pdf_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Written next to its final name and renamed, so a reader never sees half a snapshot.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_snapshot(pages))
+    os.replace(tmp_path, path)
+    return pages, False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write (or reuse) the cached layout snapshot of a PDF.")
+    parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
+    parser.add_argument("--cache_dir", type=str, default="output/layout_cache", help="Directory holding the snapshots (default: output/layout_cache).")
+    args = parser.parse_args()
+
+    try:
+        pages, cached = load_snapshot(args.pdf_file, args.cache_dir)
+    except Exception as e:
+        print(f"Error: could not snapshot '{args.pdf_file}': {e}")
+        sys.exit(1)
+    path = snapshot_path(args.cache_dir, args.pdf_file)
+    print(f"{'Reused' if cached else 'Wrote'} {path}: {len(pages)} pages, "
+          f"{sum(len(page.chars) for page in pages)} chars, {os.path.getsize(path)} bytes.")
@@ -0,0 +1,216 @@
+import os
+import sys
+import time
+import argparse
+import contextlib
+import multiprocessing
+import queue
+from collections import OrderedDict
+
+import pdf_parser
+import pdf_parser_pypdf2
+import extract_fields_only
+import page_router
+import pdf_document
+
+DEFAULT_BACKEND_ORDER = ('pdfminer', 'pdfplumber', 'pypdf2')
+
+@contextlib.contextmanager
+def suppress_stdout(verbose=False):
+    """Silences the parsers' DEBUG output unless verbose is set."""
+    if verbose:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def _shared_document(pdf_path):
+    """
+    This process's parsed pdf_path (see pdf_document.py), so the pdfminer and pdfplumber
+    backends parse the file once between them. None if it cannot be parsed; the backend then
+    opens the file itself and reports the error as usual.
+    """
+    try:
+        return pdf_document.get_shared_document(pdf_path)
+    except Exception:
+        return None
+
+def _run_pdfminer(pdf_path):
+    text = pdf_parser.extract_text_from_pdf(pdf_path, context=pdf_parser.get_worker_context(),
+                                            document=_shared_document(pdf_path))
+    return pdf_parser.parse_fields_from_text(text) if text else None
+
+def _run_routed(pdf_path):
+    page_texts, _ = page_router.extract_pages_routed(pdf_path, context=pdf_parser.get_worker_context())
+    text = ''.join(page_texts)
+    return pdf_parser.parse_fields_from_text(text) if text.strip() else None
+
+def _run_pdfplumber(pdf_path):
+    text = extract_fields_only.extract_text_from_pdf(pdf_path, document=_shared_document(pdf_path))
+    return extract_fields_only.extract_fields(text) if text else None
+
+def _run_pypdf2(pdf_path):
+    text = pdf_parser_pypdf2.extract_text_from_pdf(pdf_path)
+    return pdf_parser_pypdf2.parse_fields_from_text(text) if text else None
+
+# Name -> callable(pdf_path) returning parsed rows, or None when no text could be extracted.
+BACKENDS = OrderedDict([
+    ('pdfminer', _run_pdfminer),
+    ('pdfplumber', _run_pdfplumber),
+    ('pypdf2', _run_pypdf2),
+    ('routed', _run_routed),
+])
+
+def validate_rows(rows, min_sections=1, min_fields_per_section=2):
+    """
+    Decides whether a backend's output is good enough to stop falling back.
+
+    Returns:
+        tuple: (is_valid, sections, reason)
+    """
+    if rows is None:
+        return False, 0, "no text extracted"
+    sections = len({row['Section'] for row in rows})
+    if sections < min_sections:
+        return False, sections, f"{sections} section(s) found, need {min_sections}"
+    fields_per_section = len(rows) / sections
+    if fields_per_section < min_fields_per_section:
+        return False, sections, f"{fields_per_section:.1f} fields per section, need {min_fields_per_section}"
+    return True, sections, "ok"
+
+def run_backend(name, pdf_path, verbose=False):
+    """Runs one backend and returns (rows, attempt record). Exceptions become a failed attempt."""
+    start = time.perf_counter()
+    rows, error = None, None
+    try:
+        with suppress_stdout(verbose):
+            rows = BACKENDS[name](pdf_path)
+    except Exception as e:
+        error = str(e)
+    attempt = {
+        'backend': name,
+        'seconds': round(time.perf_counter() - start, 4),
+        'fields': len(rows) if rows is not None else 0,
+    }
+    if error is not None:
+        attempt['error'] = error
+    return rows, attempt
+
+def _backend_process(name, pdf_path, verbose, results):
+    rows, attempt = run_backend(name, pdf_path, verbose)
+    results.put((name, rows, attempt))
+
+def _judge(rows, attempt, min_sections, min_fields_per_section):
+    if 'error' in attempt:
+        attempt.update({'status': 'failed', 'sections': 0, 'reason': attempt['error']})
+        return False
+    is_valid, sections, reason = validate_rows(rows, min_sections, min_fields_per_section)
+    attempt.update({'status': 'accepted' if is_valid else 'rejected', 'sections': sections, 'reason': reason})
+    return is_valid
+
+def extract_with_fallback(pdf_path, backends=DEFAULT_BACKEND_ORDER, concurrent=False,
+                          min_sections=1, min_fields_per_section=2, verbose=False):
+    """
+    Extracts and parses pdf_path with the first backend whose rows pass validate_rows.
+
+    Sequential mode tries the backends in order, so easy documents only pay for the first
+    one; the pdfminer and pdfplumber backends share one parsed copy of the document, which
+    is closed on return. Concurrent mode starts every backend in its own process, takes the first valid
+    result to arrive and terminates the others.
+
+    Returns:
+        dict: {'backend': winning backend name or None, 'rows': list, 'attempts': list of dicts}.
+              If nothing validates, 'rows' holds the largest result seen.
+    """
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown backend(s): {', '.join(unknown)}. Choose from: {', '.join(BACKENDS)}")
+    attempts = []
+    best_rows = []
+    if not concurrent or len(backends) == 1:
+        try:
+            for name in backends:
+                rows, attempt = run_backend(name, pdf_path, verbose)
+                attempts.append(attempt)
+                if _judge(rows, attempt, min_sections, min_fields_per_section):
+                    return {'backend': name, 'rows': rows, 'attempts': attempts}
+                if rows and len(rows) > len(best_rows):
+                    best_rows = rows
+            return {'backend': None, 'rows': best_rows, 'attempts': attempts}
+        finally:
+            pdf_document.release_shared_document(pdf_path)
+
+    results = multiprocessing.Queue()
+    processes = {
+        name: multiprocessing.Process(target=_backend_process, args=(name, pdf_path, verbose, results), daemon=True)
+        for name in backends
+    }
+    for process in processes.values():
+        process.start()
+    winner, winning_rows = None, None
+    try:
+        pending = set(backends)
+        while pending and winner is None:
+            try:
+                name, rows, attempt = results.get(timeout=0.5)
+            except queue.Empty:
+                # A backend that died without reporting (e.g. killed by the OS) counts as failed.
+                for name in list(pending):
+                    if not processes[name].is_alive() and processes[name].exitcode != 0:
+                        pending.discard(name)
+                        attempts.append({'backend': name, 'status': 'failed', 'sections': 0, 'fields': 0,
+                                         'reason': f"exit code {processes[name].exitcode}"})
+                continue
+            pending.discard(name)
+            attempts.append(attempt)
+            if _judge(rows, attempt, min_sections, min_fields_per_section):
+                winner, winning_rows = name, rows
+            elif rows and len(rows) > len(best_rows):
+                best_rows = rows
+        for name in pending:
+            attempts.append({'backend': name, 'status': 'cancelled'})
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+    if winner is None:
+        return {'backend': None, 'rows': best_rows, 'attempts': attempts}
+    return {'backend': winner, 'rows': winning_rows, 'attempts': attempts}
+
+def parse_backend_list(value):
+    """Parses a comma-separated --backends argument."""
+    return tuple(name.strip() for name in value.split(',') if name.strip())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse fields from a PDF, falling back across extraction backends until one produces valid results.")
+    parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
+    parser.add_argument("--csv_file", type=str, required=True, help="Path to the output CSV file.")
+    parser.add_argument("--backends", type=str, default=','.join(DEFAULT_BACKEND_ORDER),
+                        help=f"Comma-separated backends in priority order (default: {','.join(DEFAULT_BACKEND_ORDER)}).")
+    parser.add_argument("--concurrent", action="store_true", help="Run all backends at once and keep the first valid result.")
+    parser.add_argument("--min_sections", type=int, default=1, help="Minimum number of sections for a result to be accepted.")
+    parser.add_argument("--min_fields_per_section", type=float, default=2, help="Minimum average fields per section for a result to be accepted.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the parsers' DEBUG output.")
+    args = parser.parse_args()
+
+    try:
+        result = extract_with_fallback(args.pdf_file, parse_backend_list(args.backends), concurrent=args.concurrent,
+                                       min_sections=args.min_sections, min_fields_per_section=args.min_fields_per_section,
+                                       verbose=args.verbose)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    for attempt in result['attempts']:
+        details = f"{attempt.get('fields', 0)} fields in {attempt.get('sections', 0)} sections, {attempt.get('seconds', 0)}s"
+        print(f"  {attempt['backend']}: {attempt['status']} ({details}) {attempt.get('reason', '')}".rstrip())
+
+    if result['backend'] is None:
+        print("\nNo backend produced structured data that passed validation. CSV file not created.")
+        sys.exit(1)
+    if pdf_parser.write_to_csv(result['rows'], args.csv_file):
+        print(f"\nBackend '{result['backend']}' won: wrote {len(result['rows'])} fields to {args.csv_file}")
+    else:
+        print(f"\nFailed to write parsed data to {args.csv_file}. Exiting.")
+        sys.exit(1)
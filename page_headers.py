@@ -0,0 +1,131 @@
+import re
+import sys
+import argparse
+from collections import defaultdict
+
+from document_profiles import DEFAULT_PROFILE
+from pdf_parser import any_figure_line_pattern, header_pattern
+
+_digits_pattern = re.compile(r"\d+")
+
+def _normalize(line):
+    """Collapses whitespace and replaces numbers with '#', so "Page 3 of 19" matches "Page 4 of 19"."""
+    return _digits_pattern.sub('#', ' '.join(line.split()))
+
+def _edge_lines(page_text, depth):
+    """(position, line index) of the first and last `depth` non-blank lines of a page."""
+    lines = page_text.split('\n')
+    non_blank = [i for i, line in enumerate(lines) if line.strip()]
+    edges = [(('top', k), i) for k, i in enumerate(non_blank[:depth])]
+    edges += [(('bottom', k), i) for k, i in enumerate(reversed(non_blank[-depth:]))]
+    return lines, edges
+
+def _is_table_line(text, profile):
+    """
+    Column headers and values ("Field Name", "Max Size", "ALPHANUMERIC", "Yes") repeat on
+    every table page, and a table continued over pages can start each page with the same field.
+    Only identifier-like names count as fields here (six or more characters, or with '_' or a
+    digit): short capitals such as "SEC" or "ACME" usually start a running title.
+    """
+    first_word = text.split(maxsplit=1)[0] if text.strip() else ''
+    if profile.field_name_pattern.match(first_word) and first_word.upper() not in profile.desc_start_words and \
+       (len(first_word) >= 6 or '_' in first_word or any(c.isdigit() for c in first_word)):
+        return True
+    words = [w.strip('.,:;()').upper() for w in text.split()]
+    vocabulary = (profile.desc_start_words, profile.column_keywords, profile.potential_column_keywords)
+    return all(w.isdigit() or any(w in v for v in vocabulary) for w in words if w)
+
+def find_running_lines(page_texts, depth=3, min_pages=3, min_fraction=0.5, profile=None):
+    """
+    Finds running headers, footers and page numbers in one pass over the page texts.
+
+    A line is running if, after _normalize, it sits at the same position (the k-th non-blank
+    line from the top or the bottom of the page, k < depth) on at least min_pages pages and
+    at least min_fraction of the pages that have text. Lines that are only numbers count
+    only if the numbers change from page to page (page numbers, not a repeated table
+    value). Table vocabulary (see _is_table_line), section captions and the "Field Name
+    Field Description" header are never running lines, nor are lines starting with a field name.
+
+    Returns:
+        dict: (position, normalized text) -> number of pages it was found on.
+    """
+    profile = profile or DEFAULT_PROFILE
+    pages = defaultdict(int)
+    raw_values = defaultdict(set)
+    pages_with_text = 0
+    for page_text in page_texts:
+        lines, edges = _edge_lines(page_text, depth)
+        if not edges:
+            continue
+        pages_with_text += 1
+        for key in {(position, _normalize(lines[i])) for position, i in edges}:
+            pages[key] += 1
+        for position, i in edges:
+            raw_values[(position, _normalize(lines[i]))].add(lines[i].strip())
+    needed = max(min_pages, min_fraction * pages_with_text)
+    running = {}
+    for key, count in pages.items():
+        text = key[1]
+        if count < needed:
+            continue
+        if text.replace('#', '').strip(' .-/|') == '' and len(raw_values[key]) < 2:
+            continue
+        if any_figure_line_pattern.match(text) or header_pattern.search(text) or profile.section_start_pattern.search(text):
+            continue
+        if any(_is_table_line(raw, profile) for raw in raw_values[key]):
+            continue
+        running[key] = count
+    return running
+
+def strip_running_lines(page_texts, depth=3, min_pages=3, min_fraction=0.5, profile=None):
+    """
+    Blanks the running header/footer lines found by find_running_lines.
+
+    Removed lines are replaced by empty lines rather than deleted, so line numbers (and the
+    parsers' FieldRecord.line) still point into the extracted text, while the parser skips
+    them before any classification.
+
+    Returns:
+        tuple: (page_texts, report): the cleaned page texts and a dict with 'pages',
+               'lines_removed' and 'running_lines' (position, text and page count of each).
+    """
+    running = find_running_lines(page_texts, depth, min_pages, min_fraction, profile)
+    removed = 0
+    cleaned = []
+    for page_text in page_texts:
+        if not running:
+            cleaned.append(page_text)
+            continue
+        lines, edges = _edge_lines(page_text, depth)
+        drop = [i for position, i in edges if (position, _normalize(lines[i])) in running]
+        for i in drop:
+            if lines[i]:
+                lines[i] = ''
+                removed += 1
+        cleaned.append('\n'.join(lines) if drop else page_text)
+    report = {
+        'pages': len(page_texts),
+        'lines_removed': removed,
+        'running_lines': [{'position': f"{position[0]} {position[1] + 1}", 'text': text, 'pages': count}
+                          for (position, text), count in sorted(running.items())],
+    }
+    return cleaned, report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the running headers, footers and page numbers found in a PDF's pages.")
+    parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
+    parser.add_argument("--depth", type=int, default=3, help="Lines from the top and bottom of each page to consider (default: 3).")
+    parser.add_argument("--min_fraction", type=float, default=0.5, help="Fraction of pages a line must repeat on (default: 0.5).")
+    args = parser.parse_args()
+
+    from pdf_parser import ExtractionContext
+    try:
+        with open(args.pdf_file, 'rb') as in_file:
+            page_texts = ExtractionContext().extract_pages(in_file)
+    except Exception as e:
+        print(f"Error: could not extract '{args.pdf_file}': {e}")
+        sys.exit(1)
+    _, report = strip_running_lines(page_texts, depth=args.depth, min_fraction=args.min_fraction)
+    for entry in report['running_lines']:
+        print(f"  {entry['position']:<9} {entry['pages']:>4} pages  {entry['text']}")
+    print(f"{report['lines_removed']} line(s) would be removed from {report['pages']} pages.")
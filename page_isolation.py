@@ -0,0 +1,210 @@
+import os
+import time
+import multiprocessing
+
+from pdf_parser import ExtractionContext
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def _rss_bytes(pid):
+    """Resident set size of a process from /proc, or None where /proc is unavailable."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _sandbox_main(conn):
+    """Child process loop: opens one document at a time and extracts pages on request."""
+    context = ExtractionContext()
+    pages = []
+    in_file = None
+    while True:
+        try:
+            command, arg = conn.recv()
+        except EOFError:
+            break
+        if command == 'close':
+            break
+        try:
+            if command == 'open':
+                if in_file is not None:
+                    in_file.close()
+                in_file = open(arg, 'rb')
+                pages = context.open_document(in_file)
+                conn.send(('ok', (len(pages), context.metadata)))
+            elif command == 'page':
+                before = context.pages_skipped
+                text = context.extract_page(pages[arg])
+                conn.send(('ok' if context.pages_skipped == before else 'skipped', text))
+        except Exception as e:
+            conn.send(('error', str(e).replace('\n', ' ')))
+    if in_file is not None:
+        in_file.close()
+
+class PageLimitExceeded(Exception):
+    """Raised when the sandbox had to be killed; `reason` is 'timeout', 'memory' or 'crash'."""
+    def __init__(self, reason, detail):
+        super().__init__(detail)
+        self.reason = reason
+
+class PageSandbox:
+    """
+    A killable child process that extracts PDF pages one at a time.
+
+    Each page is bounded by `page_timeout` seconds and, on Linux, by `rss_limit_mb` of
+    resident memory in the child. When a page exceeds either limit the child is killed and
+    a fresh one reopens the document, so the remaining pages are still extracted. Opening
+    a document parses the whole file, so it is bounded by `open_timeout` instead (no time
+    limit by default; the memory limit still applies). The
+    child is reused across documents, keeping its font cache warm. The 1-based numbers of
+    textless pages the child skipped are kept in `skipped_pages` for the last document, and
+    its Title and Producer in `metadata`.
+    """
+    def __init__(self, page_timeout=None, rss_limit_mb=None, poll_interval=0.05, open_timeout=None):
+        self.page_timeout = page_timeout
+        self.open_timeout = open_timeout
+        self.rss_limit = rss_limit_mb * 1024 * 1024 if rss_limit_mb else None
+        self.poll_interval = poll_interval
+        self.process = None
+        self.conn = None
+        self.current_path = None
+        self.restarts = 0
+        self.skipped_pages = []
+        self.metadata = None
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_sandbox_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def _kill(self):
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join()
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def _request(self, command, arg, timeout=None):
+        if self.process is None:
+            self._start()
+        self.conn.send((command, arg))
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            wait = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._kill()
+                    raise PageLimitExceeded('timeout', f"exceeded {timeout}s")
+                wait = min(wait, remaining)
+            if self.conn.poll(wait):
+                try:
+                    return self.conn.recv()
+                except EOFError:
+                    pass
+            if self.rss_limit is not None:
+                rss = _rss_bytes(self.process.pid)
+                if rss is not None and rss > self.rss_limit:
+                    self._kill()
+                    raise PageLimitExceeded('memory', f"RSS {rss // (1024 * 1024)} MB exceeded {self.rss_limit // (1024 * 1024)} MB")
+            if not self.process.is_alive():
+                exitcode = self.process.exitcode
+                self._kill()
+                raise PageLimitExceeded('crash', f"worker exited with code {exitcode}")
+
+    def open(self, pdf_path):
+        """Opens pdf_path in the child and returns its page count."""
+        self.current_path = pdf_path
+        self.skipped_pages = []
+        self.metadata = None
+        try:
+            status, value = self._request('open', pdf_path, self.open_timeout)
+        except PageLimitExceeded as e:
+            raise RuntimeError(f"Could not open '{pdf_path}' in the page sandbox: {e}") from e
+        if status != 'ok':
+            raise RuntimeError(value)
+        page_count, self.metadata = value
+        return page_count
+
+    def extract_page(self, page_index):
+        """Extracts one page (0-based). Raises PageLimitExceeded if the child had to be killed."""
+        try:
+            status, value = self._request('page', page_index, self.page_timeout)
+        except PageLimitExceeded as e:
+            self.restarts += 1
+            # Reopen the document in a fresh child for the pages that follow.
+            try:
+                self._start()
+                self._request('open', self.current_path, self.open_timeout)
+            except PageLimitExceeded as reopen_error:
+                raise RuntimeError(f"Could not reopen '{self.current_path}' after page {page_index + 1} failed: {reopen_error}") from e
+            raise
+        if status == 'skipped':
+            self.skipped_pages.append(page_index + 1)
+            status = 'ok'
+        return status, value
+
+    def close(self):
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(('close', None))
+                self.process.join(timeout=1)
+            except (OSError, BrokenPipeError):
+                pass
+        self._kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+_PLACEHOLDERS = {
+    'timeout': "[PAGE_TIMEOUT:{page}]\n",
+    'memory': "[PAGE_MEMORY_LIMIT:{page}]\n",
+    'crash': "[ERROR_EXTRACTING_PAGE:{page}:{detail}]\n",
+    'error': "[ERROR_EXTRACTING_PAGE:{page}:{detail}]\n",
+}
+
+def extract_pages_isolated(pdf_path, sandbox):
+    """
+    Extracts every page of pdf_path through a PageSandbox.
+
+    Pages that fail, time out or exceed the memory limit are replaced by a placeholder such
+    as `[PAGE_TIMEOUT:n]` and extraction continues with the next page.
+
+    Returns:
+        tuple: (list of page texts, list of {'page', 'reason', 'detail'} dicts for failed pages)
+    """
+    page_count = sandbox.open(pdf_path)
+    page_texts = []
+    failures = []
+    for index in range(page_count):
+        page_num = index + 1
+        try:
+            status, value = sandbox.extract_page(index)
+        except PageLimitExceeded as e:
+            status, value, reason = 'failed', str(e), e.reason
+        else:
+            reason = 'error'
+        if status == 'ok':
+            page_texts.append(value)
+            continue
+        print(f"Warning: page {page_num} of '{pdf_path}' was not extracted ({reason}): {value}")
+        failures.append({'page': page_num, 'reason': reason, 'detail': value})
+        page_texts.append(_PLACEHOLDERS[reason].format(page=page_num, detail=value))
+    return page_texts, failures
+
+_worker_sandbox = None
+
+def get_worker_sandbox(page_timeout=None, rss_limit_mb=None):
+    """Returns this process's PageSandbox, creating it on first use."""
+    global _worker_sandbox
+    if _worker_sandbox is None:
+        _worker_sandbox = PageSandbox(page_timeout=page_timeout, rss_limit_mb=rss_limit_mb)
+    return _worker_sandbox
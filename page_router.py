@@ -0,0 +1,218 @@
+import re
+import sys
+import time
+import argparse
+from collections import Counter
+
+from pdfminer.pdftypes import PDFStream, resolve1
+
+from pdf_parser import get_worker_context
+
+# PyPDF2 sometimes glues or splits words, so the header and caption checks allow for both.
+# Both are also run on a page's literal strings joined without separators.
+_header_pattern = re.compile(rb"Field\s*Name\s*Field\s*Description", re.IGNORECASE)
+_caption_pattern = re.compile(rb"Figure\s*\d+\s*\.", re.IGNORECASE)
+
+# Content stream tokens the layout scan needs: text positioning, font size, leading and
+# text-showing operators (a TJ array or a string shown with Tj or ').
+_number = rb"[-+]?(?:\d+\.?\d*|\.\d+)"
+_number_pattern = re.compile(_number)
+_operator_pattern = re.compile(
+    rb"(?P<tm>(?:" + _number + rb"\s+){5}" + _number + rb"\s*Tm)"
+    rb"|(?P<td>" + _number + rb"\s+" + _number + rb"\s*T[dD])"
+    rb"|(?P<tf>/[^\s/\[\]()<>]+\s+" + _number + rb"\s*Tf)"
+    rb"|(?P<tl>" + _number + rb"\s*TL)"
+    rb"|(?P<tstar>T\*)"
+    rb"|(?P<show>\[(?:\\.|[^\]\\])*\]\s*TJ|\((?:\\.|[^\\)])*\)\s*(?:Tj|'))")
+_literal_pattern = re.compile(rb"\(((?:\\.|[^\\)])*)\)")
+# A rectangle operator: table cell borders and shading.
+_rectangle_pattern = re.compile(rb"\sre\s")
+
+ROUTES = ('pypdf2', 'pdfminer')
+
+def _page_data(page):
+    contents = getattr(page, 'contents', None)
+    if not isinstance(contents, list):
+        return None
+    streams = [resolve1(stream) for stream in contents]
+    return b"\n".join(stream.get_data() for stream in streams if isinstance(stream, PDFStream))
+
+def _count_columns(data, column_gap, x_bin):
+    """
+    Lines and columns of a content stream, from text positions alone.
+
+    Shown strings are placed by following Tm, Td/TD, T* and TL, with widths estimated at
+    half the font size per character. Only a segment that starts at least column_gap
+    points after the end of the previous segment on the same line starts a column, so
+    indents, bullets and numbered headings (a small offset from the line start) and font
+    changes inside a line (no gap) are not counted. A column is an x bin where at least
+    10% of the lines start such a segment; the columns are those plus the left margin.
+    """
+    x = y = line_x = line_y = 0.0
+    scale, size, leading = 1.0, 1.0, 0.0
+    lines = {}
+    for match in _operator_pattern.finditer(data):
+        kind = match.lastgroup
+        if kind == 'show':
+            shown = b''.join(_literal_pattern.findall(match.group()))
+            width = len(shown) * size * scale * 0.5
+            if shown.strip():
+                lines.setdefault(round(y), []).append((x, x + width))
+            x += width
+            continue
+        numbers = [float(n) for n in _number_pattern.findall(match.group())]
+        if kind == 'tm':
+            scale = abs(numbers[-3]) or 1.0
+            line_x, line_y = numbers[-2], numbers[-1]
+        elif kind == 'td':
+            line_x += numbers[-2] * scale
+            line_y += numbers[-1] * scale
+            if match.group().rstrip().endswith(b'TD'):
+                leading = -numbers[-1]
+        elif kind == 'tf':
+            size = numbers[-1] or 1.0
+            continue
+        elif kind == 'tl':
+            leading = numbers[-1]
+            continue
+        else:
+            line_y -= leading * scale
+        x, y = line_x, line_y
+    column_starts = Counter()
+    for segments in lines.values():
+        segments.sort()
+        end = segments[0][1]
+        for start, segment_end in segments[1:]:
+            if start - end >= column_gap:
+                column_starts[round(start / x_bin)] += 1
+            end = max(end, segment_end)
+    columns = 1 + sum(1 for n in column_starts.values() if n >= 0.1 * len(lines)) if lines else 0
+    return len(lines), columns
+
+def score_page(page, column_gap=36.0, x_bin=15.0, max_rules=50, min_chars=200):
+    """
+    Scores how complex a pdfminer page's layout is from its content streams, without
+    extracting it with either backend.
+
+    The literal strings the page shows give `chars` and are searched for a "Field Name
+    Field Description" header and a "Figure N." caption; rectangle operators (table
+    borders and shading) give `rules`. Lines and columns (see _count_columns) are only
+    counted for pages that none of those already send to pdfminer. Text in hex strings
+    (CID fonts) cannot be read this way, so such pages come out with few chars.
+
+    Returns:
+        dict: 'chars', 'rules', 'header', 'caption', 'lines' and 'columns' (None when not counted).
+    """
+    data = _page_data(page) or b''
+    text = b''.join(_literal_pattern.findall(data))
+    score = {
+        'chars': len(text) - text.count(b' '),
+        'rules': len(_rectangle_pattern.findall(data)),
+        'header': bool(_header_pattern.search(text)),
+        'caption': bool(_caption_pattern.search(text)),
+        'lines': None,
+        'columns': None,
+    }
+    if not (score['header'] or score['caption'] or score['rules'] > max_rules or score['chars'] < min_chars):
+        score['lines'], score['columns'] = _count_columns(data, column_gap, x_bin)
+    return score
+
+def choose_route(score, max_columns=1, max_rules=50, min_chars=200):
+    """
+    'pypdf2' for plain single-column text pages, 'pdfminer' for anything the parser's tables
+    or section boundaries depend on: field table headers, figure captions, ruled tables and
+    multi-column layouts. Pages with fewer than min_chars readable characters (image pages,
+    CID fonts) cannot be judged from the content stream and stay on pdfminer too.
+    """
+    if score['header'] or score['caption'] or score['rules'] > max_rules or score['chars'] < min_chars:
+        return 'pdfminer'
+    if score['columns'] is None or score['columns'] > max_columns:
+        return 'pdfminer'
+    return 'pypdf2'
+
+def extract_pages_routed(pdf_path, context=None, max_columns=1):
+    """
+    Extracts a PDF page by page, sending each page to the cheapest backend that handles it.
+
+    Each page is scored from its content streams first (see score_page), which costs a
+    millisecond or two; pdfminer decodes those streams once and reuses them if the page
+    goes to it. Simple pages are then extracted with PyPDF2 (about twice as fast), the
+    rest with this process's pdfminer ExtractionContext, as pdf_parser does. PyPDF2 is only
+    opened when the first simple page is found. If it cannot open the document (e.g. AES
+    encryption without PyCryptodome) or disagrees about the page count, every page goes to
+    pdfminer; a page PyPDF2 fails on goes to pdfminer alone.
+
+    Returns:
+        tuple: (page_texts, routes): page texts in page order, and one dict per page with
+               'page', 'route', 'seconds', the score and whether pdfminer skipped it as textless.
+    """
+    context = context or get_worker_context()
+    with open(pdf_path, 'rb') as in_file:
+        pdfminer_pages = context.open_document(in_file)
+        pypdf2_pages = None
+        page_texts, routes = [], []
+        for index, pdfminer_page in enumerate(pdfminer_pages):
+            start = time.perf_counter()
+            score, text = None, None
+            try:
+                score = score_page(pdfminer_page)
+                route = choose_route(score, max_columns)
+            except Exception:
+                route = 'pdfminer'
+            if route == 'pypdf2':
+                if pypdf2_pages is None:
+                    pypdf2_pages = _open_pypdf2(in_file, len(pdfminer_pages))
+                try:
+                    text = pypdf2_pages[index].extract_text() if pypdf2_pages else None
+                except Exception:
+                    text = None
+                if text is None:
+                    route = 'pdfminer'
+                elif not text.endswith('\n'):
+                    text += '\n'
+            skipped = False
+            if route == 'pdfminer':
+                before = context.pages_skipped
+                text = context.extract_page(pdfminer_page)
+                skipped = context.pages_skipped != before
+            page_texts.append(text)
+            routes.append({'page': index + 1, 'route': route, 'seconds': round(time.perf_counter() - start, 4),
+                           'score': score, 'skipped': skipped})
+    return page_texts, routes
+
+def _open_pypdf2(in_file, page_count):
+    """PyPDF2's pages of the open file, or [] if it cannot read them or counts them differently."""
+    from PyPDF2 import PdfReader
+    try:
+        reader = PdfReader(in_file)
+        return list(reader.pages) if len(reader.pages) == page_count else []
+    except Exception:
+        return []
+
+def route_summary(routes):
+    """Pages and seconds per backend."""
+    summary = {route: {'pages': 0, 'seconds': 0.0} for route in ROUTES}
+    for entry in routes:
+        summary[entry['route']]['pages'] += 1
+        summary[entry['route']]['seconds'] = round(summary[entry['route']]['seconds'] + entry['seconds'], 4)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show how each page of a PDF would be routed between PyPDF2 and pdfminer.")
+    parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
+    parser.add_argument("--max_columns", type=int, default=1, help="Pages with more text columns than this go to pdfminer (default: 1).")
+    args = parser.parse_args()
+
+    try:
+        page_texts, routes = extract_pages_routed(args.pdf_file, max_columns=args.max_columns)
+    except Exception as e:
+        print(f"Error: could not extract '{args.pdf_file}': {e}")
+        sys.exit(1)
+    for entry in routes:
+        score = entry['score']
+        detail = (f"{score['chars']} chars, {score['rules']} rules"
+                  f"{'' if score['columns'] is None else ', ' + str(score['columns']) + ' column(s)'}"
+                  f"{', header' if score['header'] else ''}{', caption' if score['caption'] else ''}") if score else "not scored"
+        print(f"  page {entry['page']}: {entry['route']} ({detail}) {entry['seconds']}s")
+    for route, stats in route_summary(routes).items():
+        print(f"{route}: {stats['pages']} page(s), {stats['seconds']}s")
@@ -0,0 +1,107 @@
+import os
+import sys
+import zlib
+import struct
+import argparse
+from collections import OrderedDict
+
+# An entry on disk: the seconds the page took to extract (float64), then its zlib-compressed UTF-8 text.
+_SECONDS = struct.Struct('<d')
+
+class PageStore:
+    """
+    Extracted page texts shared across documents, keyed by page content fingerprint
+    (pdf_parser.page_fingerprint).
+
+    Near-duplicate PDFs (a guide and an excerpt of it, successive revisions) share most of
+    their pages byte for byte; with a store, an ExtractionContext interprets each distinct
+    page once and copies its text for every other document that contains it.
+
+    Entries are kept in a bounded in-memory LRU and, with `path`, also in a directory with one
+    small file per page, so worker processes and later runs share them. Files are written
+    under a temporary name and renamed, so concurrent writers of the same page are harmless.
+
+    Each entry keeps the seconds the page originally took, which is what a hit saves.
+    """
+    def __init__(self, path=None, max_pages=4096):
+        self.path = path
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], key + '.page')
+
+    def get(self, key):
+        """Returns (text, seconds) for a fingerprint, or None."""
+        entry = self._pages.get(key)
+        if entry is not None:
+            self._pages.move_to_end(key)
+            return entry
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key), 'rb') as f:
+                data = f.read()
+            entry = (zlib.decompress(data[_SECONDS.size:]).decode('utf-8'), _SECONDS.unpack_from(data)[0])
+        except (OSError, zlib.error, struct.error, UnicodeDecodeError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key, text, seconds):
+        """Stores a page's text and the seconds its extraction took."""
+        entry = (text, seconds)
+        self._remember(key, entry)
+        if self.path:
+            file_path = self._file(key)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            tmp_path = f"{file_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_SECONDS.pack(seconds) + zlib.compress(text.encode('utf-8')))
+            os.replace(tmp_path, file_path)
+
+    def _remember(self, key, entry):
+        self._pages[key] = entry
+        self._pages.move_to_end(key)
+        if len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def __len__(self):
+        """Pages in the store (on disk if it has a path, otherwise in memory)."""
+        if not self.path:
+            return len(self._pages)
+        return sum(1 for _, _, files in os.walk(self.path) for name in files if name.endswith('.page'))
+
+_page_stores = {}
+
+def get_page_store(path=None):
+    """This process's PageStore for `path` (None: memory only), created on first use."""
+    store = _page_stores.get(path)
+    if store is None:
+        store = _page_stores[path] = PageStore(path)
+    return store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract PDFs through a shared page store and report how many pages were reused.")
+    parser.add_argument("pdf_files", nargs='+', help="PDF files to extract, in order.")
+    parser.add_argument("--store", type=str, default=None, help="Directory for the page store (default: in memory only).")
+    args = parser.parse_args()
+
+    from pdf_parser import ExtractionContext
+    context = ExtractionContext(page_store=get_page_store(args.store))
+    for pdf_file in args.pdf_files:
+        before = context.stats()
+        try:
+            with open(pdf_file, 'rb') as in_file:
+                pages = context.extract_pages(in_file)
+        except Exception as e:
+            print(f"Error: could not extract '{pdf_file}': {e}")
+            sys.exit(1)
+        after = context.stats()
+        print(f"  {pdf_file}: {len(pages)} pages, {after['page_store_hits'] - before['page_store_hits']} reused "
+              f"({after['page_store_seconds_saved'] - before['page_store_seconds_saved']:.2f}s saved)")
+    stats = context.stats()
+    print(f"{stats['page_store_hits']} of {stats['page_store_hits'] + stats['page_store_misses']} pages reused, "
+          f"{stats['page_store_seconds_saved']:.2f}s saved, {stats['page_store_hash_seconds']:.2f}s spent hashing.")
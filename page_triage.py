@@ -0,0 +1,56 @@
+import re
+from pdfminer.pdftypes import PDFStream, resolve1
+from pdfminer.psparser import LIT
+
+# The BT (begin text object) operator, as a standalone token. Every text-showing
+# operator (Tj, TJ, ', ") must appear inside a BT ... ET block.
+_BEGIN_TEXT_TOKEN = re.compile(rb"(?<![^\x00\t\n\x0c\r ()<>\[\]{}/%])BT(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+_LITERAL_FORM = LIT('Form')
+
+def _form_xobjects(resources):
+    xobjects = resolve1(resources.get('XObject')) if isinstance(resources, dict) else None
+    if not isinstance(xobjects, dict):
+        return
+    for xobj in xobjects.values():
+        xobj = resolve1(xobj)
+        if isinstance(xobj, PDFStream) and resolve1(xobj.get('Subtype')) is _LITERAL_FORM:
+            yield xobj
+
+def _streams_have_text(streams, resources, depth, seen):
+    for stream in streams:
+        stream = resolve1(stream)
+        if isinstance(stream, PDFStream) and _BEGIN_TEXT_TOKEN.search(stream.get_data()):
+            return True
+    if depth >= 4:
+        # Deeply nested forms are rare; assume text rather than walk further.
+        return True
+    for form in _form_xobjects(resolve1(resources)):
+        if id(form) in seen:
+            continue
+        seen.add(id(form))
+        if _streams_have_text([form], form.get('Resources', resources), depth + 1, seen):
+            return True
+    return False
+
+def page_has_text(page):
+    """
+    Cheaply decides whether a pdfminer PDFPage can produce any text.
+
+    Scans the page's content streams, and those of any Form XObjects it uses, for a
+    BT (begin text) operator without interpreting them. Decoded stream data is kept on
+    the stream objects, so a page that does have text is not decoded twice.
+
+    Args:
+        page (PDFPage): The pdfminer page (pdfplumber exposes it as `page.page_obj`).
+
+    Returns:
+        bool: False only when the page certainly has no text, e.g. a scanned or image-only page.
+    """
+    contents = getattr(page, 'contents', None)
+    if not isinstance(contents, list):
+        return True
+    try:
+        return _streams_have_text(contents, page.resources, 0, set())
+    except Exception:
+        # Let the interpreter deal with (and report) anything unusual.
+        return True
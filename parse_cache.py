@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+
+from field_record import FieldRecord, FullFieldRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    parser TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    rows BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+# The parsers whose results can be cached, with the module defining each one's PARSER_VERSION.
+PARSERS = {
+    'pdf_parser.parse_section': 'pdf_parser',
+    'pdf_parser_pypdf2.parse_fields_from_text': 'pdf_parser_pypdf2',
+    'extract_fields_only.extract_fields': 'extract_fields_only',
+}
+
+# Bump when normalize_text changes: entries keyed under an earlier normalization may hold
+# rows of a text that now normalizes differently, so their keys must not match any more.
+NORMALIZATION_VERSION = 2
+
+def normalize_text(text, strip_lines=True):
+    """
+    The form of a parser's input text that is hashed: '\r\n' line endings turned into '\n'
+    and, with strip_lines, trailing whitespace removed from every line. Only use strip_lines
+    for parsers that strip each line before looking at it, so that equal normalized text
+    always parses to equal rows. A lone '\r' is kept: the parsers split lines on '\n'
+    only, so it does not end a line for them.
+    """
+    text = text.replace('\r\n', '\n')
+    if strip_lines:
+        text = '\n'.join(line.rstrip() for line in text.split('\n'))
+    return text
+
+def cache_key(parser, version, settings, text, strip_lines=True):
+    """sha256 over the parser's name and version, its settings (a string) and the normalized text."""
+    hasher = hashlib.sha256()
+    for part in (f"n{NORMALIZATION_VERSION}", parser, str(version), settings):
+        hasher.update(part.encode('utf-8') + b'\0')
+    hasher.update(normalize_text(text, strip_lines).encode('utf-8'))
+    return hasher.hexdigest()
+
+def encode_rows(rows, line_offset=0):
+    """
+    Rows as zlib-compressed JSON. `line` is stored relative to line_offset, so the same
+    section found at another position in a document is still a hit.
+    """
+    encoded = []
+    for row in rows:
+        line = None if row.line is None else row.line - line_offset
+        values = [row.section, row.name, row.description, row.page, line]
+        if isinstance(row, FullFieldRecord):
+            values += [row.field_type, row.max_size, row.nullable, row.key]
+        encoded.append(values)
+    return zlib.compress(json.dumps(encoded, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def decode_rows(data, line_offset=0):
+    """New FieldRecord/FullFieldRecord objects from encode_rows output, lines shifted back by line_offset."""
+    rows = []
+    for values in json.loads(zlib.decompress(data).decode('utf-8')):
+        section, name, description, page, line = values[:5]
+        line = None if line is None else line + line_offset
+        if len(values) > 5:
+            row = FullFieldRecord(section, name, description, page=page, line=line)
+            row.field_type, row.max_size, row.nullable, row.key = values[5:]
+        else:
+            row = FieldRecord(section, name, description, page=page, line=line)
+        rows.append(row)
+    return rows
+
+class ParseCache:
+    """
+    Parse results keyed by the hash of the parser's normalized input text, the parser's
+    name, its PARSER_VERSION stamp and its settings (profile rules, columns), in a SQLite file.
+
+    A parser whose input and rules have not changed returns its stored rows without parsing.
+    Bumping a parser's PARSER_VERSION changes every key, so results of the old rules are
+    never returned; they are evicted like any unused entry, or removed at once by
+    invalidate(). The file is bounded by `max_bytes` of stored rows: after a put that goes
+    over, the least recently used entries are deleted.
+
+    Several processes can share one file; each should open its own ParseCache (see get_parse_cache).
+    """
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, timeout=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key, line_offset=0):
+        """Returns the stored rows for key (new objects), or None."""
+        found = self._conn.execute("SELECT rows FROM results WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return decode_rows(found[0], line_offset)
+
+    def put(self, key, parser, version, rows, line_offset=0):
+        """Stores rows under key, then evicts least recently used entries beyond max_bytes."""
+        data = encode_rows(rows, line_offset)
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, parser, version, rows, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, parser, version, data, len(data), now, now))
+            self._evict()
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _evict(self):
+        excess = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+
+    def memoize(self, parser, version, settings, text, parse, strip_lines=True, line_offset=0):
+        """
+        Returns parse()'s rows for this text, from the cache when the key is there and
+        otherwise by calling parse() and storing the result.
+        """
+        key = cache_key(parser, version, settings, text, strip_lines)
+        rows = self.get(key, line_offset)
+        if rows is None:
+            rows = parse()
+            self.put(key, parser, version, rows, line_offset)
+        return rows
+
+    def invalidate(self, parser=None, current_versions=None):
+        """
+        Deletes entries: all of them, those of one parser, or (with current_versions, a dict
+        of parser -> PARSER_VERSION) only those written by other versions.
+
+        Returns:
+            int: Entries deleted.
+        """
+        before = self._conn.total_changes
+        if current_versions is not None:
+            for name, version in current_versions.items():
+                if parser is None or name == parser:
+                    self._conn.execute("DELETE FROM results WHERE parser = ? AND version != ?", (name, version))
+        elif parser is not None:
+            self._conn.execute("DELETE FROM results WHERE parser = ?", (parser,))
+        else:
+            self._conn.execute("DELETE FROM results")
+        return self._conn.total_changes - before
+
+    def stats(self):
+        """Entries and stored bytes per parser and version, plus this object's hits and misses."""
+        parsers = {}
+        for parser, version, entries, size in self._conn.execute(
+                "SELECT parser, version, COUNT(*), SUM(size) FROM results GROUP BY parser, version ORDER BY parser, version"):
+            parsers[f"{parser} v{version}"] = {'entries': entries, 'bytes': size}
+        return {'hits': self.hits, 'misses': self.misses, 'parsers': parsers}
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_parse_caches = {}
+
+def get_parse_cache(path):
+    """This process's ParseCache for path, opened on first use (a connection is never shared with a forked child)."""
+    key = (path, os.getpid())
+    cache = _parse_caches.get(key)
+    if cache is None:
+        cache = _parse_caches[key] = ParseCache(path)
+    return cache
+
+def current_versions():
+    """PARSER_VERSION of every cacheable parser, importing the parser modules."""
+    import importlib
+    return {parser: importlib.import_module(module).PARSER_VERSION for parser, module in PARSERS.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or invalidate a parse result cache.")
+    parser.add_argument("--cache", type=str, required=True, help="Path to the parse cache (SQLite file).")
+    parser.add_argument("--prune", action="store_true", help="Delete results written by parser versions other than the current ones.")
+    parser.add_argument("--clear", action="store_true", help="Delete every result (or only --parser's).")
+    parser.add_argument("--parser", type=str, default=None, choices=list(PARSERS), help="Limit --prune or --clear to one parser.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.cache):
+        print(f"Error: Parse cache not found: {args.cache}")
+        sys.exit(1)
+    with ParseCache(args.cache) as cache:
+        if args.prune:
+            print(f"Pruned {cache.invalidate(args.parser, current_versions())} result(s) of old parser versions.")
+        elif args.clear:
+            print(f"Cleared {cache.invalidate(args.parser)} result(s).")
+        for name, stats in cache.stats()['parsers'].items():
+            print(f"  {name}: {stats['entries']} result(s), {stats['bytes']} bytes")
@@ -0,0 +1,144 @@
+import time
+
+# Branches of parse_section that claim a line, in the order they are checked. Sub-branches
+# (the ScenarioC outcomes, NewSentenceHeuristic, MidLineSplitFinalize) are counted but
+# their time is attributed to the branch that claimed the line.
+PRIMARY_BRANCHES = (
+    'CSpecialKeywordFinalize', 'CSpecialMerge', 'CamelCase', 'StrongSignal',
+    'ScenarioB0', 'ScenarioA', 'ScenarioB', 'ScenarioC', 'ScenarioD',
+)
+
+def _new_stats():
+    return {'lines': 0, 'orphan_lines': 0, 'fields': 0, 'seconds': 0.0, 'branch_hits': {}, 'branch_seconds': {}}
+
+def _add_stats(total, stats):
+    for key in ('lines', 'orphan_lines', 'fields', 'seconds'):
+        total[key] += stats[key]
+    for key in ('branch_hits', 'branch_seconds'):
+        for branch, value in stats[key].items():
+            total[key][branch] = total[key].get(branch, 0) + value
+
+class ParseMetrics:
+    """
+    Counters and per-branch timings for parse_fields_from_text / parse_section.
+
+    Pass an instance as `metrics=` to collect, per section name, how many lines each
+    heuristic branch handled, the time spent in each, and how many lines were orphaned
+    (Scenario D). When no instance is passed the parser does no extra work.
+    """
+    def __init__(self):
+        self.sections = {}
+        self._current = None
+        self._section_start = None
+        self._line_start = None
+        self._line_branch = None
+
+    def begin_section(self, name):
+        self._current = self.sections.setdefault(name, _new_stats())
+        self._section_start = time.perf_counter()
+        self._line_start = None
+
+    def begin_line(self):
+        now = time.perf_counter()
+        self._flush_line(now)
+        self._current['lines'] += 1
+        self._line_start = now
+        self._line_branch = None
+
+    def branch(self, name):
+        """Counts a branch hit; the first primary branch of a line is charged its time."""
+        hits = self._current['branch_hits']
+        hits[name] = hits.get(name, 0) + 1
+        if self._line_branch is None and name in PRIMARY_BRANCHES:
+            self._line_branch = name
+
+    def orphan(self):
+        """Records Scenario D for a line no other branch claimed."""
+        if self._line_branch is None:
+            self.branch('ScenarioD')
+            self._current['orphan_lines'] += 1
+
+    def end_section(self, fields):
+        now = time.perf_counter()
+        self._flush_line(now)
+        self._current['fields'] += fields
+        self._current['seconds'] += now - self._section_start
+        self._current = None
+
+    def _flush_line(self, now):
+        if self._line_start is None:
+            return
+        branch = self._line_branch or 'Unclassified'
+        seconds = self._current['branch_seconds']
+        seconds[branch] = seconds.get(branch, 0.0) + (now - self._line_start)
+        self._line_start = None
+
+    def merge(self, summary):
+        """Adds the 'sections' of another summary (e.g. from a worker process) to this one."""
+        for name, stats in summary['sections'].items():
+            _add_stats(self.sections.setdefault(name, _new_stats()), stats)
+
+    def summary(self):
+        """
+        Returns:
+            dict: {'sections': {name: stats}, 'document': stats} where stats has 'lines',
+                  'orphan_lines', 'fields', 'seconds', 'branch_hits' and 'branch_seconds'.
+        """
+        document = _new_stats()
+        sections = {}
+        for name, stats in self.sections.items():
+            sections[name] = {k: dict(v) if isinstance(v, dict) else v for k, v in stats.items()}
+            _add_stats(document, stats)
+        return {'sections': sections, 'document': document}
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{_label_value(v)}"' for k, v in labels.items()) + '}'
+
+_METRIC_HELP = (
+    ('pdf_parser_lines_total', 'counter', 'Non-empty table lines examined.'),
+    ('pdf_parser_orphan_lines_total', 'counter', 'Lines no branch could attach to a field (Scenario D).'),
+    ('pdf_parser_fields_total', 'counter', 'Fields emitted.'),
+    ('pdf_parser_seconds_total', 'counter', 'Time spent parsing.'),
+    ('pdf_parser_branch_hits_total', 'counter', 'Lines handled by each parser branch.'),
+    ('pdf_parser_branch_seconds_total', 'counter', 'Time spent in lines claimed by each parser branch.'),
+)
+
+def to_prometheus(summaries):
+    """
+    Renders parse metrics in the Prometheus text exposition format.
+
+    Args:
+        summaries (dict): document name -> ParseMetrics.summary().
+
+    Returns:
+        str: Per-section series labelled {document, section} and per-document series
+             (metric names with a `_document` infix) labelled {document}.
+    """
+    lines = []
+    for scope in ('section', 'document'):
+        for metric, metric_type, help_text in _METRIC_HELP:
+            name = metric if scope == 'section' else metric.replace('pdf_parser_', 'pdf_parser_document_', 1)
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for document, summary in summaries.items():
+                if scope == 'section':
+                    scoped = [(dict(document=document, section=section), stats) for section, stats in summary['sections'].items()]
+                else:
+                    scoped = [(dict(document=document), summary['document'])]
+                for labels, stats in scoped:
+                    if metric.startswith('pdf_parser_branch_'):
+                        key = 'branch_hits' if metric.endswith('hits_total') else 'branch_seconds'
+                        for branch, value in sorted(stats[key].items()):
+                            lines.append(f"{name}{_labels(branch=branch, **labels)} {value:g}")
+                    else:
+                        key = metric[len('pdf_parser_'):-len('_total')]
+                        lines.append(f"{name}{_labels(**labels)} {stats[key]:g}")
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus(summaries, path):
+    """Writes to_prometheus(summaries) to path."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(to_prometheus(summaries))
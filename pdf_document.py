@@ -0,0 +1,248 @@
+import os
+import sys
+import time
+import pathlib
+import argparse
+import functools
+from collections import OrderedDict
+
+import pdfplumber
+from pdfplumber.page import Page
+from pdfplumber.utils import resolve_and_decode
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFStream
+
+class DecodedStreamCache:
+    """
+    Decoded (decrypted and decompressed) stream data of shared documents, bounded by `max_bytes`.
+
+    pdfminer decodes a stream on first use, keeps the result on the stream object and drops
+    the raw bytes, so every content stream, font file and object stream a document has
+    touched stays decoded for as long as the document is open. Streams of a SharedDocument
+    are decoded through this cache instead: their raw bytes are kept, and once the decoded
+    total goes over max_bytes the least recently used streams give up their decoded data and
+    are decoded again if they are needed later. Unfiltered streams cost nothing to keep and
+    are counted as 0 bytes.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.decode_seconds = 0.0
+        self._streams = OrderedDict()  # id(stream) -> (stream, size, owner)
+
+    def get_data(self, stream, owner=None):
+        """A stream's decoded data, decoding it (and evicting older streams) if it is not cached."""
+        key = id(stream)
+        if stream.data is not None and key in self._streams:
+            self.hits += 1
+            self._streams.move_to_end(key)
+            return stream.data
+        self.misses += 1
+        raw = stream.rawdata
+        t0 = time.perf_counter()
+        PDFStream.decode(stream)
+        self.decode_seconds += time.perf_counter() - t0
+        # decode() drops the raw bytes; keep them so an evicted stream can be decoded again.
+        stream.rawdata = raw
+        size = 0 if stream.data is raw else len(stream.data)
+        self._streams[key] = (stream, size, owner)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._streams) > 1:
+            _, (old, old_size, _) = self._streams.popitem(last=False)
+            old.data = None
+            self.bytes -= old_size
+            self.evictions += 1
+        return stream.data
+
+    def discard(self, owner):
+        """Forgets every stream of one document (it is being closed)."""
+        for key in [key for key, entry in self._streams.items() if entry[2] is owner]:
+            stream, size, _ = self._streams.pop(key)
+            self.bytes -= size
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'bytes': self.bytes, 'streams': len(self._streams),
+                'decode_seconds': round(self.decode_seconds, 4)}
+
+_stream_cache = None
+
+def get_stream_cache():
+    """Returns this process's DecodedStreamCache, creating it on first use."""
+    global _stream_cache
+    if _stream_cache is None:
+        _stream_cache = DecodedStreamCache()
+    return _stream_cache
+
+class _CachedStreamDocument(PDFDocument):
+    """A PDFDocument whose streams decode through a DecodedStreamCache."""
+    def __init__(self, parser, stream_cache, password=''):
+        self.stream_cache = stream_cache
+        super().__init__(parser, password)
+
+    def getobj(self, objid):
+        obj = super().getobj(objid)
+        if isinstance(obj, PDFStream) and 'get_data' not in obj.__dict__:
+            obj.get_data = functools.partial(self.stream_cache.get_data, obj, self)
+        return obj
+
+class SharedDocument:
+    """
+    One parsed PDF serving both the pdfminer interpreter path and pdfplumber's page API.
+
+    pdfplumber is built on pdfminer, but pdf_parser and extract_fields_only each used to open
+    the file, parse its xref and trailer and decompress its object streams themselves. A
+    SharedDocument does that once: `pages` are the document's pdfminer PDFPages (pass the
+    document to ExtractionContext.extract_document), and `plumber()` is a pdfplumber PDF over
+    the same PDFDocument and PDFPages. Object lookups are cached by pdfminer as usual;
+    decoded streams go through a DecodedStreamCache (this process's by default), which keeps
+    their memory bounded.
+
+    The file stays open until close(). Use get_shared_document to reuse one handle per file
+    within a process.
+    """
+    def __init__(self, pdf_path, stream_cache=None, password=''):
+        self.pdf_path = pdf_path
+        self.stream_cache = stream_cache if stream_cache is not None else get_stream_cache()
+        self.uses = 0
+        self._plumber = None
+        self._file = open(pdf_path, 'rb')
+        t0 = time.perf_counter()
+        try:
+            self.doc = _CachedStreamDocument(PDFParser(self._file), self.stream_cache, password)
+            self.pages = list(PDFPage.create_pages(self.doc))
+        except Exception:
+            self._file.close()
+            raise
+        self.parse_seconds = time.perf_counter() - t0
+
+    def plumber(self):
+        """The pdfplumber view of this document (created on first use)."""
+        if self._plumber is None:
+            self._plumber = SharedPlumberPDF(self)
+        return self._plumber
+
+    def close(self):
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self.stream_cache.discard(self.doc)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SharedPlumberPDF(pdfplumber.PDF):
+    """
+    A pdfplumber PDF over a SharedDocument's PDFDocument and PDFPages.
+
+    pdfplumber.PDF.__init__ parses the file itself, so it is not called; the attributes it
+    sets are filled in from the shared document instead. The file belongs to the
+    SharedDocument, so closing this PDF only drops pdfplumber's cached page objects.
+    """
+    def __init__(self, document, laparams=None, unicode_norm=None, raise_unicode_errors=True):
+        self.stream = document._file
+        self.stream_is_external = True
+        self.path = pathlib.Path(document.pdf_path)
+        self.pages_to_parse = None
+        self.laparams = None if laparams is None else LAParams(**laparams)
+        self.password = None
+        self.unicode_norm = unicode_norm
+        self.raise_unicode_errors = raise_unicode_errors
+        self.doc = document.doc
+        self.rsrcmgr = PDFResourceManager()
+        self.metadata = {}
+        self._document = document
+        for info in self.doc.info:
+            self.metadata.update(info)
+        for key, value in self.metadata.items():
+            try:
+                self.metadata[key] = resolve_and_decode(value)
+            except Exception:
+                pass
+
+    @property
+    def pages(self):
+        if hasattr(self, '_pages'):
+            return self._pages
+        doctop = 0
+        self._pages = []
+        for index, page_obj in enumerate(self._document.pages):
+            page = Page(self, page_obj, page_number=index + 1, initial_doctop=doctop)
+            self._pages.append(page)
+            doctop += page.height
+        return self._pages
+
+_shared_documents = OrderedDict()
+
+def _file_signature(pdf_path):
+    stat = os.stat(pdf_path)
+    return stat.st_size, stat.st_mtime_ns
+
+def get_shared_document(pdf_path, max_documents=2):
+    """
+    This process's SharedDocument for pdf_path, parsed on first use.
+
+    The handle is reused until the file changes on disk; at most `max_documents` are kept
+    open, and the least recently used one is closed when another is opened. A forked child
+    never reuses its parent's handles, whose file position it would share.
+    """
+    key = (os.path.abspath(pdf_path), os.getpid())
+    signature = _file_signature(pdf_path)
+    entry = _shared_documents.get(key)
+    if entry is not None and entry[0] == signature:
+        _shared_documents.move_to_end(key)
+        document = entry[1]
+    else:
+        if entry is not None:
+            del _shared_documents[key]
+            entry[1].close()
+        document = SharedDocument(pdf_path)
+        _shared_documents[key] = (signature, document)
+        while len(_shared_documents) > max_documents:
+            _, (_, oldest) = _shared_documents.popitem(last=False)
+            oldest.close()
+    document.uses += 1
+    return document
+
+def release_shared_document(pdf_path):
+    """Closes this process's SharedDocument for pdf_path, if there is one."""
+    entry = _shared_documents.pop((os.path.abspath(pdf_path), os.getpid()), None)
+    if entry is not None:
+        entry[1].close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract a PDF with pdfminer and pdfplumber through one shared parsed document and report the cost.")
+    parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
+    parser.add_argument("--max_stream_mb", type=float, default=64, help="Memory bound for decoded streams, in MB (default: 64).")
+    args = parser.parse_args()
+
+    import contextlib
+    import pdf_parser
+    import extract_fields_only
+    try:
+        document = SharedDocument(args.pdf_file, DecodedStreamCache(int(args.max_stream_mb * 1024 * 1024)))
+    except Exception as e:
+        print(f"Error: could not open '{args.pdf_file}': {e}")
+        sys.exit(1)
+    with document, open(os.devnull, 'w') as devnull:
+        print(f"Parsed '{args.pdf_file}' once: {len(document.pages)} pages in {document.parse_seconds:.3f}s.")
+        for name, extract in (('pdfminer', pdf_parser.extract_text_from_pdf),
+                              ('pdfplumber', extract_fields_only.extract_text_from_pdf)):
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                text = extract(args.pdf_file, document=document)
+            print(f"  {name}: {len(text or '')} chars in {time.perf_counter() - t0:.2f}s")
+        stats = document.stream_cache.stats()
+        print(f"Decoded streams: {stats['misses']} decodes, {stats['hits']} reuses, {stats['evictions']} evictions, "
+              f"{stats['bytes']} bytes held, {stats['decode_seconds']:.3f}s decoding.")
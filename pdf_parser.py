@@ -2,13 +2,26 @@ import re
 import csv # Import the csv module
 import argparse # Import the argparse module
 import sys # Import sys for sys.exit()
+import os
+import bisect
+import hashlib
+import time
+import functools
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
 from io import StringIO
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
-from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfdocument import PDFDocument, PDFNoPageLabels
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfpage import PDFPage, LITERAL_PAGE, LITERAL_PAGES
 from pdfminer.pdfparser import PDFParser, PDFSyntaxError
+from pdfminer.pdftypes import PDFObjRef, PDFStream, dict_value, list_value, resolve1
+from pdfminer.psparser import PSLiteral
+from page_triage import page_has_text
+from field_record import FieldRecord, FullFieldRecord, COLUMN_SETS, assign_pages, page_line_starts
+from document_profiles import DEFAULT_PROFILE, select_profile, get_profile, profile_names, document_metadata
 try:
     from pdfminer.psparser import PSSyntaxError as PSError  # compatibility alias
 except Exception:  # pragma: no cover
@@ -16,43 +29,441 @@ except Exception:  # pragma: no cover
         """Fallback when pdfminer does not expose PSError."""
         pass
 
-def _finalize_and_add_field(field_name, description_parts, section_name, section_fields_list, line_num_debug, context_debug_msg):
-    """Helper to finalize a field and add it to the section_fields_list."""
+# Bump when parse_section's rules change: parse results cached by earlier versions
+# (see parse_cache.py) are then never returned.
+PARSER_VERSION = 2
+
+def _finalize_and_add_field(field_name, description_parts, section_name, section_fields_list, line_num_debug, context_debug_msg, field_line=None, record_class=FieldRecord):
+    """Helper to finalize a field and add it to the section_fields_list. field_line is the table line the field started on."""
     description = " ".join(description_parts).strip()
-    if description or not any(d['Field Name'] == field_name and d['Section'] == section_name for d in section_fields_list):
-        field_to_add = {
-            'Section': section_name,
-            'Field Name': field_name,
-            'Field Description': description
-        }
+    if description or not any(d.name == field_name and d.section == section_name for d in section_fields_list):
+        field_to_add = record_class(section_name, field_name, description, line=field_line)
         print(f"DEBUG: Line ~{line_num_debug} ({context_debug_msg}): Finalizing and Adding to section_fields: {field_to_add}")
         section_fields_list.append(field_to_add)
     else:
         print(f"DEBUG: Line ~{line_num_debug} ({context_debug_msg}): Field '{field_name}' already added or empty description not needed. Skipping.")
 
-def extract_text_from_pdf(pdf_path):
+def _fingerprint_pdf_object(obj, hasher, depth=0, seen=None, max_depth=8, decode=False):
+    """
+    Feeds a stable, document-independent description of a PDF object into `hasher`.
+    References are resolved (object ids are document-specific and are not hashed) and
+    streams contribute a digest of their bytes, so identical objects in different files
+    produce the same fingerprint. Objects nested deeper than max_depth are not described;
+    the return value is True if any were cut off that way. With decode, streams are always hashed decoded, so the fingerprint does not depend on
+    which streams pdfminer has already decoded (and dropped the raw bytes of).
+    """
+    if seen is None:
+        seen = set()
+    if depth > max_depth:
+        hasher.update(b'<deep>')
+        return True
+    truncated = False
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in seen:
+            hasher.update(b'<cycle>')
+            return False
+        seen.add(obj.objid)
+        try:
+            resolved = obj.resolve()
+        except Exception:
+            resolved = None
+        truncated = _fingerprint_pdf_object(resolved, hasher, depth + 1, seen, max_depth, decode)
+        seen.discard(obj.objid)
+    elif isinstance(obj, PDFStream):
+        hasher.update(b'<stream')
+        truncated = _fingerprint_pdf_object(obj.attrs, hasher, depth + 1, seen, max_depth, decode)
+        # Decoding drops the raw bytes, so tag which form was hashed. A raw/decoded
+        # mismatch can only cause a cache miss, never a false hit.
+        if decode:
+            try:
+                obj.get_data()
+            except Exception:
+                pass
+        if obj.rawdata is not None:
+            hasher.update(b'raw:' + hashlib.sha1(obj.rawdata).digest())
+        else:
+            hasher.update(b'dec:' + hashlib.sha1(obj.data or b'').digest())
+        hasher.update(b'>')
+    elif isinstance(obj, dict):
+        hasher.update(b'{')
+        for key in sorted(obj, key=str):
+            hasher.update(str(key).encode('utf-8', 'replace') + b':')
+            truncated |= _fingerprint_pdf_object(obj[key], hasher, depth + 1, seen, max_depth, decode)
+            hasher.update(b',')
+        hasher.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'[')
+        for item in obj:
+            truncated |= _fingerprint_pdf_object(item, hasher, depth + 1, seen, max_depth, decode)
+            hasher.update(b',')
+        hasher.update(b']')
+    elif isinstance(obj, PSLiteral):
+        hasher.update(b'/' + str(obj.name).encode('utf-8', 'replace'))
+    elif isinstance(obj, bytes):
+        hasher.update(b'b' + obj)
+    else:
+        hasher.update(repr(obj).encode('utf-8', 'replace'))
+    return truncated
+
+def page_fingerprint(page):
+    """
+    Content fingerprint of a pdfminer PDFPage: its content streams, its resources (fonts,
+    XObjects and everything they reference, to any depth) and its boxes and rotation.
+    Pages with the same fingerprint extract to the same text, in any document.
+    """
+    hasher = hashlib.sha1()
+    for part in (page.contents, page.resources, page.mediabox, page.cropbox, page.rotate):
+        _fingerprint_pdf_object(part, hasher, max_depth=64, decode=True)
+        hasher.update(b'|')
+    return hasher.hexdigest()
+
+def _fill_last_row(section_fields, column_text, field_types):
+    """
+    columns='all': the column values cut off a table line belong to the row just finalized.
+    They start at the first data type in it: a split at another keyword ("... sourced from
+    EDGAR. ALPHANUMERIC 30 Yes", "Date filed ... The DATE (DD-MMM-YY) 8 Yes") leaves
+    description words before them, and text with no data type holds no column values.
+    """
+    tokens = column_text.split()
+    for index, token in enumerate(tokens):
+        if token.isupper() and token in field_types:
+            if section_fields:
+                section_fields[-1].fill_columns(' '.join(tokens[index:]), field_types)
+            return
+
+def _continue_columns(record, line, field_types):
+    """
+    columns='all': a row's columns come from its own table line, so a line after the row only
+    adds to them when it continues a format split over lines ("(nnnnnnnnnn-nn-", "nnnnnn)"),
+    either as the whole line or, in a layout that keeps the Format column beside the
+    description, as its last token. Values after the closing parenthesis ("nnnnnn) 20 No *")
+    are the rest of the same row.
+    """
+    rest = record.continue_format(line)
+    if rest is None and ' ' in line:
+        record.continue_format(line.split()[-1])
+    elif rest:
+        record.fill_columns(rest, field_types)
+
+class CachingResourceManager(PDFResourceManager):
+    """
+    A PDFResourceManager whose font cache survives across documents.
+
+    pdfminer caches fonts by object id, which is only meaningful inside one document.
+    This manager keeps that per-document cache and adds a bounded, process-wide cache
+    keyed by a content fingerprint of the font dictionary, so documents typeset with
+    the same fonts skip font decoding and ToUnicode CMap parsing after the first file.
+    The fingerprint follows the font dictionary to the same depth as page_fingerprint; a
+    font nested deeper still is decoded without the shared cache rather than risk two
+    fonts sharing a key. Predefined CMaps are already cached process-wide by pdfminer's CMapDB.
+    """
+    def __init__(self, caching=True, max_shared_fonts=256):
+        super().__init__(caching=caching)
+        self.max_shared_fonts = max_shared_fonts
+        self._shared_fonts = OrderedDict()
+        self.font_cache_hits = 0
+        self.font_cache_misses = 0
+        self.font_cache_shared_hits = 0
+        self._document = None
+
+    def begin_document(self, document=None):
+        """
+        Drops the object-id cache; object ids are not comparable across documents. The cache
+        is kept if `document` is the document it was filled from.
+        """
+        if document is not None and document is self._document:
+            return
+        self._document = document
+        self._cached_fonts = {}
+
+    def get_font(self, objid, spec):
+        if objid and objid in self._cached_fonts:
+            self.font_cache_hits += 1
+            return self._cached_fonts[objid]
+        hasher = hashlib.sha1()
+        if _fingerprint_pdf_object(spec, hasher, max_depth=64):
+            key, font = None, None
+        else:
+            key = hasher.digest()
+            font = self._shared_fonts.get(key)
+        if key is None:
+            self.font_cache_misses += 1
+            font = super().get_font(None, spec)
+        elif font is None:
+            self.font_cache_misses += 1
+            font = super().get_font(None, spec)
+            self._shared_fonts[key] = font
+            if len(self._shared_fonts) > self.max_shared_fonts:
+                self._shared_fonts.popitem(last=False)
+        else:
+            self.font_cache_hits += 1
+            self.font_cache_shared_hits += 1
+            self._shared_fonts.move_to_end(key)
+        if objid and self.caching:
+            self._cached_fonts[objid] = font
+        return font
+
+def pages_in_range(doc, start, stop):
+    """
+    PDFPages [start, stop) of a parsed PDFDocument.
+
+    Walks the page tree as PDFPage.create_pages does, but skips every /Pages node whose
+    /Count of pages ends before `start` and stops at `stop`, so pages outside the range are
+    never built. A document without a page tree goes through create_pages.
+    """
+    pages = []
+    visited = set()
+    index = 0
+
+    def visit(obj, parent):
+        nonlocal index
+        objid = obj if isinstance(obj, int) else obj.objid
+        if objid in visited or index >= stop:
+            return
+        visited.add(objid)
+        attrs = dict_value(doc.getobj(obj) if isinstance(obj, int) else obj).copy()
+        for key, value in parent.items():
+            if key in PDFPage.INHERITABLE_ATTRS and key not in attrs:
+                attrs[key] = value
+        kind = attrs.get('Type', attrs.get('type'))
+        if kind is LITERAL_PAGES and 'Kids' in attrs:
+            count = resolve1(attrs.get('Count'))
+            if isinstance(count, int) and index + count <= start:
+                index += count
+                return
+            for kid in list_value(attrs['Kids']):
+                visit(kid, attrs)
+        elif kind is LITERAL_PAGE:
+            if index >= start:
+                pages.append(PDFPage(doc, objid, attrs, None))
+            index += 1
+
+    if 'Pages' not in doc.catalog:
+        return list(itertools.islice(PDFPage.create_pages(doc), start, stop))
+    visit(doc.catalog['Pages'], doc.catalog)
+    try:
+        labels = itertools.islice(doc.get_page_labels(), start, None)
+    except PDFNoPageLabels:
+        labels = itertools.repeat(None)
+    for page, label in zip(pages, labels):
+        page.label = label
+    return pages
+
+class ExtractionContext:
+    """
+    Long-lived pdfminer resource manager, converter and interpreter.
+
+    Creating one context per worker and reusing it for every document keeps the font
+    cache warm across files. `extract_pages` returns one string per page. Pages without
+    any text-showing operators (scans, image-only covers) are skipped before
+    interpretation and come back as empty strings; their 1-based numbers are kept in
+    `skipped_pages` for the last document, and its Title and Producer in `metadata` (see
+    document_profiles.select_profile), so the file need not be parsed again to read them.
+
+    With a `page_store` (see page_store.py), every page is fingerprinted first
+    (page_fingerprint) and a page already in the store is copied from it instead of
+    being interpreted again.
+    """
+    def __init__(self, rsrcmgr=None, laparams=None, skip_textless_pages=True, page_store=None):
+        self.rsrcmgr = rsrcmgr if rsrcmgr is not None else CachingResourceManager()
+        self.laparams = laparams if laparams is not None else LAParams()
+        self.skip_textless_pages = skip_textless_pages
+        self.page_store = page_store
+        self.device = TextConverter(self.rsrcmgr, StringIO(), laparams=self.laparams)
+        self.interpreter = PDFPageInterpreter(self.rsrcmgr, self.device)
+        self.documents = 0
+        self.pages = 0
+        self.pages_skipped = 0
+        self.skipped_pages = []
+        self.metadata = None
+        self.page_store_hits = 0
+        self.page_store_misses = 0
+        self.page_store_seconds_saved = 0.0
+        self.page_store_hash_seconds = 0.0
+        self._range_document = None  # (path, file signature, open file, PDFDocument)
+
+    def extract_pages(self, in_file, doc=None, known_texts=None):
+        """
+        Extracts the text of every page of an open binary PDF file, one string per page.
+        With `doc`, the PDFDocument already parsed from in_file is used. Pages whose 0-based
+        index is in `known_texts` (e.g. the pages document_triage sampled) take their text
+        from it instead of being interpreted again.
+        """
+        self.skipped_pages = []
+        if hasattr(self.rsrcmgr, 'begin_document'):
+            self.rsrcmgr.begin_document()
+        if doc is None:
+            parser = PDFParser(in_file)
+            doc = PDFDocument(parser)
+        self.metadata = document_metadata(doc)
+        return self._extract_page_objects(PDFPage.create_pages(doc), known_texts)
+
+    def extract_document(self, document):
+        """Like extract_pages, for the pages of an already parsed pdf_document.SharedDocument."""
+        self.skipped_pages = []
+        if hasattr(self.rsrcmgr, 'begin_document'):
+            self.rsrcmgr.begin_document()
+        self.metadata = document_metadata(document.doc)
+        return self._extract_page_objects(document.pages)
+
+    def _extract_page_objects(self, pages, known_texts=None):
+        output_string = StringIO()
+        self.device.outfp = output_string
+        page_count = 0
+        for page in pages:
+            page_count += 1
+            if self.skip_textless_pages and not page_has_text(page):
+                self.skipped_pages.append(page_count)
+                output_string.write('\f')
+                continue
+            if known_texts and page_count - 1 in known_texts:
+                output_string.write(known_texts[page_count - 1] + '\f')
+                continue
+            if self.page_store is not None:
+                output_string.write(self._stored_page_text(page) + '\f')
+                continue
+            self.interpreter.process_page(page)
+        self.pages += page_count
+        self.pages_skipped += len(self.skipped_pages)
+        self.documents += 1
+        if not page_count:
+            return []
+        # TextConverter terminates every page with a form feed.
+        page_texts = output_string.getvalue().split('\f')
+        if len(page_texts) > 1 and page_texts[-1] == '':
+            page_texts.pop()
+        return page_texts
+
+    def open_document(self, in_file):
+        """Parses an open binary PDF file and returns its pages for use with extract_page."""
+        self.skipped_pages = []
+        if hasattr(self.rsrcmgr, 'begin_document'):
+            self.rsrcmgr.begin_document()
+        parser = PDFParser(in_file)
+        doc = PDFDocument(parser)
+        self.metadata = document_metadata(doc)
+        self.documents += 1
+        return list(PDFPage.create_pages(doc))
+
+    def open_page_range(self, pdf_path, start, stop):
+        """
+        Pages [start, stop) of a PDF for use with extract_page: one range of a document the
+        batch scheduler split (see batch_parser.extract_page_range).
+
+        The parsed document stays open for the next range, so a worker parses a split file
+        once however many of its ranges it extracts, and keeps the file's font cache between
+        them. Only the pages in the range are built (see pages_in_range). A range is not
+        counted as a document.
+        """
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self._range_document is None or self._range_document[:2] != (path, signature):
+            self.close_page_range()
+            in_file = open(path, 'rb')
+            try:
+                doc = PDFDocument(PDFParser(in_file))
+            except Exception:
+                in_file.close()
+                raise
+            self._range_document = (path, signature, in_file, doc)
+        doc = self._range_document[3]
+        self.skipped_pages = []
+        self.metadata = document_metadata(doc)
+        if hasattr(self.rsrcmgr, 'begin_document'):
+            self.rsrcmgr.begin_document(doc)
+        return pages_in_range(doc, start, stop)
+
+    def close_page_range(self):
+        """Closes the document kept open by open_page_range, if there is one."""
+        if self._range_document is not None:
+            self._range_document[2].close()
+            self._range_document = None
+
+    def extract_page(self, page):
+        """Extracts the text of a single page returned by open_document."""
+        self.pages += 1
+        if self.skip_textless_pages and not page_has_text(page):
+            self.pages_skipped += 1
+            return ''
+        if self.page_store is not None:
+            return self._stored_page_text(page)
+        return self._interpret_page(page)
+
+    def _interpret_page(self, page):
+        output_string = StringIO()
+        outfp = self.device.outfp
+        self.device.outfp = output_string
+        try:
+            self.interpreter.process_page(page)
+        finally:
+            self.device.outfp = outfp
+        return output_string.getvalue().replace('\f', '')
+
+    def _stored_page_text(self, page):
+        """A page's text from the page store, interpreting the page (and storing it) on a miss."""
+        t0 = time.perf_counter()
+        key = page_fingerprint(page)
+        self.page_store_hash_seconds += time.perf_counter() - t0
+        entry = self.page_store.get(key)
+        if entry is not None:
+            self.page_store_hits += 1
+            self.page_store_seconds_saved += entry[1]
+            return entry[0]
+        self.page_store_misses += 1
+        t0 = time.perf_counter()
+        text = self._interpret_page(page)
+        self.page_store.put(key, text, time.perf_counter() - t0)
+        return text
+
+    def stats(self):
+        """Returns counters for the profile report."""
+        return {
+            'documents': self.documents,
+            'pages': self.pages,
+            'pages_skipped': self.pages_skipped,
+            'font_cache_hits': getattr(self.rsrcmgr, 'font_cache_hits', 0),
+            'font_cache_misses': getattr(self.rsrcmgr, 'font_cache_misses', 0),
+            'font_cache_shared_hits': getattr(self.rsrcmgr, 'font_cache_shared_hits', 0),
+            'page_store_hits': self.page_store_hits,
+            'page_store_misses': self.page_store_misses,
+            'page_store_seconds_saved': round(self.page_store_seconds_saved, 4),
+            'page_store_hash_seconds': round(self.page_store_hash_seconds, 4),
+        }
+
+_worker_context = None
+
+def get_worker_context():
+    """Returns this process's shared ExtractionContext, creating it on first use."""
+    global _worker_context
+    if _worker_context is None:
+        _worker_context = ExtractionContext()
+    return _worker_context
+
+def extract_text_from_pdf(pdf_path, context=None, document=None):
     """
     Extracts text from all pages of the specified PDF file.
     Also removes form feed characters ('\f') from the extracted text.
 
     Args:
         pdf_path (str): The file path to the PDF.
+        context (ExtractionContext, optional): A long-lived context to reuse (e.g. the one
+            returned by get_worker_context()). By default a fresh one is used for this file.
+        document (pdf_document.SharedDocument, optional): pdf_path already parsed, e.g. by
+            another backend; its pages are extracted instead of opening the file again.
 
     Returns:
         str or None: The extracted text content from the PDF, or None if an error occurs.
     """
     try:
-        output_string = StringIO()
-        with open(pdf_path, 'rb') as in_file:
-            parser = PDFParser(in_file)
-            doc = PDFDocument(parser)
-            rsrcmgr = PDFResourceManager()
-            device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
-            interpreter = PDFPageInterpreter(rsrcmgr, device)
-            for page in PDFPage.create_pages(doc):
-                interpreter.process_page(page)
-        full_text = output_string.getvalue()
-        full_text = full_text.replace('\f', '') 
+        if context is None:
+            context = ExtractionContext(rsrcmgr=PDFResourceManager())
+        if document is not None:
+            page_texts = context.extract_document(document)
+        else:
+            with open(pdf_path, 'rb') as in_file:
+                page_texts = context.extract_pages(in_file)
+        full_text = ''.join(page_texts)
         return full_text
     except FileNotFoundError:
         print(f"Error: Input PDF file not found: {pdf_path}")
@@ -67,281 +478,501 @@ def extract_text_from_pdf(pdf_path):
         print(f"An unexpected error occurred while processing PDF '{pdf_path}': {e}")
         return None
 
-def parse_fields_from_text(text):
-    print(f"DEBUG: Entered parse_fields_from_text. Text length: {len(text) if text else 'None'}")
-    if not text:
-        print("DEBUG: Text is empty or None. Returning empty list.")
-        return []
-    all_parsed_fields = []
-
-    other_column_keywords_strict = {
-        "ALPHANUMERIC", "NUMERIC", "DATE", "BOOLEAN", "EDGAR", "XBRL", "TEXT",
-        "VARCHAR", "INTEGER"
-    }
-    other_potentially_column_start_keywords = {"YES", "NO", "*"}
+# Parsing rules of the default profile, kept under their old names. parse_section and
+# find_section_bounds take the rules from a document_profiles.DocumentProfile.
+other_column_keywords_strict = DEFAULT_PROFILE.column_keywords
+other_potentially_column_start_keywords = DEFAULT_PROFILE.potential_column_keywords
+field_name_regex = DEFAULT_PROFILE.field_name_pattern.pattern
+known_acronyms_or_case_sensitive_names = DEFAULT_PROFILE.case_sensitive_names
+common_desc_start_words = DEFAULT_PROFILE.desc_start_words
+section_start_pattern = DEFAULT_PROFILE.section_start_pattern
+any_figure_line_pattern = re.compile(r"^\s*Figure \d+\.", re.MULTILINE | re.IGNORECASE)
+header_pattern = re.compile(r"Field\s+Name\s+Field\s+Description", re.IGNORECASE | re.DOTALL)
+_camel_case_part_pattern = re.compile(r"^[A-Z][a-zA-Z0-9_]*$")
+_camel_case_name_pattern = re.compile(r"^[a-z]+[A-Z][a-zA-Z0-9_]*$")
 
-    # Made more permissive for field names like 'series', 'total', 'verbose'
-    field_name_regex = r"^[A-Z0-9_]{3,}$"
-    # Keep known acronyms or specific case-sensitive names in a set to prevent lowercasing them.
-    known_acronyms_or_case_sensitive_names = {"CIK", "XBRL", "EDGAR", "ABS", "CRS", "DEFRS", "MFRR"} # Add more if needed
-
-    common_desc_start_words = {
-        "THE", "A", "AN", "THIS", "IF", "FOR", "AND", "OF", "IN", "TO", "IS", "ARE", "AS", "FIELD",
-        "MAX", "SIZE", "MAY", "BE", "NULL", "KEY", "SOURCE", "FORMAT", "DATA", "TYPE",
-        "LENGTH", "COMMENTS", "NAME", "DESCRIPTION", "FIELDNAME", "FIELDTYPE",
-        "NOTE", "CONTINUATION", "CODE"
-    }
-
-    section_start_pattern = re.compile(
-        r"Figure \d+\.[^\n]*?Fields in the\s+([A-Z0-9_]+(?:\s+[A-Z0-9_]+)*)\s+data (?:file|set)",
-        re.IGNORECASE | re.DOTALL
-    )
-    any_figure_line_pattern = re.compile(r"^\s*Figure \d+\.", re.MULTILINE | re.IGNORECASE)
-
-    all_section_start_matches = list(section_start_pattern.finditer(text))
-    print(f"DEBUG: Found {len(all_section_start_matches)} 'Fields in the...' section start matches.")
+def find_section_bounds(text, profile=None):
+    """
+    Finds every "Figure N. ... Fields in the X data file" section in one pass.
 
-    if not all_section_start_matches:
-        return all_parsed_fields
+    A section's body runs from the end of its caption to the next "Figure N." line (or the
+    next section caption, or the end of the text). Captions are matched with the profile's
+    section_start_pattern (default: DEFAULT_PROFILE).
 
+    Returns:
+        list: (section_name, body_start, body_end) tuples in document order.
+    """
+    all_section_start_matches = list((profile or DEFAULT_PROFILE).section_start_pattern.finditer(text))
+    figure_line_matches = list(any_figure_line_pattern.finditer(text))
+    figure_line_starts = [m.start() for m in figure_line_matches]
+    bounds = []
     for i, current_section_start_match in enumerate(all_section_start_matches):
         section_name_raw = current_section_start_match.group(1)
         section_name = ' '.join(section_name_raw.split()).strip()
         current_section_body_start_offset = current_section_start_match.end()
-        next_figure_line_match = None
         if i + 1 < len(all_section_start_matches):
-            next_section_start_offset = all_section_start_matches[i+1].start()
-            temp_next_figure_match = any_figure_line_pattern.search(text, current_section_body_start_offset, next_section_start_offset)
-            current_section_text_end = temp_next_figure_match.start() if temp_next_figure_match else next_section_start_offset
+            limit = all_section_start_matches[i+1].start()
+        else:
+            limit = len(text)
+        # First "Figure N." line that starts after the caption and ends before the next section.
+        j = bisect.bisect_left(figure_line_starts, current_section_body_start_offset)
+        if j < len(figure_line_matches) and figure_line_matches[j].end() <= limit:
+            current_section_text_end = figure_line_matches[j].start()
         else:
-            next_figure_line_match = any_figure_line_pattern.search(text, current_section_body_start_offset)
-            current_section_text_end = next_figure_line_match.start() if next_figure_line_match else len(text)
+            current_section_text_end = limit
+        bounds.append((section_name, current_section_body_start_offset, current_section_text_end))
+    return bounds
 
-        section_text_content = text[current_section_body_start_offset:current_section_text_end]
-        header_pattern = re.compile(r"Field\s+Name\s+Field\s+Description", re.IGNORECASE | re.DOTALL)
-        header_match = header_pattern.search(section_text_content)
+def parse_section(section_name, section_text_content, metrics=None, first_line=1, profile=None, columns='basic'):
+    """
+    Parses the body of one section (the text after its "Figure N." caption).
 
-        print(f"DEBUG: Processing Section: '{section_name}'. Text content length: {len(section_text_content)}. Header found: {'Yes' if header_match else 'No'}")
+    Sections are independent of each other, so they can be parsed in any order or process.
+    If `metrics` (a parser_metrics.ParseMetrics) is given, each line's branch and timing
+    are recorded in it. `first_line` is the line number of the section body's first line,
+    used for the records' `line`. Keyword sets and patterns come from `profile`
+    (a document_profiles.DocumentProfile, default: DEFAULT_PROFILE).
 
-        if header_match:
-            table_text_start_index = header_match.end()
-            table_text = section_text_content[table_text_start_index:]
-        else:
-            # Fallback: treat entire section text as table when standard header is missing
-            table_text = section_text_content
-
-        lines = table_text.split('\n')
-        print(f"DEBUG: Section '{section_name}': table_text (first 200 chars) = '{table_text[:200].replace(chr(10), chr(92) + chr(110))}'")
-        
-        current_field_name = None
-        current_description_parts = []
-        section_fields = []
-        
-        def is_likely_column_data(line_text, strict_kws, potential_kws):
-            line_upper = line_text.upper()
-            if line_upper in strict_kws or line_upper in potential_kws or line_text.isdigit(): return True
-            tokens = line_text.split()
-            if not tokens: return False
-            return all(t.isdigit() or t.upper() in strict_kws or t.upper() in potential_kws for t in tokens)
-
-        processed_lines = []
-        for line_idx, line_content in enumerate(lines):
-            if any_figure_line_pattern.match(line_content.strip()) and not header_pattern.search(line_content):
-                print(f"DEBUG: Truncating lines at line {line_idx} due to new Figure line: '{line_content[:100]}'")
-                break
-            processed_lines.append(line_content)
-        for line_num, line in enumerate(lines):
-            stripped_line = line.strip()
-            if not stripped_line: continue
-
-            parts = stripped_line.split(maxsplit=1)
-            first_word = parts[0] if parts else ""
-            rest_of_line = parts[1].strip() if len(parts) > 1 else ""
-            print(f"DEBUG: Line {line_num}: Raw: '{stripped_line}' | FW: '{first_word}' | ROL: '{rest_of_line}'")
-
-            # Calculate this once, based on original first_word
-            is_likely_field_name_start_original = bool(re.match(field_name_regex, first_word)) and \
-                                         first_word.upper() not in common_desc_start_words and \
-                                         not first_word.upper() in other_column_keywords_strict and \
-                                         not first_word.upper() in other_potentially_column_start_keywords and \
-                                         not first_word.isdigit() and \
-                                         not first_word.islower()
-            rol_starts_with_col_keyword = any(rest_of_line.upper().startswith(kw) for kw in other_column_keywords_strict) if rest_of_line else False
-
-            # --- Check 1: Scenario C Special (e.g. "verbose" on line N, then "Verbose label..." on line N+1) ---
-            if current_field_name and not current_description_parts and \
-               first_word and current_field_name.islower() and first_word[0].isupper() and \
-               first_word.lower() == current_field_name and \
-               bool(re.match(field_name_regex, first_word)) and first_word.upper() not in common_desc_start_words:
-                if first_word.upper() in other_column_keywords_strict:
-                     print(f"DEBUG: CSpecial Finalize: '{current_field_name}' (keyword '{first_word}')")
-                     _finalize_and_add_field(current_field_name, [], section_name, section_fields, line_num, "CSpecialKeywordFinalize")
-                     current_field_name = None; current_description_parts = []
-                     # Fall through to re-evaluate this line.
-                else:
-                    print(f"DEBUG: CSpecial Merge: '{stripped_line}' to '{current_field_name}'")
-                    desc_seg = stripped_line; earliest_idx = -1; found_kw = None
-                    for kw in other_column_keywords_strict:
-                        m = re.search(r'\s+\b' + re.escape(kw) + r'\b', desc_seg, re.IGNORECASE)
-                        if m and (earliest_idx == -1 or m.start() < earliest_idx): earliest_idx, found_kw = m.start(), kw
-                    if found_kw: desc_seg = desc_seg[:earliest_idx].strip()
-                    if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
-                    if found_kw:
-                        _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "CSpecialSplitFinalize")
-                        current_field_name = None; current_description_parts = []
-                    continue
-
-            # --- Check 1.5: Camel Case Field Name Construction (e.g., "negated" then "Terse") ---
-            if current_field_name and current_field_name.islower() and not current_description_parts and \
-               first_word and first_word[0].isupper() and first_word.lower() != current_field_name and \
-               first_word.upper() not in common_desc_start_words and first_word.upper() not in other_column_keywords_strict and \
-               not is_likely_column_data(first_word, [], []) and bool(re.match(r"^[A-Z][a-zA-Z0-9_]*$", first_word)):
-
-                combined_name_cand = current_field_name + first_word
-                if bool(re.match(r"^[a-z]+[A-Z][a-zA-Z0-9_]*$", combined_name_cand)):
-                    print(f"DEBUG: CamelCase: Form '{combined_name_cand}' from '{current_field_name}' + '{first_word}'")
-
-                    original_field_found_idx = -1
-                    for i_f, field_f in enumerate(section_fields):
-                        if field_f['Field Name'] == current_field_name and field_f['Section'] == section_name and not field_f['Field Description']:
-                            original_field_found_idx = i_f; break
-                    if original_field_found_idx != -1:
-                        print(f"DEBUG:   Removing previously added short field '{current_field_name}'.")
-                        section_fields.pop(original_field_found_idx)
-
-                    current_field_name = combined_name_cand
-                    current_description_parts = []
-                    description_segment = rest_of_line
-
-                    earliest_keyword_index_cc = -1; keyword_in_cc = None
-                    for keyword_cc_loopvar in other_column_keywords_strict:
-                        match_cc = re.search(r'\s+\b' + re.escape(keyword_cc_loopvar) + r'\b', description_segment, re.IGNORECASE)
-                        if match_cc:
-                            idx_cc = match_cc.start()
-                            if earliest_keyword_index_cc == -1 or idx_cc < earliest_keyword_index_cc:
-                                earliest_keyword_index_cc = idx_cc; keyword_in_cc = keyword_cc_loopvar
-                    if keyword_in_cc:
-                        description_segment = description_segment[:earliest_keyword_index_cc].strip()
-                    if description_segment: current_description_parts.append(" ".join(description_segment.split()))
-                    if keyword_in_cc:
-                        _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, f"CamelCaseKeywordFinalize for {current_field_name}")
-                        current_field_name = None; current_description_parts = []
-                    continue
+    With columns='all', rows are FullFieldRecords: the column values the basic parse cuts off
+    at the first data type fill the field's Field Type, Max Size, May be NULL and Key in the
+    same pass. Only the row's own lines are used (the line that ends its description, and the
+    lines of a format split over lines); column values on lines after the row are not, as
+    pdfminer's layout puts other rows' values there. Descriptions are the same.
+
+    Returns:
+        list: FieldRecord rows for this section, in table order.
+    """
+    if columns not in COLUMN_SETS:
+        raise ValueError(f"columns must be one of {', '.join(COLUMN_SETS)}")
+    profile = profile or DEFAULT_PROFILE
+    fill_columns = columns == 'all'
+    finalize = functools.partial(_finalize_and_add_field, record_class=FullFieldRecord) if fill_columns else _finalize_and_add_field
+    other_column_keywords_strict = profile.column_keywords
+    other_potentially_column_start_keywords = profile.potential_column_keywords
+    common_desc_start_words = profile.desc_start_words
+    known_acronyms_or_case_sensitive_names = profile.case_sensitive_names
+    column_keyword_prefixes = profile.column_keyword_prefixes
+    field_types = profile.field_types
+    column_keyword_split = profile.column_keyword_split_pattern.search
+    is_field_name = profile.field_name_pattern.match
+    header_match = header_pattern.search(section_text_content)
 
-            # --- Check 2: Strong Signal (lowercase field, uppercase description on same line) ---
-            is_strong_signal_line = False
-            if first_word.islower() and bool(re.match(field_name_regex, first_word)) and \
-               first_word.upper() not in common_desc_start_words and \
-               rest_of_line and rest_of_line[0].isupper() and \
-               (len(rest_of_line.split()) > 0 and rest_of_line.split()[0].upper() not in other_column_keywords_strict):
-                 is_strong_signal_line = True
+    print(f"DEBUG: Processing Section: '{section_name}'. Text content length: {len(section_text_content)}. Header found: {'Yes' if header_match else 'No'}")
 
-            if is_strong_signal_line:
-                print(f"DEBUG: StrongSignal: Field='{first_word}', Desc='{rest_of_line}'")
-                if current_field_name: _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrongSignalNew")
+    if header_match:
+        table_text_start_index = header_match.end()
+        table_text = section_text_content[table_text_start_index:]
+    else:
+        # Fallback: treat entire section text as table when standard header is missing
+        table_text_start_index = 0
+        table_text = section_text_content
 
-                current_field_name = first_word # Preserve case from strong signal
-                current_description_parts = []
-                desc_seg = rest_of_line; earliest_idx = -1; found_kw = None
-                for kw in other_column_keywords_strict:
-                    m = re.search(r'\s+\b' + re.escape(kw) + r'\b', desc_seg, re.IGNORECASE)
-                    if m and (earliest_idx == -1 or m.start() < earliest_idx): earliest_idx, found_kw = m.start(), kw
-                if found_kw: desc_seg = desc_seg[:earliest_idx].strip()
+    lines = table_text.split('\n')
+    print(f"DEBUG: Section '{section_name}': table_text (first 200 chars) = '{table_text[:200].replace(chr(10), chr(92) + chr(110))}'")
+    
+    current_field_name = None
+    current_field_line = None
+    current_description_parts = []
+    section_fields = []
+    
+    def is_likely_column_data(line_text, strict_kws, potential_kws):
+        line_upper = line_text.upper()
+        if line_upper in strict_kws or line_upper in potential_kws or line_text.isdigit(): return True
+        tokens = line_text.split()
+        if not tokens: return False
+        return all(t.isdigit() or t.upper() in strict_kws or t.upper() in potential_kws for t in tokens)
+
+    if metrics is not None: metrics.begin_section(section_name)
+    processed_lines = []
+    for line_idx, line_content in enumerate(lines):
+        if any_figure_line_pattern.match(line_content.strip()) and not header_pattern.search(line_content):
+            print(f"DEBUG: Truncating lines at line {line_idx} due to new Figure line: '{line_content[:100]}'")
+            break
+        processed_lines.append(line_content)
+    for line_num, line in enumerate(lines):
+        stripped_line = line.strip()
+        if not stripped_line: continue
+        if metrics is not None: metrics.begin_line()
+
+        row_ended = False # this line ends a row, so its column values were the row's own
+        parts = stripped_line.split(maxsplit=1)
+        first_word = parts[0] if parts else ""
+        rest_of_line = parts[1].strip() if len(parts) > 1 else ""
+        print(f"DEBUG: Line {line_num}: Raw: '{stripped_line}' | FW: '{first_word}' | ROL: '{rest_of_line}'")
+
+        # Calculate this once, based on original first_word
+        is_likely_field_name_start_original = bool(is_field_name(first_word)) and \
+                                     first_word.upper() not in common_desc_start_words and \
+                                     not first_word.upper() in other_column_keywords_strict and \
+                                     not first_word.upper() in other_potentially_column_start_keywords and \
+                                     not first_word.isdigit() and \
+                                     not first_word.islower()
+        rol_starts_with_col_keyword = rest_of_line.upper().startswith(column_keyword_prefixes) if rest_of_line else False
+
+        # --- Check 1: Scenario C Special (e.g. "verbose" on line N, then "Verbose label..." on line N+1) ---
+        if current_field_name and not current_description_parts and \
+           first_word and current_field_name.islower() and first_word[0].isupper() and \
+           first_word.lower() == current_field_name and \
+           bool(is_field_name(first_word)) and first_word.upper() not in common_desc_start_words:
+            if first_word.upper() in other_column_keywords_strict:
+                 print(f"DEBUG: CSpecial Finalize: '{current_field_name}' (keyword '{first_word}')")
+                 if metrics is not None: metrics.branch('CSpecialKeywordFinalize')
+                 finalize(current_field_name, [], section_name, section_fields, line_num, "CSpecialKeywordFinalize", current_field_line)
+                 current_field_name = None; current_description_parts = []
+                 # Fall through to re-evaluate this line.
+            else:
+                print(f"DEBUG: CSpecial Merge: '{stripped_line}' to '{current_field_name}'")
+                if metrics is not None: metrics.branch('CSpecialMerge')
+                desc_seg = stripped_line
+                found_kw = column_keyword_split(desc_seg)
+                if found_kw: desc_seg = desc_seg[:found_kw.start()].strip()
                 if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
                 if found_kw:
-                    _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrongSignalSplit")
+                    finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "CSpecialSplitFinalize", current_field_line)
+                    if fill_columns: _fill_last_row(section_fields, stripped_line[found_kw.start():], field_types)
                     current_field_name = None; current_description_parts = []
                 continue
 
-            # --- Check 3: General New Field (Scenario A/B) ---
-            if is_likely_field_name_start_original and rol_starts_with_col_keyword:
-                processed_field_name = first_word
-                print(f"DEBUG: Scenario B0: New field '{processed_field_name}' with no description")
-                if current_field_name:
-                    _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewFieldBeforeColumn")
-                _finalize_and_add_field(processed_field_name, [], section_name, section_fields, line_num, "NewFieldBeforeColumnAdd")
-                current_field_name = None
+        # --- Check 1.5: Camel Case Field Name Construction (e.g., "negated" then "Terse") ---
+        if current_field_name and current_field_name.islower() and not current_description_parts and \
+           first_word and first_word[0].isupper() and first_word.lower() != current_field_name and \
+           first_word.upper() not in common_desc_start_words and first_word.upper() not in other_column_keywords_strict and \
+           not is_likely_column_data(first_word, [], []) and bool(_camel_case_part_pattern.match(first_word)):
+
+            combined_name_cand = current_field_name + first_word
+            if bool(_camel_case_name_pattern.match(combined_name_cand)):
+                print(f"DEBUG: CamelCase: Form '{combined_name_cand}' from '{current_field_name}' + '{first_word}'")
+                if metrics is not None: metrics.branch('CamelCase')
+
+                original_field_found_idx = -1
+                for i_f, field_f in enumerate(section_fields):
+                    if field_f.name == current_field_name and field_f.section == section_name and not field_f.description:
+                        original_field_found_idx = i_f; break
+                if original_field_found_idx != -1:
+                    print(f"DEBUG:   Removing previously added short field '{current_field_name}'.")
+                    section_fields.pop(original_field_found_idx)
+
+                current_field_name = combined_name_cand
                 current_description_parts = []
-                continue
+                description_segment = rest_of_line
 
-            if is_likely_field_name_start_original and not rol_starts_with_col_keyword:
-                # Field Name Casing: store lowercase if not an acronym or known mixed case.
-                processed_field_name = first_word
-                if first_word.upper() not in known_acronyms_or_case_sensitive_names and not (any(c.islower() for c in first_word) and any(c.isupper() for c in first_word)):
-                    if not first_word.isupper(): # Don't lowercase if all UPPER (likely acronym)
-                        processed_field_name = first_word.lower()
-
-                if len(first_word) <=2 and not rest_of_line and current_field_name: # Scenario A
-                     print(f"DEBUG: Scenario A: Short cont for '{current_field_name}': '{first_word}'")
-                     current_description_parts.append(" ".join(stripped_line.split()))
-                else: # Scenario B
-                    print(f"DEBUG: Scenario B: New field '{processed_field_name}' (from '{first_word}'), ROL: '{rest_of_line[:30]}'")
-                    if current_field_name: _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewField")
-                    current_field_name = processed_field_name
-                    current_description_parts = []
-                    desc_seg = rest_of_line; earliest_idx = -1; found_kw = None
-                    for kw in other_column_keywords_strict:
-                        m = re.search(r'\s+\b' + re.escape(kw) + r'\b', desc_seg, re.IGNORECASE)
-                        if m and (earliest_idx == -1 or m.start() < earliest_idx): earliest_idx, found_kw = m.start(), kw
-                    if found_kw: desc_seg = desc_seg[:earliest_idx].strip()
-                    if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
-                    if found_kw:
-                        _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "ROLSplit")
-                        current_field_name = None; current_description_parts = []
+                keyword_in_cc = column_keyword_split(description_segment)
+                if keyword_in_cc:
+                    description_segment = description_segment[:keyword_in_cc.start()].strip()
+                if description_segment: current_description_parts.append(" ".join(description_segment.split()))
+                if keyword_in_cc:
+                    finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, f"CamelCaseKeywordFinalize for {current_field_name}", current_field_line)
+                    if fill_columns: _fill_last_row(section_fields, rest_of_line[keyword_in_cc.start():], field_types)
+                    current_field_name = None; current_description_parts = []
                 continue
 
-            # --- Check 4: Scenario C (Main continuation/termination) ---
+        # --- Check 2: Strong Signal (lowercase field, uppercase description on same line) ---
+        is_strong_signal_line = False
+        if first_word.islower() and bool(is_field_name(first_word)) and \
+           first_word.upper() not in common_desc_start_words and \
+           rest_of_line and rest_of_line[0].isupper() and \
+           (len(rest_of_line.split()) > 0 and rest_of_line.split()[0].upper() not in other_column_keywords_strict):
+             is_strong_signal_line = True
+
+        if is_strong_signal_line:
+            print(f"DEBUG: StrongSignal: Field='{first_word}', Desc='{rest_of_line}'")
+            if metrics is not None: metrics.branch('StrongSignal')
+            if current_field_name: finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrongSignalNew", current_field_line)
+
+            current_field_name = first_word # Preserve case from strong signal
+            current_field_line = line_num
+            current_description_parts = []
+            desc_seg = rest_of_line
+            found_kw = column_keyword_split(desc_seg)
+            if found_kw: desc_seg = desc_seg[:found_kw.start()].strip()
+            if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
+            if found_kw:
+                finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrongSignalSplit", current_field_line)
+                if fill_columns: _fill_last_row(section_fields, rest_of_line[found_kw.start():], field_types)
+                current_field_name = None; current_description_parts = []
+            continue
+
+        # --- Check 3: General New Field (Scenario A/B) ---
+        if is_likely_field_name_start_original and rol_starts_with_col_keyword:
+            processed_field_name = first_word
+            print(f"DEBUG: Scenario B0: New field '{processed_field_name}' with no description")
+            if metrics is not None: metrics.branch('ScenarioB0')
             if current_field_name:
-                print(f"DEBUG: Scenario C: Cont/Term for '{current_field_name}', Line: '{stripped_line}'")
-                if stripped_line.upper().startswith(tuple(other_column_keywords_strict)):
-                    print(f"DEBUG:   StrictKeyword Start: Finalizing '{current_field_name}'")
-                    _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrictKeywordStart")
-                    current_field_name = None; current_description_parts = []
-                elif is_likely_column_data(stripped_line, other_column_keywords_strict, other_potentially_column_start_keywords):
-                    print(f"DEBUG:   Column Data Line: Finalizing '{current_field_name}'")
-                    _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "ColumnDataFinalize")
+                finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewFieldBeforeColumn", current_field_line)
+            finalize(processed_field_name, [], section_name, section_fields, line_num, "NewFieldBeforeColumnAdd", line_num)
+            if fill_columns: _fill_last_row(section_fields, rest_of_line, field_types)
+            current_field_name = None
+            current_description_parts = []
+            continue
+
+        if is_likely_field_name_start_original and not rol_starts_with_col_keyword:
+            # Field Name Casing: store lowercase if not an acronym or known mixed case.
+            processed_field_name = first_word
+            if first_word.upper() not in known_acronyms_or_case_sensitive_names and not (any(c.islower() for c in first_word) and any(c.isupper() for c in first_word)):
+                if not first_word.isupper(): # Don't lowercase if all UPPER (likely acronym)
+                    processed_field_name = first_word.lower()
+
+            if len(first_word) <=2 and not rest_of_line and current_field_name: # Scenario A
+                 print(f"DEBUG: Scenario A: Short cont for '{current_field_name}': '{first_word}'")
+                 if metrics is not None: metrics.branch('ScenarioA')
+                 current_description_parts.append(" ".join(stripped_line.split()))
+            else: # Scenario B
+                print(f"DEBUG: Scenario B: New field '{processed_field_name}' (from '{first_word}'), ROL: '{rest_of_line[:30]}'")
+                if metrics is not None: metrics.branch('ScenarioB')
+                if current_field_name: finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewField", current_field_line)
+                current_field_name = processed_field_name
+                current_field_line = line_num
+                current_description_parts = []
+                desc_seg = rest_of_line
+                found_kw = column_keyword_split(desc_seg)
+                if found_kw: desc_seg = desc_seg[:found_kw.start()].strip()
+                if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
+                if found_kw:
+                    finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "ROLSplit", current_field_line)
+                    if fill_columns: _fill_last_row(section_fields, rest_of_line[found_kw.start():], field_types)
                     current_field_name = None; current_description_parts = []
-                else:
-                    # Restore NewSentenceHeuristic
-                    if current_description_parts and current_description_parts[-1].strip().endswith(".") and \
-                       stripped_line and stripped_line[0].isupper() and \
-                       first_word.upper() not in common_desc_start_words and \
-                       not (is_likely_field_name_start_original and not rol_starts_with_col_keyword) and \
-                       first_word.isalpha():
-                        if len(stripped_line.split()) > 2 :
-                            print(f"DEBUG:   NewSentenceHeuristic: Finalizing '{current_field_name}' before appending '{stripped_line[:30]}...'")
-                            _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewSentenceHeuristic")
-                            current_field_name = None ; current_description_parts = []
-
-                    if current_field_name: # If not finalized by heuristic
-                        desc_seg = stripped_line; earliest_idx = -1; found_kw = None
-                        for kw_c in other_column_keywords_strict:
-                            m = re.search(r'\s+\b' + re.escape(kw_c) + r'\b', desc_seg, re.IGNORECASE)
-                            if m and (earliest_idx == -1 or m.start() < earliest_idx): earliest_idx, found_kw = m.start(), kw_c
-                        if found_kw: desc_seg = desc_seg[:earliest_idx].strip()
-                        if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
-                        print(f"DEBUG:   Appended to '{current_field_name}': '{desc_seg[:50]}...' (orig: '{stripped_line[:50]}...')")
-                        if found_kw:
-                            print(f"DEBUG:   MidLineKeyword Finalizing '{current_field_name}'")
-                            _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, "MidLineSplitFinalize")
-                            current_field_name = None; current_description_parts = []
-
-            # --- Check 5: Orphaned line (Scenario D) ---
-            if not current_field_name:
-                 print(f"DEBUG: Scenario D: Orphaned line: '{stripped_line}'")
-
-        # End of section: finalize any remaining field
+            continue
+
+        # --- Check 4: Scenario C (Main continuation/termination) ---
         if current_field_name:
-            _finalize_and_add_field(current_field_name, current_description_parts, section_name, section_fields, line_num, f"EndOfSection for {current_field_name}")
+            print(f"DEBUG: Scenario C: Cont/Term for '{current_field_name}', Line: '{stripped_line}'")
+            if metrics is not None: metrics.branch('ScenarioC')
+            if stripped_line.upper().startswith(column_keyword_prefixes):
+                print(f"DEBUG:   StrictKeyword Start: Finalizing '{current_field_name}'")
+                if metrics is not None: metrics.branch('StrictKeywordStart')
+                finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "StrictKeywordStart", current_field_line)
+                current_field_name = None; current_description_parts = []
+                if fill_columns: _fill_last_row(section_fields, stripped_line, field_types)
+                row_ended = True
+            elif is_likely_column_data(stripped_line, other_column_keywords_strict, other_potentially_column_start_keywords):
+                print(f"DEBUG:   Column Data Line: Finalizing '{current_field_name}'")
+                if metrics is not None: metrics.branch('ColumnDataFinalize')
+                finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "ColumnDataFinalize", current_field_line)
+                current_field_name = None; current_description_parts = []
+            else:
+                # Restore NewSentenceHeuristic
+                if current_description_parts and current_description_parts[-1].strip().endswith(".") and \
+                   stripped_line and stripped_line[0].isupper() and \
+                   first_word.upper() not in common_desc_start_words and \
+                   not (is_likely_field_name_start_original and not rol_starts_with_col_keyword) and \
+                   first_word.isalpha():
+                    if len(stripped_line.split()) > 2 :
+                        print(f"DEBUG:   NewSentenceHeuristic: Finalizing '{current_field_name}' before appending '{stripped_line[:30]}...'")
+                        if metrics is not None: metrics.branch('NewSentenceHeuristic')
+                        finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "NewSentenceHeuristic", current_field_line)
+                        current_field_name = None ; current_description_parts = []
+
+                if current_field_name: # If not finalized by heuristic
+                    desc_seg = stripped_line
+                    found_kw = column_keyword_split(desc_seg)
+                    if found_kw: desc_seg = desc_seg[:found_kw.start()].strip()
+                    if desc_seg: current_description_parts.append(" ".join(desc_seg.split()))
+                    print(f"DEBUG:   Appended to '{current_field_name}': '{desc_seg[:50]}...' (orig: '{stripped_line[:50]}...')")
+                    if found_kw:
+                        print(f"DEBUG:   MidLineKeyword Finalizing '{current_field_name}'")
+                        if metrics is not None: metrics.branch('MidLineSplitFinalize')
+                        finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, "MidLineSplitFinalize", current_field_line)
+                        current_field_name = None; current_description_parts = []
+                        if fill_columns: _fill_last_row(section_fields, stripped_line[found_kw.start():], field_types)
+                        row_ended = True
+
+        # --- Check 5: Orphaned line (Scenario D) ---
+        if not current_field_name:
+             print(f"DEBUG: Scenario D: Orphaned line: '{stripped_line}'")
+             if metrics is not None: metrics.orphan()
+             if fill_columns and section_fields and not row_ended:
+                 _continue_columns(section_fields[-1], stripped_line, field_types)
 
-        all_parsed_fields.extend(section_fields)
+    # End of section: finalize any remaining field
+    if current_field_name:
+        finalize(current_field_name, current_description_parts, section_name, section_fields, line_num, f"EndOfSection for {current_field_name}", current_field_line)
+
+    # Table line indexes -> line numbers in the text the section was cut from.
+    line_base = first_line + section_text_content.count('\n', 0, table_text_start_index)
+    for field in section_fields:
+        if field.line is not None:
+            field.line += line_base
+
+    if metrics is not None: metrics.end_section(len(section_fields))
+    return section_fields
+
+def _section_first_lines(text, section_bounds):
+    """Line number (1-based) of each section body's first line, counted incrementally."""
+    first_lines = []
+    line, position = 1, 0
+    for _, body_start, _ in section_bounds:
+        line += text.count('\n', position, body_start)
+        position = body_start
+        first_lines.append(line)
+    return first_lines
+
+def _parse_section_cached(cache, section_name, section_text_content, metrics, first_line, profile, columns):
+    """parse_section through a parse_cache.ParseCache. Metrics need a real parse, so they bypass the cache."""
+    if cache is None or metrics is not None:
+        return parse_section(section_name, section_text_content, metrics, first_line, profile, columns)
+    profile = profile or DEFAULT_PROFILE
+    return cache.memoize('pdf_parser.parse_section', PARSER_VERSION,
+                         f"{section_name}\0{columns}\0{profile.rules_key()}", section_text_content,
+                         lambda: parse_section(section_name, section_text_content, None, first_line, profile, columns),
+                         line_offset=first_line)
+
+def parse_fields_from_text(text, metrics=None, page_line_starts=None, profile=None, columns='basic', cache=None):
+    """
+    Parses every "Fields in the X data file" section of text.
+
+    Returns FieldRecord rows whose `line` is the line the field starts on in text. If
+    `page_line_starts` (field_record.page_line_starts(page_texts)) is given, `page` is set too.
+    Without a `profile`, DEFAULT_PROFILE is used; pass document_profiles.select_profile(text, metadata)
+    to pick one from the document's caption style and metadata.
+    `columns` is 'basic' (Section, Field Name, Field Description) or 'all', which adds the
+    Field Type, Max Size, May be NULL and Key columns in the same pass (see parse_section).
+    With a `cache` (parse_cache.ParseCache), each section whose text, profile rules and
+    PARSER_VERSION are unchanged returns its stored rows instead of being parsed.
+    """
+    print(f"DEBUG: Entered parse_fields_from_text. Text length: {len(text) if text else 'None'}")
+    if not text:
+        print("DEBUG: Text is empty or None. Returning empty list.")
+        return []
+    all_parsed_fields = []
+    profile = profile or DEFAULT_PROFILE
+    print(f"DEBUG: Using document profile '{profile.name}'.")
+
+    section_bounds = find_section_bounds(text, profile)
+    print(f"DEBUG: Found {len(section_bounds)} 'Fields in the...' section start matches.")
+
+    first_lines = _section_first_lines(text, section_bounds)
+    for (section_name, body_start, body_end), first_line in zip(section_bounds, first_lines):
+        all_parsed_fields.extend(_parse_section_cached(cache, section_name, text[body_start:body_end], metrics, first_line, profile, columns))
+    if page_line_starts:
+        assign_pages(all_parsed_fields, page_line_starts)
+    return all_parsed_fields
+
+def _parse_section_job(job):
+    section_name, section_text_content, first_line, page_line_starts, collect_metrics, shared_name, profile, columns = job
+    summary = None
+    if collect_metrics:
+        from parser_metrics import ParseMetrics
+        metrics = ParseMetrics()
+        section_fields = parse_section(section_name, section_text_content, metrics, first_line, profile, columns)
+        summary = metrics.summary()
+    else:
+        section_fields = parse_section(section_name, section_text_content, first_line=first_line, profile=profile, columns=columns)
+    if page_line_starts:
+        assign_pages(section_fields, page_line_starts)
+    if shared_name is not None:
+        from shared_results import publish_rows
+        section_fields = publish_rows(section_fields, shared_name)
+    return section_fields, summary
+
+def _merge_section_results(results, metrics, use_shared_memory=False):
+    if use_shared_memory:
+        from shared_results import SharedRows, ChainedRows
+    parts = []
+    for section_fields, summary in results:
+        parts.append(SharedRows(section_fields) if use_shared_memory else section_fields)
+        if summary is not None:
+            metrics.merge(summary)
+    if use_shared_memory:
+        return ChainedRows(parts)
+    return [field for section_fields in parts for field in section_fields]
+
+def parse_fields_from_text_parallel(text, workers=None, pool=None, min_sections=8, metrics=None,
+                                    shared_memory=False, page_line_starts=None, profile=None, columns='basic', cache=None):
+    """
+    Parses text like parse_fields_from_text, but sections are parsed in a process pool.
+
+    The section boundaries are found once in this process; each worker receives one
+    section's text and the results are merged back in document order, so the output is
+    identical to the serial parser.
+
+    Args:
+        text (str): Extracted document text.
+        workers (int, optional): Pool size when no pool is given (default: CPU count).
+        pool (Executor, optional): An existing executor to reuse.
+        min_sections (int): Below this many sections the serial parser is used instead.
+        metrics (ParseMetrics, optional): Collects branch counters; workers' counters are merged into it.
+        shared_memory (bool): Workers return each section's rows in a shared memory segment
+            (see shared_results.py) instead of pickling them. The parent gets a read-only
+            sequence that decodes rows as they are accessed; close() it to free the segments early.
+            If a section fails, the segments already published are unlinked before the error propagates.
+        page_line_starts (list, optional): As for parse_fields_from_text.
+        profile (DocumentProfile, optional): As for parse_fields_from_text; chosen once here, not per worker.
+        columns (str): As for parse_fields_from_text. shared_memory carries the basic columns only.
+        cache (ParseCache, optional): As for parse_fields_from_text. Sections are looked up here
+            and only the misses are sent to the pool (ignored with shared_memory or metrics).
+
+    Returns:
+        list: FieldRecord rows, as returned by parse_fields_from_text (a
+              shared_results.ChainedRows sequence with shared_memory=True).
+    """
+    if shared_memory and columns != 'basic':
+        raise ValueError("shared_memory carries the basic columns only; use columns='basic' or shared_memory=False")
+    if not text:
+        return []
+    profile = profile or DEFAULT_PROFILE
+    section_bounds = find_section_bounds(text, profile)
+    if len(section_bounds) < min_sections or (pool is None and workers == 1):
+        return parse_fields_from_text(text, metrics, page_line_starts, profile, columns, cache)
+    first_lines = _section_first_lines(text, section_bounds)
+    segments = None
+    if shared_memory:
+        from shared_results import SegmentNames
+        segments = SegmentNames()
+    jobs = [(name, text[start:end], first_line, page_line_starts, metrics is not None,
+             segments.new() if segments is not None else None, profile, columns)
+            for (name, start, end), first_line in zip(section_bounds, first_lines)]
+    if cache is not None and not shared_memory and metrics is None:
+        return _parse_sections_cached(jobs, cache, workers, pool)
+    try:
+        if pool is not None:
+            futures = [pool.submit(_parse_section_job, job) for job in jobs]
+            try:
+                return _merge_section_results((future.result() for future in futures), metrics, shared_memory)
+            finally:
+                # A failed section must not leave the others running past the unlink below.
+                for future in futures:
+                    future.cancel()
+                wait(futures)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+            return _merge_section_results(executor.map(_parse_section_job, jobs, chunksize=chunksize), metrics, shared_memory)
+    finally:
+        if segments is not None:
+            # Segments of sections whose results never reached _merge_section_results.
+            segments.unlink_all()
+
+def _parse_sections_cached(jobs, cache, workers, pool):
+    """parse_fields_from_text_parallel with a cache: hits are decoded here, misses parsed in the pool and stored."""
+    from parse_cache import cache_key
+    results, misses = [], []
+    for name, section_text, first_line, _, _, _, profile, columns in jobs:
+        key = cache_key('pdf_parser.parse_section', PARSER_VERSION, f"{name}\0{columns}\0{profile.rules_key()}", section_text)
+        results.append(cache.get(key, first_line))
+        if results[-1] is None:
+            # Pages are assigned per document below, so they are never stored.
+            misses.append((len(results) - 1, key, (name, section_text, first_line, None, False, False, profile, columns)))
+    if misses:
+        miss_jobs = [job for _, _, job in misses]
+        if pool is not None:
+            parsed = list(pool.map(_parse_section_job, miss_jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, len(miss_jobs) // ((workers or os.cpu_count() or 1) * 4))
+                parsed = list(executor.map(_parse_section_job, miss_jobs, chunksize=chunksize))
+        for (index, key, job), (rows, _) in zip(misses, parsed):
+            cache.put(key, 'pdf_parser.parse_section', PARSER_VERSION, rows, job[2])
+            results[index] = rows
+    all_parsed_fields = [field for rows in results for field in rows]
+    page_line_starts = jobs[0][3] if jobs else None
+    if page_line_starts:
+        assign_pages(all_parsed_fields, page_line_starts)
     return all_parsed_fields
 
 def write_to_csv(parsed_data, csv_filepath):
     if not parsed_data:
         print("No data to write to CSV.")
         return True
-    fieldnames = ['Section', 'Field Name', 'Field Description']
+    fieldnames = list(COLUMN_SETS['all'] if isinstance(parsed_data[0], FullFieldRecord) else COLUMN_SETS['basic'])
     try:
         with open(csv_filepath, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -359,16 +990,72 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract text from a PDF and parse fields into a CSV.")
     parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
     parser.add_argument("--csv_file", type=str, required=True, help="Path to the output CSV file.")
+    parser.add_argument("--page_timeout", type=float, default=None, help="Optional per-page time limit in seconds. Pages are extracted in a killable worker process.")
+    parser.add_argument("--page_rss_limit_mb", type=int, default=None, help="Optional per-page resident memory limit (MB) for the page worker process (Linux only).")
+    parser.add_argument("--parse_workers", type=int, default=1, help="Parse sections in this many processes (default: 1, serial). Output is identical.")
+    parser.add_argument("--from_store", type=str, default=None, help="Read the text of --pdf_file from this text store (see text_store.py) instead of extracting it.")
+    parser.add_argument("--profile", type=str, default="auto", choices=["auto"] + profile_names(),
+                        help="Document profile (parsing rules) to use. 'auto' (default) picks one from the PDF's title, producer and caption style.")
+    parser.add_argument("--strip_headers", action="store_true",
+                        help="Remove running headers, footers and page numbers (lines repeated at the same page position) before parsing.")
+    parser.add_argument("--columns", type=str, default="basic", choices=list(COLUMN_SETS),
+                        help="Table columns to write: 'basic' (section, name, description; default) or 'all' (adds Field Type, Max Size, May be NULL and Key).")
+    parser.add_argument("--parse_cache", type=str, default=None,
+                        help="Parse result cache (SQLite file, see parse_cache.py); unchanged sections are not parsed again.")
     args = parser.parse_args()
 
-    print(f"Extracting text from '{args.pdf_file}'...")
-    full_text_content = extract_text_from_pdf(args.pdf_file)
+    page_texts = None
+    # Title and Producer of the PDF from the extraction that opened it; None when the text
+    # comes from the store, so the profile is then picked from the text alone.
+    metadata = None
+    if args.from_store:
+        from text_store import TextStore, document_key
+        if not os.path.exists(args.from_store):
+            print(f"Error: Text store not found: {args.from_store}")
+            sys.exit(1)
+        print(f"Reading text of '{args.pdf_file}' from store '{args.from_store}'...")
+        with TextStore(args.from_store) as store:
+            doc = document_key(args.pdf_file)
+            page_texts = store.pages(doc) if doc in store else None
+        if page_texts is None:
+            print(f"Error: '{doc}' is not in the text store. Add it with text_store.py first.")
+            sys.exit(1)
+        full_text_content = ''.join(page_texts)
+    elif args.page_timeout or args.page_rss_limit_mb:
+        print(f"Extracting text from '{args.pdf_file}'...")
+        from page_isolation import PageSandbox, extract_pages_isolated
+        with PageSandbox(page_timeout=args.page_timeout, rss_limit_mb=args.page_rss_limit_mb) as sandbox:
+            try:
+                page_texts, failed_pages = extract_pages_isolated(args.pdf_file, sandbox)
+                metadata = sandbox.metadata
+                full_text_content = ''.join(page_texts)
+                if failed_pages:
+                    print(f"{len(failed_pages)} page(s) could not be extracted and were replaced by placeholders.")
+            except Exception as e:
+                print(f"An unexpected error occurred while processing PDF '{args.pdf_file}': {e}")
+                full_text_content = None
+    elif args.strip_headers:
+        # Header and footer detection needs the pages, not the joined text.
+        print(f"Extracting text from '{args.pdf_file}'...")
+        try:
+            context = ExtractionContext(rsrcmgr=PDFResourceManager())
+            with open(args.pdf_file, 'rb') as in_file:
+                page_texts = context.extract_pages(in_file)
+            metadata = context.metadata
+            full_text_content = ''.join(page_texts)
+        except Exception as e:
+            print(f"An unexpected error occurred while processing PDF '{args.pdf_file}': {e}")
+            full_text_content = None
+    else:
+        print(f"Extracting text from '{args.pdf_file}'...")
+        context = ExtractionContext(rsrcmgr=PDFResourceManager())
+        full_text_content = extract_text_from_pdf(args.pdf_file, context)
+        metadata = context.metadata
 
     if full_text_content is None:
         print("Text extraction failed. Exiting.")
         sys.exit(1)
 
-    import os
     output_dir_for_raw = "output"
     if not os.path.exists(output_dir_for_raw):
         os.makedirs(output_dir_for_raw)
@@ -384,8 +1071,32 @@ if __name__ == "__main__":
         os.makedirs(csv_output_dir)
         print(f"Created directory: {csv_output_dir}")
 
+    if args.strip_headers and page_texts:
+        from page_headers import strip_running_lines
+        page_texts, header_report = strip_running_lines(page_texts)
+        full_text_content = ''.join(page_texts)
+        print(f"Removed {header_report['lines_removed']} running header/footer line(s) from {header_report['pages']} pages.")
+
     print("\nParsing fields from extracted text...")
-    structured_data = parse_fields_from_text(full_text_content)
+    line_starts = page_line_starts(page_texts) if page_texts else None
+    if args.profile == "auto":
+        profile = select_profile(full_text_content, metadata)
+    else:
+        profile = get_profile(args.profile)
+    print(f"Document profile: {profile.name}")
+    parse_cache = None
+    if args.parse_cache:
+        from parse_cache import ParseCache
+        parse_cache = ParseCache(args.parse_cache)
+    if args.parse_workers > 1:
+        structured_data = parse_fields_from_text_parallel(full_text_content, workers=args.parse_workers, page_line_starts=line_starts,
+                                                          profile=profile, columns=args.columns, cache=parse_cache)
+    else:
+        structured_data = parse_fields_from_text(full_text_content, page_line_starts=line_starts, profile=profile, columns=args.columns,
+                                                 cache=parse_cache)
+    if parse_cache is not None:
+        print(f"Parse cache: {parse_cache.hits} section(s) reused, {parse_cache.misses} parsed.")
+        parse_cache.close()
     
     if structured_data:
         if write_to_csv(structured_data, args.csv_file):
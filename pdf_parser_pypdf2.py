@@ -1,35 +1,111 @@
 import re
+import os
 import csv
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from PyPDF2 import PdfReader
+from field_record import FieldRecord
 
-def extract_text_from_pdf(pdf_path):
+# Bump when parse_fields_from_text's rules change: results cached by earlier versions
+# (see parse_cache.py) are then never returned.
+PARSER_VERSION = 1
+
+def iter_page_texts(pdf_path, start=0, stop=None, failures=None):
+    """
+    Yields the text of each page in [start, stop) (0-based), one page at a time.
+
+    A page whose extraction returns None yields ''. A page whose extraction raises yields an
+    `[ERROR_EXTRACTING_PAGE:n:error]` placeholder, as extract_fields_only does, and
+    (page number, error) is appended to
+    `failures`, so one bad page does not lose the rest of the document.
+    """
+    with open(pdf_path, 'rb') as file:
+        reader = PdfReader(file)
+        pages = reader.pages
+        stop = len(pages) if stop is None else min(stop, len(pages))
+        for index in range(start, stop):
+            try:
+                text = pages[index].extract_text()
+            except Exception as e:
+                print(f"Warning: could not extract text from page {index + 1}: {e}")
+                if failures is not None:
+                    failures.append((index + 1, str(e)))
+                text = f"[ERROR_EXTRACTING_PAGE:{index + 1}:{e}]"
+            yield text or ""
+
+def _extract_page_range(job):
+    pdf_path, start, stop = job
+    failures = []
+    texts = list(iter_page_texts(pdf_path, start, stop, failures))
+    return texts, failures
+
+def page_ranges(page_count, chunks):
+    """Splits page_count pages into at most `chunks` contiguous (start, stop) ranges of near-equal size."""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges, start = [], 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def extract_text_from_pdf(pdf_path, workers=1, pool=None, min_pages=16, failures=None):
     """
     Extracts text from all pages of the specified PDF file using PyPDF2.
-    
+
+    Page texts come from iter_page_texts and are joined once, each followed by a newline.
+    With workers > 1 (or an existing `pool`), the pages are split into contiguous ranges
+    that are extracted in a process pool and joined in page order; the text is the same as
+    the serial run. Documents with fewer than min_pages pages are always extracted serially.
+
     Args:
         pdf_path (str): The file path to the PDF.
+        workers (int): Number of processes to split the pages across.
+        pool (Executor, optional): An existing executor to reuse.
+        min_pages (int): Below this many pages the serial path is used.
+        failures (list, optional): Receives (page number, error) for pages that failed.
 
     Returns:
         str or None: The extracted text content from the PDF, or None if an error occurs.
     """
     try:
-        text = ""
+        if failures is None:
+            failures = []
+        if workers <= 1 and pool is None:
+            return "".join(f"{text}\n" for text in iter_page_texts(pdf_path, failures=failures))
         with open(pdf_path, 'rb') as file:
-            reader = PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+            page_count = len(PdfReader(file).pages)
+        if page_count < min_pages:
+            return "".join(f"{text}\n" for text in iter_page_texts(pdf_path, failures=failures))
+        # A few ranges per worker, so one slow range does not hold up the whole document.
+        jobs = [(pdf_path, start, stop) for start, stop in page_ranges(page_count, max(workers, 1) * 4)]
+        if pool is not None:
+            results = pool.map(_extract_page_range, jobs)
+            return _join_ranges(results, failures)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return _join_ranges(executor.map(_extract_page_range, jobs), failures)
     except Exception as e:
         print(f"An error occurred while extracting text from PDF: {e}")
         return None
 
-def parse_fields_from_text(text):
+def _join_ranges(results, failures):
+    parts = []
+    for texts, range_failures in results:
+        parts.extend(texts)
+        failures.extend(range_failures)
+    return "".join(f"{text}\n" for text in parts)
+
+def parse_fields_from_text(text, cache=None):
     """
     Parses the extracted text to find sections and extract only the 'Field Name' and 'Field Description' columns.
     This version is specifically tailored for the Form D SEC Data Guide PDF format.
+    With a `cache` (parse_cache.ParseCache), text already parsed by this PARSER_VERSION returns its stored rows.
     """
+    if cache is not None:
+        return cache.memoize('pdf_parser_pypdf2.parse_fields_from_text', PARSER_VERSION, '', text,
+                             lambda: parse_fields_from_text(text))
     all_parsed_fields = []
     
     # Look for sections with pattern like "Figure X. Fields in the ... data file"
@@ -78,11 +154,7 @@ def parse_fields_from_text(text):
                 if current_field and current_desc:
                     # Join all description lines with spaces and clean up
                     full_desc = ' '.join(' '.join(part.split()) for part in current_desc)
-                    all_parsed_fields.append({
-                        'Section': section_name,
-                        'Field Name': current_field,
-                        'Field Description': full_desc
-                    })
+                    all_parsed_fields.append(FieldRecord(section_name, current_field, full_desc))
                 
                 # Start a new field
                 current_field = first_word
@@ -95,11 +167,7 @@ def parse_fields_from_text(text):
         # Don't forget to add the last field
         if current_field and current_desc:
             full_desc = ' '.join(' '.join(part.split()) for part in current_desc)
-            all_parsed_fields.append({
-                'Section': section_name,
-                'Field Name': current_field,
-                'Field Description': full_desc
-            })
+            all_parsed_fields.append(FieldRecord(section_name, current_field, full_desc))
     
     return all_parsed_fields
 
@@ -129,22 +197,34 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract text from a PDF and parse fields into a CSV using PyPDF2.")
     parser.add_argument("--pdf_file", type=str, required=True, help="Path to the input PDF file.")
     parser.add_argument("--csv_file", type=str, required=True, help="Path to the output CSV file.")
+    parser.add_argument("--workers", type=int, default=1, help="Extract pages in this many processes (default: 1, serial). Output is identical.")
+    parser.add_argument("--debug_text", type=str, default=None, help="Optional path to save the extracted text for inspection.")
+    parser.add_argument("--parse_cache", type=str, default=None, help="Parse result cache (SQLite file, see parse_cache.py); unchanged text is not parsed again.")
     args = parser.parse_args()
     
     print(f"Extracting text from '{args.pdf_file}'...")
-    full_text = extract_text_from_pdf(args.pdf_file)
+    failed_pages = []
+    full_text = extract_text_from_pdf(args.pdf_file, workers=args.workers, failures=failed_pages)
     
     if full_text is None:
         print("Text extraction failed. Exiting.")
         sys.exit(1)
+    if failed_pages:
+        print(f"{len(failed_pages)} page(s) could not be extracted and were replaced by placeholders.")
     
-    # For debugging: save the extracted text to a file
-    with open("debug_extracted_text.txt", "w", encoding="utf-8") as f:
-        f.write(full_text)
-    print("Saved extracted text to 'debug_extracted_text.txt' for inspection.")
+    if args.debug_text:
+        with open(args.debug_text, "w", encoding="utf-8") as f:
+            f.write(full_text)
+        print(f"Saved extracted text to '{args.debug_text}' for inspection.")
     
     print("\nParsing fields from extracted text...")
-    structured_data = parse_fields_from_text(full_text)
+    if args.parse_cache:
+        from parse_cache import ParseCache
+        with ParseCache(args.parse_cache) as parse_cache:
+            structured_data = parse_fields_from_text(full_text, cache=parse_cache)
+            print(f"Parse cache: {'reused stored rows' if parse_cache.hits else 'parsed and stored'}.")
+    else:
+        structured_data = parse_fields_from_text(full_text)
     
     if structured_data:
         if write_to_csv(structured_data, args.csv_file):
@@ -153,5 +233,5 @@ if __name__ == "__main__":
             print(f"\nFailed to write parsed data to {args.csv_file}. Exiting.")
             sys.exit(1)
     else:
-        print("No structured data found in the PDF. Please check the debug_extracted_text.txt file to see the extracted text and adjust the parsing logic if needed.")
+        print("No structured data found in the PDF. Re-run with --debug_text to save the extracted text and check it against the parsing logic.")
         sys.exit(1)
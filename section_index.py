@@ -0,0 +1,89 @@
+import re
+from collections import namedtuple
+
+from pdf_parser import find_section_bounds, parse_section
+from document_profiles import DEFAULT_PROFILE
+
+SectionEntry = namedtuple('SectionEntry', ['name', 'start', 'end'])
+FigureCaption = namedtuple('FigureCaption', ['number', 'title', 'offset'])
+
+_caption_pattern = re.compile(r"^[ \t]*(Figure (\d+)\.)[ \t]*([^\n]*)", re.MULTILINE | re.IGNORECASE)
+
+def _lookup_key(name):
+    return ' '.join(name.split()).upper()
+
+class SectionIndex:
+    """
+    Offsets of every figure caption and "Fields in the X data file" section of a text.
+
+    The index is built once; sections are only parsed when asked for, and each parsed
+    section is memoized. `fields(name)` returns the same rows as filtering the output of
+    parse_fields_from_text by section, without parsing the rest of the document.
+
+    Example:
+        index = SectionIndex(text)
+        issuers = index.fields('ISSUERS')
+    """
+    def __init__(self, text, profile=None):
+        self.text = text or ''
+        self.profile = profile or DEFAULT_PROFILE
+        self.sections = [SectionEntry(*bounds) for bounds in find_section_bounds(self.text, self.profile)]
+        self.captions = [
+            FigureCaption(int(m.group(2)), m.group(3).strip(), m.start(1))
+            for m in _caption_pattern.finditer(self.text)
+        ]
+        self._positions_by_name = {}
+        for position, entry in enumerate(self.sections):
+            self._positions_by_name.setdefault(_lookup_key(entry.name), []).append(position)
+        self._parsed = {}
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, name):
+        return _lookup_key(name) in self._positions_by_name
+
+    def names(self):
+        """Distinct section names in document order."""
+        seen = []
+        for entry in self.sections:
+            if entry.name not in seen:
+                seen.append(entry.name)
+        return seen
+
+    def section_text(self, entry):
+        return self.text[entry.start:entry.end]
+
+    def _parse_position(self, position):
+        if position not in self._parsed:
+            entry = self.sections[position]
+            first_line = self.text.count('\n', 0, entry.start) + 1
+            self._parsed[position] = parse_section(entry.name, self.section_text(entry), first_line=first_line, profile=self.profile)
+        return self._parsed[position]
+
+    def fields(self, name):
+        """
+        Returns the parsed fields of every section called `name` (case-insensitive).
+
+        Raises:
+            KeyError: If the document has no such section.
+        """
+        positions = self._positions_by_name.get(_lookup_key(name))
+        if positions is None:
+            raise KeyError(name)
+        rows = []
+        for position in positions:
+            rows.extend(self._parse_position(position))
+        return rows
+
+    def all_fields(self):
+        """Parses (or reuses) every section; equivalent to parse_fields_from_text."""
+        rows = []
+        for position in range(len(self.sections)):
+            rows.extend(self._parse_position(position))
+        return rows
+
+    @property
+    def parsed_sections(self):
+        """Number of sections parsed so far."""
+        return len(self._parsed)
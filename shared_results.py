@@ -0,0 +1,251 @@
+import bisect
+import struct
+import secrets
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+
+try:
+    from multiprocessing import resource_tracker
+except ImportError:  # pragma: no cover
+    resource_tracker = None
+
+from field_record import FieldRecord, FIELDNAMES
+
+# Layout (little-endian uint32 throughout):
+#   magic 'PFR2' | row count | string count
+#   string offsets (string count + 1), in characters from the start of the decoded blob
+#   rows: 5 values each: section, field name and description string indices, page, line
+#         (page and line are 0xFFFFFFFF when unknown)
+#   string blob: the distinct strings, concatenated and UTF-8 encoded
+# Strings are stored once, so a section name repeated on every row costs 4 bytes a row.
+# Offsets count characters rather than bytes so the reader can decode the blob with a
+# single call and slice strings out of it.
+_MAGIC = b'PFR2'
+_HEADER = struct.Struct('<4sII')
+_ROW_WIDTH = 5
+_NONE = 0xFFFFFFFF
+
+def encode_rows(rows):
+    """Encodes field rows into the compact layout above. Returns a bytearray."""
+    strings = {}
+    indices = []
+    for row in rows:
+        for key in FIELDNAMES:
+            indices.append(strings.setdefault(row[key], len(strings)))
+        page, line = getattr(row, 'page', None), getattr(row, 'line', None)
+        indices.append(_NONE if page is None else page)
+        indices.append(_NONE if line is None else line)
+    offsets = [0]
+    for value in strings:
+        offsets.append(offsets[-1] + len(value))
+    buf = bytearray(_HEADER.pack(_MAGIC, len(indices) // _ROW_WIDTH, len(strings)))
+    buf += struct.pack(f'<{len(offsets)}I', *offsets)
+    buf += struct.pack(f'<{len(indices)}I', *indices)
+    buf += ''.join(strings).encode('utf-8')
+    return buf
+
+def _untrack(name):
+    # The parent takes ownership of the segment, so the worker's resource tracker must not
+    # unlink it when the worker exits.
+    if resource_tracker is not None:
+        try:
+            resource_tracker.unregister(name, 'shared_memory')
+        except Exception:
+            pass
+
+def _create_segment(data, name=None):
+    """Creates a segment holding data, owned by whichever process attaches it (see _untrack)."""
+    try:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(len(data), 1), track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(len(data), 1))
+        _untrack(shm._name)
+    shm.buf[:len(data)] = data
+    handle = (shm.name, len(data))
+    shm.close()
+    return handle
+
+def publish_rows(rows, name=None):
+    """
+    Writes rows into a new shared memory segment and returns a small picklable handle.
+
+    Called in a worker; the receiving process must open the handle with SharedRows, which
+    unlinks the segment. Pass a `name` from the parent's SegmentNames so the parent can
+    free the segment if it never receives the handle.
+
+    Returns:
+        tuple: (segment name, encoded size)
+    """
+    return _create_segment(encode_rows(rows), name)
+
+def publish_text(text, name=None):
+    """Like publish_rows, for a string (UTF-8 encoded). Open the handle with read_text."""
+    return _create_segment(text.encode('utf-8'), name)
+
+def read_text(handle):
+    """Returns the string behind a publish_text handle and unlinks its segment."""
+    name, size = handle
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        return str(shm.buf[:size], 'utf-8')
+    finally:
+        shm.close()
+
+def unlink_segment(name):
+    """Unlinks a segment by name; returns False if it was already gone."""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        return False
+    finally:
+        shm.close()
+    return True
+
+class SegmentNames:
+    """
+    Names the parent hands to workers for the segments they publish.
+
+    A segment is untracked in the worker that creates it, so if its handle never reaches
+    the parent (a task raised, the pool broke) nothing would unlink it and it would stay in
+    /dev/shm. The parent picks every name up front instead, and unlink_all(), run once no
+    task can still create a segment, frees the ones that were never attached.
+    """
+    def __init__(self):
+        self.names = []
+
+    def new(self):
+        name = f"pfr_{secrets.token_hex(8)}"
+        self.names.append(name)
+        return name
+
+    def unlink_all(self):
+        """Unlinks every segment that was not attached; returns how many there were."""
+        leaked = sum(unlink_segment(name) for name in self.names)
+        self.names = []
+        return leaked
+
+class SharedRows(Sequence):
+    """
+    Read-only sequence of FieldRecord rows decoded on access from a shared memory segment.
+
+    The segment is unlinked as soon as it is attached, so it is freed when this object is
+    closed or garbage collected even if close() is never called. Nothing is decoded up
+    front; the string blob is decoded on the first row access and rows are built as they
+    are accessed.
+    """
+    def __init__(self, handle):
+        name, size = handle
+        self._shm = shared_memory.SharedMemory(name=name)
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._buf = self._shm.buf[:size]
+        magic, self._count, string_count = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"Shared memory segment '{name}' does not hold encoded rows")
+        start = _HEADER.size
+        self._offsets = self._buf[start:start + 4 * (string_count + 1)].cast('I')
+        start += 4 * (string_count + 1)
+        self._indices = self._buf[start:start + 4 * _ROW_WIDTH * self._count].cast('I')
+        self._blob_start = start + 4 * _ROW_WIDTH * self._count
+        self._text = None
+
+    def _string(self, index):
+        if self._text is None:
+            self._text = str(self._buf[self._blob_start:], 'utf-8')
+        return self._text[self._offsets[index]:self._offsets[index + 1]]
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._record(self._indices[_ROW_WIDTH * i:_ROW_WIDTH * (i + 1)].tolist(), self._string)
+
+    @staticmethod
+    def _record(values, string):
+        section, name, description, page, line = values
+        return FieldRecord(string(section), string(name), string(description),
+                           None if page == _NONE else page, None if line == _NONE else line)
+
+    def __iter__(self):
+        # Sequential decoding; the section name, shared by consecutive rows, is decoded once per run.
+        if self._count == 0:
+            return
+        string, values = self._string, self._indices.tolist()
+        section_index, section = -1, None
+        for base in range(0, _ROW_WIDTH * self._count, _ROW_WIDTH):
+            if values[base] != section_index:
+                section_index, section = values[base], string(values[base])
+            page, line = values[base + 3], values[base + 4]
+            yield FieldRecord(section, string(values[base + 1]), string(values[base + 2]),
+                              None if page == _NONE else page, None if line == _NONE else line)
+
+    def close(self):
+        if self._shm is None:
+            return
+        for view in (getattr(self, '_offsets', None), getattr(self, '_indices', None), self._buf):
+            if view is not None:
+                view.release()
+        self._shm.close()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+class ChainedRows(Sequence):
+    """Concatenation of several row sequences (e.g. one SharedRows per section) without copying."""
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self._starts = []
+        total = 0
+        for part in self.parts:
+            self._starts.append(total)
+            total += len(part)
+        self._count = total
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        k = bisect.bisect_right(self._starts, i) - 1
+        return self.parts[k][i - self._starts[k]]
+
+    def __iter__(self):
+        for part in self.parts:
+            yield from part
+
+    def close(self):
+        for part in self.parts:
+            if hasattr(part, 'close'):
+                part.close()
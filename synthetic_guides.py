@@ -0,0 +1,186 @@
+import csv
+import random
+import argparse
+import textwrap
+
+from PyPDF2 import PdfReader, PdfWriter, PageObject
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from field_record import FieldRecord, FullFieldRecord, COLUMN_SETS
+
+# Description words. All lowercase and none of them a column keyword, so a wrapped line
+# never looks like a new field or a column value to the parser.
+_WORDS = (
+    "amount", "reported", "value", "issuer", "filing", "period", "identifier", "of", "the", "for",
+    "each", "record", "series", "class", "total", "offering", "sale", "price", "number", "state",
+    "country", "address", "unique", "assigned", "by", "system", "submission", "related", "person",
+    "entity", "fund", "return", "risk", "summary", "when", "applicable", "otherwise", "blank",
+)
+_COLUMN_TYPES = ("ALPHANUMERIC", "NUMERIC", "DATE", "BOOLEAN")
+WRAP_PATTERNS = ('inline', 'wrapped', 'column', 'mixed')
+
+def _column_values(rng):
+    values = [rng.choice(_COLUMN_TYPES), str(rng.choice((1, 4, 10, 20, 150, 2048))), rng.choice(("Yes", "No"))]
+    values.append("*" if rng.random() < 0.2 else "")
+    return values
+
+def _description(rng, min_words, max_words):
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join([words[0].capitalize()] + words[1:]) + "."
+
+def generate_guide(sections=5, fields_per_section=20, wrap='mixed', wrap_width=40, min_words=4, max_words=30,
+                   seed=0, section_prefix='SYNTH', columns='basic'):
+    """
+    Builds the text of a synthetic data guide and the rows the parser should return for it.
+
+    Each section has a "Figure N. Fields in the X data file" caption, a "Field Name Field
+    Description" header and `fields_per_section` fields laid out as in extracted guides.
+    `wrap` picks how a field's table row is broken into lines:
+        'inline'  - name, description and column values on one line;
+        'wrapped' - the description wrapped at wrap_width, column values after its last line;
+        'column'  - the description wrapped, column values on a line of their own;
+        'mixed'   - a random choice per field.
+    With columns='all', the expected rows are FullFieldRecords with the type, size,
+    nullability and key columns, as parse_fields_from_text(..., columns='all') returns.
+
+    Returns:
+        tuple: (lines, expected_rows): the guide's text lines and a list of FieldRecord rows.
+    """
+    if wrap not in WRAP_PATTERNS:
+        raise ValueError(f"wrap must be one of {WRAP_PATTERNS}")
+    if columns not in COLUMN_SETS:
+        raise ValueError(f"columns must be one of {', '.join(COLUMN_SETS)}")
+    rng = random.Random(seed)
+    lines = ["Synthetic Data Guide", ""]
+    expected = []
+    for s in range(sections):
+        section_name = f"{section_prefix}{s + 1:03d}"
+        lines += [f"Figure {s + 1}. Fields in the {section_name} data file", "Field Name Field Description"]
+        for f in range(fields_per_section):
+            field_name = f"{section_name}_F{f + 1:05d}"
+            description = _description(rng, min_words, max_words)
+            pattern = rng.choice(WRAP_PATTERNS[:3]) if wrap == 'mixed' else wrap
+            column_values = _column_values(rng)
+            values = " ".join(v for v in column_values if v)
+            if columns == 'all':
+                expected.append(FullFieldRecord(section_name, field_name, description, None, None, *column_values))
+            else:
+                expected.append(FieldRecord(section_name, field_name, description))
+            if pattern == 'inline':
+                lines.append(f"{field_name} {description} {values}")
+                continue
+            chunks = textwrap.wrap(description, wrap_width, break_long_words=False)
+            lines.append(f"{field_name} {chunks[0]}")
+            lines += chunks[1:]
+            if pattern == 'wrapped':
+                lines[-1] += f" {values}"
+            else:
+                lines.append(values)
+        lines.append("")
+    return lines, expected
+
+def _content_stream(lines, font_size, leading, top, left):
+    parts = [f"BT /F1 {font_size} Tf {leading} TL {left} {top} Td".encode()]
+    for line in lines:
+        escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        parts.append(b"(" + escaped.encode('latin-1', 'replace') + b") Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+def _running_line(text, page, font_size, y, left):
+    escaped = text.format(page=page).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return f"BT /F1 {font_size} Tf {left} {y} Td (".encode() + escaped.encode('latin-1', 'replace') + b") Tj ET"
+
+def write_guide_pdf(lines, pdf_path, lines_per_page=50, font_size=9, header=None, footer=None):
+    """
+    Writes text lines to a PDF with the PyPDF2 writer, lines_per_page lines per page.
+    `header` and `footer` are running lines drawn above and below the text of every page;
+    "{page}" in them is replaced by the page number (e.g. footer="Page {page}").
+
+    Returns:
+        int: Number of pages written.
+    """
+    writer = PdfWriter()
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    font_ref = writer._add_object(font)
+    leading = font_size + 5
+    pages = 0
+    for start in range(0, max(len(lines), 1), lines_per_page):
+        page = PageObject.create_blank_page(None, 612, 792)
+        content = DecodedStreamObject()
+        data = _content_stream(lines[start:start + lines_per_page], font_size, leading, 760, 40)
+        if header:
+            data = _running_line(header, pages + 1, font_size, 780, 40) + b"\n" + data
+        if footer:
+            data += b"\n" + _running_line(footer, pages + 1, font_size, 20, 40)
+        content.set_data(data)
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref}),
+        })
+        writer.add_page(page)
+        pages += 1
+    with open(pdf_path, 'wb') as f:
+        writer.write(f)
+    return pages
+
+def replicate_pages(source_pdf, output_pdf, page_count):
+    """
+    Writes a page_count-page PDF by cycling through the pages of source_pdf, as
+    create_partial_pdf.py does for page ranges. Used to scale the extractors on real layouts.
+    """
+    reader = PdfReader(source_pdf)
+    writer = PdfWriter()
+    for i in range(page_count):
+        writer.add_page(reader.pages[i % len(reader.pages)])
+    with open(output_pdf, 'wb') as f:
+        writer.write(f)
+    return page_count
+
+def write_expected_csv(rows, csv_path):
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMN_SETS['all' if rows and isinstance(rows[0], FullFieldRecord) else 'basic']))
+        writer.writeheader()
+        writer.writerows(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic data guide (text and/or PDF) with its expected rows.")
+    parser.add_argument("--sections", type=int, default=5, help="Number of sections (default: 5).")
+    parser.add_argument("--fields_per_section", type=int, default=20, help="Fields per section (default: 20).")
+    parser.add_argument("--wrap", type=str, default="mixed", choices=WRAP_PATTERNS, help="How table rows are broken into lines (default: mixed).")
+    parser.add_argument("--wrap_width", type=int, default=40, help="Width descriptions are wrapped at (default: 40).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--columns", type=str, default="basic", choices=list(COLUMN_SETS), help="Columns of the expected rows (default: basic).")
+    parser.add_argument("--text_file", type=str, default=None, help="Write the guide's text here.")
+    parser.add_argument("--pdf_file", type=str, default=None, help="Write the guide as a PDF here.")
+    parser.add_argument("--lines_per_page", type=int, default=50, help="Lines per PDF page (default: 50).")
+    parser.add_argument("--header", type=str, default=None, help="Running header for every PDF page.")
+    parser.add_argument("--footer", type=str, default=None, help="Running footer for every PDF page; {page} is the page number.")
+    parser.add_argument("--expected_csv", type=str, default=None, help="Write the rows the parser should return here.")
+    parser.add_argument("--replicate_pdf", type=str, default=None,
+                        help="Instead, build a PDF of --pages pages by cycling through the pages of this PDF (written to --pdf_file).")
+    parser.add_argument("--pages", type=int, default=100, help="Page count for --replicate_pdf (default: 100).")
+    args = parser.parse_args()
+
+    if args.replicate_pdf:
+        if not args.pdf_file:
+            parser.error("--replicate_pdf requires --pdf_file")
+        replicate_pages(args.replicate_pdf, args.pdf_file, args.pages)
+        print(f"Wrote {args.pages} pages from '{args.replicate_pdf}' to {args.pdf_file}")
+    else:
+        lines, expected = generate_guide(args.sections, args.fields_per_section, args.wrap, args.wrap_width, seed=args.seed,
+                                         columns=args.columns)
+        if args.text_file:
+            with open(args.text_file, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            print(f"Wrote {len(lines)} lines to {args.text_file}")
+        if args.pdf_file:
+            pages = write_guide_pdf(lines, args.pdf_file, args.lines_per_page, header=args.header, footer=args.footer)
+            print(f"Wrote {pages} pages to {args.pdf_file}")
+        if args.expected_csv:
+            write_expected_csv(expected, args.expected_csv)
+            print(f"Wrote {len(expected)} expected rows to {args.expected_csv}")
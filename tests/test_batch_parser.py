@@ -0,0 +1,61 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from batch_parser import run_batch, build_profile_report, csv_path_for
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestRunBatch(unittest.TestCase):
+    def test_in_process_batch_writes_csv_and_profile(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = run_batch([SAMPLE_PDF, SAMPLE_PDF], output_dir, workers=1)
+            self.assertTrue(os.path.exists(csv_path_for(SAMPLE_PDF, output_dir)))
+        docs = report['documents']
+        self.assertEqual([d['status'] for d in docs], ['ok', 'ok'])
+        self.assertEqual(docs[0]['fields'], docs[1]['fields'])
+        self.assertGreater(docs[0]['fields'], 0)
+        self.assertEqual(docs[0]['pages'], 9)
+        # The second document reuses the fonts cached while extracting the first.
+        self.assertGreater(report['font_cache']['shared_hits'], 0)
+
+    def test_skipped_pages_come_from_the_path_that_ran(self):
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        writer.add_page(PdfReader(SAMPLE_PDF).pages[0])
+        with tempfile.TemporaryDirectory() as output_dir:
+            blank_first = os.path.join(output_dir, 'blank_first.pdf')
+            with open(blank_first, 'wb') as out_file:
+                writer.write(out_file)
+            for options in ({}, {'route_pages': True}, {'page_timeout': 30}):
+                # The worker's previous document had no skipped pages; none may leak in.
+                report = run_batch([SAMPLE_PDF, blank_first, SAMPLE_PDF], output_dir, workers=1, **options)
+                self.assertEqual([d['pages_skipped'] for d in report['documents']], [[], [1], []], options)
+
+    def test_missing_file_is_reported_not_raised(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = run_batch([os.path.join(output_dir, 'missing.pdf')], output_dir, workers=1)
+        self.assertEqual(report['documents'][0]['status'], 'error')
+
+
+class TestBuildProfileReport(unittest.TestCase):
+    def test_uses_latest_worker_snapshot(self):
+        records = [
+            {'pdf_file': 'a.pdf', 'worker': 1, 'status': 'ok',
+             'worker_stats': {'documents': 1, 'font_cache_hits': 2, 'font_cache_misses': 3}},
+            {'pdf_file': 'b.pdf', 'worker': 1, 'status': 'ok',
+             'worker_stats': {'documents': 2, 'font_cache_hits': 7, 'font_cache_misses': 3}},
+        ]
+        report = build_profile_report(records, 1.0)
+        self.assertEqual(report['font_cache']['hits'], 7)
+        self.assertEqual(report['font_cache']['misses'], 3)
+        self.assertEqual(report['font_cache']['hit_rate'], 0.7)
+        self.assertNotIn('worker_stats', report['documents'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import filecmp
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_scheduler import page_count, plan_tasks, choose_workers, estimate_makespan, schedule_report
+from batch_parser import run_batch, csv_path_for, extract_page_range
+import pdf_parser
+from pdf_parser import ExtractionContext
+
+PDF_DIR = os.path.join(os.path.dirname(__file__), '..', 'pdfs')
+SAMPLE_PDF = os.path.join(PDF_DIR, 'Form_D_pages_1-9.pdf')
+GUIDE_PDF = os.path.join(PDF_DIR, 'Form_D.SEC.Data.Guide.pdf')
+
+class TestPlanning(unittest.TestCase):
+    def test_page_count_reads_the_page_tree(self):
+        self.assertEqual(page_count(SAMPLE_PDF), (9, True))
+        with tempfile.NamedTemporaryFile(suffix='.pdf') as broken:
+            broken.write(b'not a pdf' * 20000)
+            broken.flush()
+            self.assertEqual(page_count(broken.name), (3, False))
+
+    def test_largest_first_and_large_documents_split(self):
+        counts = {'a.pdf': (5, True), 'huge.pdf': (1000, True), 'b.pdf': (40, True), 'c.pdf': (200, False)}
+        tasks = plan_tasks(list(counts), 4, page_counts=counts)
+        sizes = [task['pages'] for task in tasks]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        huge = [task for task in tasks if task['pdf_file'] == 'huge.pdf']
+        self.assertGreater(len(huge), 1)
+        self.assertEqual([p for task in huge for p in range(task['start'], task['stop'])], list(range(1000)))
+        # Estimated page counts are never split, and nothing is split for one worker.
+        self.assertEqual(sum(1 for task in tasks if task['pdf_file'] == 'c.pdf'), 1)
+        self.assertEqual(len(plan_tasks(list(counts), 1, page_counts=counts)), 4)
+        in_order = estimate_makespan([pages for pages, _ in counts.values()], 4)
+        self.assertLess(estimate_makespan(sizes, 4), in_order)
+
+    def test_choose_workers_respects_memory_and_tasks(self):
+        with patch('batch_scheduler.available_cpus', return_value=16), \
+             patch('batch_scheduler.available_memory_mb', return_value=1512):
+            self.assertEqual(choose_workers(worker_memory_mb=250), 4)
+            self.assertEqual(choose_workers(tasks=2, worker_memory_mb=250), 2)
+        with patch('batch_scheduler.available_cpus', return_value=3), \
+             patch('batch_scheduler.available_memory_mb', return_value=None):
+            self.assertEqual(choose_workers(), 3)
+
+    def test_schedule_report(self):
+        report = schedule_report([(1, 0.0, 4.0), (2, 0.0, 2.0), (2, 2.0, 3.0)], 4.0, 2)
+        self.assertEqual(report['makespan_seconds'], 4.0)
+        self.assertEqual(report['busy_seconds'], 7.0)
+        self.assertEqual(report['utilization'], 0.875)
+        self.assertEqual(report['worker_busy_seconds'], {'1': 4.0, '2': 3.0})
+
+class TestScheduledBatch(unittest.TestCase):
+    def test_split_document_matches_unscheduled_run(self):
+        pdfs = [SAMPLE_PDF, GUIDE_PDF]
+        with tempfile.TemporaryDirectory() as plain_dir, tempfile.TemporaryDirectory() as scheduled_dir:
+            plain = run_batch(pdfs, plain_dir, workers=1)
+            with patch('batch_parser.plan_tasks', side_effect=lambda paths, workers, split: plan_tasks(paths, workers, split, min_chunk_pages=4)):
+                scheduled = run_batch(pdfs, scheduled_dir, workers=2, schedule=True)
+            for pdf_path in pdfs:
+                self.assertTrue(filecmp.cmp(csv_path_for(pdf_path, plain_dir), csv_path_for(pdf_path, scheduled_dir), shallow=False))
+        self.assertEqual([d['pdf_file'] for d in scheduled['documents']], pdfs)
+        self.assertEqual([d['fields'] for d in scheduled['documents']], [d['fields'] for d in plain['documents']])
+        self.assertEqual(scheduled['documents'][1]['pages'], 19)
+        self.assertGreater(scheduled['documents'][1]['page_ranges'], 1)
+        schedule = scheduled['schedule']
+        self.assertEqual(schedule['workers'], 2)
+        self.assertGreater(schedule['tasks'], 2)
+        self.assertGreater(schedule['utilization'], 0)
+
+    def test_ranges_parse_the_file_once_and_build_only_their_pages(self):
+        context = ExtractionContext()
+        with open(GUIDE_PDF, 'rb') as in_file:
+            whole = context.extract_pages(in_file)
+        documents = context.documents
+        with patch('batch_parser.get_worker_context', return_value=context), \
+             patch('pdf_parser.PDFDocument', wraps=pdf_parser.PDFDocument) as parsed, \
+             patch('pdf_parser.PDFPage', wraps=pdf_parser.PDFPage) as built:
+            ranges = [extract_page_range(GUIDE_PDF, start, start + 4) for start in range(0, 19, 4)]
+        context.close_page_range()
+        self.assertEqual([text for r in ranges for text in r['page_texts']], whole)
+        self.assertEqual(parsed.call_count, 1)
+        self.assertEqual(built.call_count, 19)
+        # A range is not a document, so the profile report's latest-snapshot pick still works.
+        self.assertEqual(ranges[-1]['worker_stats']['documents'], documents)
+
+    def test_modes_that_need_whole_documents_are_not_split(self):
+        with tempfile.TemporaryDirectory() as output_dir, patch('builtins.print'):
+            report = run_batch([GUIDE_PDF], output_dir, workers=1, schedule=True, route_pages=True)
+        self.assertEqual(report['schedule']['tasks'], 1)
+        self.assertNotIn('page_ranges', report['documents'][0])
+        self.assertIn('routes', report['documents'][0])
+
+if __name__ == '__main__':
+    unittest.main()
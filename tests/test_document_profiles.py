@@ -0,0 +1,83 @@
+import unittest
+import pickle
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from document_profiles import (DocumentProfile, DEFAULT_PROFILE, BASE_COLUMN_KEYWORDS, select_profile,
+                               document_fingerprint, read_metadata, register_profile, get_profile, profile_names)
+from pdf_parser import ExtractionContext, parse_fields_from_text, parse_section, other_column_keywords_strict
+
+PDF_DIR = os.path.join(os.path.dirname(__file__), '..', 'pdfs')
+RAW_TEXT = os.path.join(os.path.dirname(__file__), '..', 'output', 'form_d_1-9_raw_text.txt')
+
+class TestDocumentProfiles(unittest.TestCase):
+    def test_rules_are_frozen_and_compiled_once(self):
+        self.assertIsInstance(DEFAULT_PROFILE.column_keywords, frozenset)
+        self.assertIs(other_column_keywords_strict, DEFAULT_PROFILE.column_keywords)
+        match = DEFAULT_PROFILE.column_keyword_split_pattern.search("Name of the issuer  ALPHANUMERIC 150 text")
+        self.assertEqual(match.start(), len("Name of the issuer"))
+        self.assertTrue("ALPHANUMERIC (20)".startswith(DEFAULT_PROFILE.column_keyword_prefixes))
+
+    def test_fingerprint_caption_style(self):
+        self.assertEqual(document_fingerprint("Figure 2. Fields in the ISSUERS data file\n")['caption_style'], 'file')
+        self.assertEqual(document_fingerprint("Figure 2. Fields in the SUB data set\n")['caption_style'], 'set')
+        self.assertIsNone(document_fingerprint("No captions here")['caption_style'])
+
+    def test_select_profile_from_metadata_and_captions(self):
+        mfrr = read_metadata(os.path.join(PDF_DIR, 'Mutual.Fund.Risk&Return.MFRR.pdf'))
+        self.assertIn('Data Sets', mfrr['title'])
+        self.assertEqual(select_profile(metadata=mfrr).name, 'data_sets')
+        # The extraction keeps the metadata of the document it opened.
+        context = ExtractionContext()
+        with open(os.path.join(PDF_DIR, 'Mutual.Fund.Risk&Return.MFRR.pdf'), 'rb') as in_file:
+            context.open_document(in_file)
+        self.assertEqual(context.metadata, mfrr)
+        self.assertEqual(select_profile("Figure 1. Fields in the ISSUERS data file\n").name, 'form_d')
+        self.assertIs(select_profile("plain text"), DEFAULT_PROFILE)
+        # A title match outweighs the caption style.
+        self.assertEqual(select_profile("Figure 1. Fields in the ISSUERS data file\n", {'title': 'Financial Data Sets'}).name, 'data_sets')
+
+    def test_custom_profile_changes_parsing(self):
+        section = "Field Name Field Description\nFOO_ID The foo value CURRENCY 10\nBAR_ID The bar value\n"
+        default_rows = parse_section('S', section, profile=DEFAULT_PROFILE)
+        self.assertEqual(default_rows[0]['Field Description'], 'The foo value CURRENCY 10')
+        custom = DocumentProfile('currency_test', column_keywords=BASE_COLUMN_KEYWORDS | {'CURRENCY'})
+        custom_rows = parse_section('S', section, profile=custom)
+        self.assertEqual(custom_rows[0]['Field Description'], 'The foo value')
+        self.assertEqual(pickle.loads(pickle.dumps(custom)).column_keywords, custom.column_keywords)
+
+    def test_registry(self):
+        profile = register_profile(DocumentProfile('registry_test', title_regex=r"Registry Test Guide"))
+        try:
+            self.assertIs(get_profile('registry_test'), profile)
+            self.assertEqual(select_profile(metadata={'title': 'The Registry Test Guide'}).name, 'registry_test')
+        finally:
+            from document_profiles import _profiles
+            _profiles.pop('registry_test')
+        self.assertNotIn('registry_test', profile_names())
+
+    def test_every_profile_parses_the_sample_identically(self):
+        with open(RAW_TEXT, encoding='utf-8') as f:
+            text = f.read()
+        expected = parse_fields_from_text(text, profile=DEFAULT_PROFILE)
+        self.assertTrue(expected)
+        for name in profile_names():
+            self.assertEqual(parse_fields_from_text(text, profile=get_profile(name)), expected, name)
+        self.assertEqual(parse_fields_from_text(text), expected)
+
+    def test_default_profile_without_a_profile(self):
+        import contextlib, io
+        from pdf_parser import ExtractionContext
+        with open(os.path.join(PDF_DIR, 'Form_D.SEC.Data.Guide.pdf'), 'rb') as in_file, \
+             contextlib.redirect_stdout(io.StringIO()):
+            text = ''.join(ExtractionContext().extract_pages(in_file))
+            rows = parse_fields_from_text(text)
+            # select_profile picks form_d for this guide; its rules are still the default ones.
+            selected = parse_fields_from_text(text, profile=select_profile(text))
+        self.assertEqual(select_profile(text).name, 'form_d')
+        self.assertEqual(len(rows), 396)
+        self.assertEqual(selected, rows)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import json
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pdfminer.pdfpage import PDFPage
+
+from document_triage import triage_document, _sample_indexes
+from batch_parser import run_batch, process_document
+from pdf_parser import PDFDocument, get_worker_context
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+GUIDE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D.SEC.Data.Guide.pdf')
+
+def write_pdf(path, content, title=None):
+    """Writes a one-page PDF whose page content stream is `content` (bytes)."""
+    info = f"<< /Title ({title}) >>".encode() if title else b"<< >>"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        info,
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 6 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+class TestTriageDocument(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_guides_are_accepted(self):
+        outline = triage_document(GUIDE_PDF)
+        self.assertTrue(outline['accepted'])
+        self.assertEqual(outline['reason'], 'outline')
+        sampled = triage_document(SAMPLE_PDF)
+        self.assertEqual((sampled['accepted'], sampled['reason']), (True, 'text_sample'))
+        self.assertEqual(sampled['sampled_pages'], [1])
+
+    def test_text_without_markers_is_rejected(self):
+        write_pdf(self.path('memo.pdf'), b"BT /F1 12 Tf 72 700 Td (Quarterly memo about lunch) Tj ET")
+        result = triage_document(self.path('memo.pdf'))
+        self.assertEqual((result['accepted'], result['reason']), (False, 'no_markers'))
+        self.assertEqual(result['pages'], 1)
+
+    def test_metadata_title_is_enough(self):
+        write_pdf(self.path('titled.pdf'), b"BT /F1 12 Tf 72 700 Td (Cover) Tj ET", title='Widget Data Sets')
+        self.assertEqual(triage_document(self.path('titled.pdf'))['reason'], 'metadata')
+
+    def test_image_only_and_broken_files(self):
+        write_pdf(self.path('scan.pdf'), b"q 612 0 0 792 0 0 cm Q")
+        self.assertEqual(triage_document(self.path('scan.pdf'))['reason'], 'no_text')
+        with open(self.path('broken.pdf'), 'wb') as f:
+            f.write(b'not a pdf')
+        self.assertEqual(triage_document(self.path('broken.pdf'))['reason'], 'unreadable')
+
+    def test_only_sampled_pages_are_built(self):
+        built = []
+        original = PDFPage.__init__
+        def init(page, doc, pageid, attrs, label):
+            built.append(pageid)
+            original(page, doc, pageid, attrs, label)
+        with patch.object(PDFPage, '__init__', init):
+            result = triage_document(SAMPLE_PDF)
+        self.assertEqual((result['pages'], result['sampled_pages']), (9, [1]))
+        self.assertEqual(len(built), 1)
+
+    def test_batch_extraction_reuses_the_triaged_document(self):
+        expected = process_document(SAMPLE_PDF, self.path('plain.csv'))
+        context = get_worker_context()
+        before = context.stats()
+        with patch('pdf_parser.PDFDocument', wraps=PDFDocument) as parsed, \
+             patch.object(context.interpreter, 'process_page', wraps=context.interpreter.process_page) as interpreted:
+            record = process_document(SAMPLE_PDF, self.path('triaged.csv'), triage=True)
+        self.assertEqual((record['status'], record['triage']['reason']), ('ok', 'text_sample'))
+        # The file is parsed once, by triage, and its sampled first page is not interpreted again.
+        parsed.assert_not_called()
+        self.assertEqual(interpreted.call_count, 8)
+        # Triage runs in its own context, so the worker counts each page once.
+        after = record['worker_stats']
+        self.assertEqual((after['documents'] - before['documents'], after['pages'] - before['pages']), (1, 9))
+        with open(self.path('plain.csv'), encoding='utf-8') as plain, open(self.path('triaged.csv'), encoding='utf-8') as triaged:
+            self.assertEqual(plain.read(), triaged.read())
+        self.assertEqual(record['fields'], expected['fields'])
+
+    def test_sample_indexes(self):
+        self.assertEqual(_sample_indexes(19, 3, 2), [0, 1, 2, 8, 13])
+        self.assertEqual(_sample_indexes(2, 3, 2), [0, 1])
+
+    def test_batch_rejects_and_writes_manifest(self):
+        write_pdf(self.path('memo.pdf'), b"BT /F1 12 Tf 72 700 Td (Quarterly memo about lunch) Tj ET")
+        manifest = self.path('manifest.jsonl')
+        report = run_batch([self.path('memo.pdf'), SAMPLE_PDF], self.path('out'), triage=True, triage_manifest=manifest)
+        self.assertEqual([d['status'] for d in report['documents']], ['rejected', 'ok'])
+        self.assertEqual(report['rejected'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'out', 'memo.csv')))
+        with open(manifest, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([(e['accepted'], e['reason']) for e in entries], [(False, 'no_markers'), (True, 'text_sample')])
+
+if __name__ == '__main__':
+    unittest.main()
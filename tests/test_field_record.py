@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+import csv
+import io
+import pickle
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from field_record import FieldRecord, FullFieldRecord, FIELDNAMES, ALL_FIELDNAMES, page_line_starts, assign_pages
+from pdf_parser import parse_fields_from_text
+from section_index import SectionIndex
+from shared_results import publish_rows, SharedRows
+
+SAMPLE_TEXT = """Preamble
+Figure 1. Fields in the FIRST data file
+Field Name Field Description
+FIELD_A    Description A
+continues here.
+FIELD_B    Description B.
+
+Figure 2. Fields in the SECOND data file
+Field Name Field Description
+FIELD_C    Description C.
+"""
+
+class TestFieldRecord(unittest.TestCase):
+    def test_reads_like_the_row_dict(self):
+        record = FieldRecord('ISSUERS', 'CIK', 'Central Index Key', page=2, line=40)
+        row = {'Section': 'ISSUERS', 'Field Name': 'CIK', 'Field Description': 'Central Index Key'}
+        self.assertEqual(record, row)
+        self.assertEqual(row, record)
+        self.assertEqual(dict(record), row)
+        self.assertEqual(list(record.keys()), list(FIELDNAMES))
+        self.assertEqual(record.get('Missing', 'x'), 'x')
+        self.assertEqual(repr(record), repr(row))
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_dict_writer_output_matches_dicts(self):
+        records = [FieldRecord('S', 'A', 'Quoted "text", with comma'), FieldRecord('S', 'B', '')]
+        outputs = []
+        for rows in (records, [dict(r) for r in records]):
+            out = io.StringIO()
+            writer = csv.DictWriter(out, fieldnames=list(FIELDNAMES))
+            writer.writeheader()
+            writer.writerows(rows)
+            outputs.append(out.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_section_names_are_interned(self):
+        first = FieldRecord(''.join(['ISS', 'UERS']), 'A', '')
+        second = FieldRecord(''.join(['ISSU', 'ERS']), 'B', '')
+        self.assertIs(first.section, second.section)
+
+    def test_pickle_keeps_provenance(self):
+        record = pickle.loads(pickle.dumps(FieldRecord('S', 'A', 'd', page=3, line=7)))
+        self.assertEqual((record.section, record.name, record.description, record.page, record.line), ('S', 'A', 'd', 3, 7))
+
+    def test_assign_pages_from_page_texts(self):
+        starts = page_line_starts(['a\nb\n', 'c\n', 'd\ne\n'])
+        self.assertEqual(starts, [1, 3, 4])
+        records = [FieldRecord('S', 'A', '', line=2), FieldRecord('S', 'B', '', line=3), FieldRecord('S', 'C', '', line=5)]
+        assign_pages(records, starts)
+        self.assertEqual([r.page for r in records], [1, 2, 3])
+
+class TestFullFieldRecord(unittest.TestCase):
+    def test_mapping_has_every_column(self):
+        record = FullFieldRecord('S', 'CIK', 'Central Index Key', field_type='ALPHANUMERIC', max_size='10', nullable='No')
+        self.assertEqual(list(record), list(ALL_FIELDNAMES))
+        self.assertEqual(len(record), 7)
+        self.assertEqual(record['Max Size'], '10')
+        self.assertEqual(record['Key'], '')
+        self.assertEqual(record, dict(record))
+        self.assertEqual(FullFieldRecord.from_mapping(dict(record)), record)
+        self.assertNotEqual(record, FullFieldRecord('S', 'CIK', 'Central Index Key'))
+        # Against a basic record only the basic columns are compared.
+        self.assertEqual(record, FieldRecord('S', 'CIK', 'Central Index Key'))
+        copy = pickle.loads(pickle.dumps(record))
+        self.assertEqual((copy, copy.field_type), (record, 'ALPHANUMERIC'))
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_fill_columns(self):
+        types = frozenset({'ALPHANUMERIC', 'DATE'})
+        record = FullFieldRecord('S', 'A', '')
+        self.assertFalse(record.fill_columns('see the filing', types))
+        self.assertTrue(record.fill_columns('DATE (DD-MMM-YY) 8 yes', types))
+        self.assertTrue(record.fill_columns('ALPHANUMERIC 20 No *', types))
+        self.assertEqual((record.field_type, record.max_size, record.nullable, record.key), ('DATE (DD-MMM-YY)', '8', 'Yes', '*'))
+
+    def test_continue_format(self):
+        record = FullFieldRecord('S', 'A', '', field_type='ALPHANUMERIC')
+        self.assertIsNone(record.continue_format('(if'))
+        self.assertIsNone(record.continue_format('(CIK)'))
+        self.assertEqual(record.continue_format('(nnnnnnnnnn- nn-'), '')
+        self.assertIsNone(record.continue_format('Number; The 20-'))
+        self.assertEqual(record.continue_format('nnnnnn)  20 No *'), '  20 No *')
+        self.assertEqual(record.field_type, 'ALPHANUMERIC (nnnnnnnnnn-nn-nnnnnn)')
+        self.assertIsNone(record.continue_format('nnnnnn)'))
+
+class TestParserProvenance(unittest.TestCase):
+    def parse(self, *args, **kwargs):
+        with patch('sys.stdout', new_callable=io.StringIO):
+            return parse_fields_from_text(*args, **kwargs)
+
+    def test_records_carry_their_start_line(self):
+        rows = self.parse(SAMPLE_TEXT)
+        lines = SAMPLE_TEXT.split('\n')
+        self.assertEqual([r.name for r in rows], ['FIELD_A', 'FIELD_B', 'FIELD_C'])
+        for row in rows:
+            self.assertTrue(lines[row.line - 1].startswith(row.name))
+
+    def test_page_from_page_texts(self):
+        cut = SAMPLE_TEXT.index('Figure 2.')
+        pages = [SAMPLE_TEXT[:cut], SAMPLE_TEXT[cut:]]
+        rows = self.parse(''.join(pages), page_line_starts=page_line_starts(pages))
+        self.assertEqual([r.page for r in rows], [1, 1, 2])
+
+    def test_section_index_lines_match_full_parse(self):
+        rows = self.parse(SAMPLE_TEXT)
+        with patch('sys.stdout', new_callable=io.StringIO):
+            indexed = SectionIndex(SAMPLE_TEXT).fields('SECOND')
+        self.assertEqual(indexed[0].line, rows[-1].line)
+
+    def test_shared_rows_keep_provenance(self):
+        rows = self.parse(SAMPLE_TEXT)
+        assign_pages(rows, [1, 6])
+        with SharedRows(publish_rows(rows)) as shared:
+            self.assertEqual([(r.page, r.line) for r in shared], [(r.page, r.line) for r in rows])
+            self.assertEqual(shared[2].line, rows[2].line)
+
+if __name__ == '__main__':
+    unittest.main()
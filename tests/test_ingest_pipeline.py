@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import tempfile
+import threading
+import time
+import io
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import ingest_pipeline
+from ingest_pipeline import ingest, run_pipeline
+from batch_parser import csv_path_for
+from pdf_parser import extract_text_from_pdf, parse_fields_from_text
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+def _segments():
+    return {name for name in os.listdir('/dev/shm') if name.startswith('pfr_')}
+
+class TestIngestPipeline(unittest.TestCase):
+    def test_pipeline_matches_serial_parser(self):
+        with patch('sys.stdout', new_callable=io.StringIO):
+            expected = parse_fields_from_text(extract_text_from_pdf(SAMPLE_PDF))
+        collected = {}
+        def sink(record, rows):
+            collected[record['pdf_file']] = rows
+            return True
+        paths = [SAMPLE_PDF, os.path.abspath(SAMPLE_PDF)]
+        records = asyncio.run(run_pipeline(paths, sink, workers=2, queue_size=1))
+        self.assertEqual([r['status'] for r in records], ['ok', 'ok'])
+        self.assertEqual([r['pdf_file'] for r in records], paths)
+        self.assertEqual(records[0]['pages'], 9)
+        for path in paths:
+            self.assertEqual(collected[path], expected)
+
+    def test_shared_memory_frees_segments_of_failed_documents(self):
+        with patch('sys.stdout', new_callable=io.StringIO):
+            expected = parse_fields_from_text(extract_text_from_pdf(SAMPLE_PDF))
+        before = _segments()
+        handles = []
+        real_read_text = ingest_pipeline.read_text
+        def read_text(handle):
+            handles.append(handle)
+            if len(handles) == 2:
+                raise OSError("worker lost")
+            return real_read_text(handle)
+        collected = []
+        def sink(record, rows):
+            collected.append(list(rows))
+            return True
+        # Threads instead of processes, so the patched read_text is the one the tasks call.
+        with ThreadPoolExecutor(max_workers=1) as executor, patch.object(ingest_pipeline, 'read_text', read_text):
+            records = asyncio.run(run_pipeline([SAMPLE_PDF] * 3, sink, workers=1, executor=executor, shared_memory=True))
+        self.assertEqual([r['status'] for r in records], ['ok', 'error', 'ok'])
+        self.assertEqual(collected, [expected, expected])
+        # The second document's text was published but never read; it must not stay in /dev/shm.
+        self.assertEqual(_segments(), before)
+
+    def test_missing_file_does_not_stop_pipeline(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            missing = os.path.join(output_dir, 'missing.pdf')
+            records = ingest([missing, SAMPLE_PDF], output_dir, workers=1)
+            self.assertTrue(os.path.exists(csv_path_for(SAMPLE_PDF, output_dir)))
+        self.assertEqual(records[0]['status'], 'error')
+        self.assertEqual(records[1]['status'], 'ok')
+        self.assertGreater(records[1]['fields'], 0)
+
+    def test_slow_sink_applies_backpressure(self):
+        loads = []
+        read_file = ingest_pipeline._read_file
+        def counting_read(path):
+            loads.append(path)
+            return read_file(path)
+        loads_seen_by_sink = []
+        def slow_sink(record, rows):
+            loads_seen_by_sink.append(len(loads))
+            time.sleep(0.2)
+            return True
+        paths = [SAMPLE_PDF] * 8
+        with patch.object(ingest_pipeline, '_read_file', counting_read):
+            records = asyncio.run(run_pipeline(paths, slow_sink, workers=1, queue_size=1))
+        self.assertTrue(all(r['status'] == 'ok' for r in records))
+        # With one-slot queues the loader can only run a few documents ahead of the sink.
+        self.assertLess(loads_seen_by_sink[0], len(paths))
+        self.assertLessEqual(max(seen - i for i, seen in enumerate(loads_seen_by_sink)), 7)
+
+if __name__ == '__main__':
+    unittest.main()
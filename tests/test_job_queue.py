@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+import shutil
+import time
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from job_queue import JobTable, run_node, run_local_nodes
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestJobTable(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'jobs.sqlite')
+        self.table = JobTable(self.path)
+
+    def tearDown(self):
+        self.table.close()
+        self.tmp.cleanup()
+
+    def test_enqueue_is_idempotent_and_claims_are_exclusive(self):
+        self.assertEqual(self.table.enqueue([('a.pdf', 'a.csv'), ('b.pdf', 'b.csv')]), 2)
+        self.assertEqual(self.table.enqueue([('a.pdf', 'a.csv')]), 0)
+        first = self.table.claim('n1')
+        second = self.table.claim('n2')
+        self.assertEqual((first['pdf_file'], second['pdf_file']), ('a.pdf', 'b.pdf'))
+        self.assertIsNone(self.table.claim('n3'))
+        self.assertFalse(self.table.complete(first['id'], 'n2', {'status': 'ok'}))
+        self.assertTrue(self.table.complete(first['id'], 'n1', {'status': 'ok', 'pages': 9, 'fields': 3}))
+        self.assertEqual(self.table.counts(), {'pending': 0, 'running': 1, 'done': 1, 'failed': 0})
+
+    def test_expired_lease_is_reclaimed_and_heartbeat_keeps_it(self):
+        self.table.enqueue([('a.pdf', 'a.csv'), ('b.pdf', 'b.csv')])
+        dead = self.table.claim('dead', lease_seconds=0.01)
+        alive = self.table.claim('alive', lease_seconds=0.01)
+        time.sleep(0.02)
+        self.assertTrue(self.table.heartbeat(alive['id'], 'alive', lease_seconds=60))
+        rescued = self.table.claim('rescuer')
+        self.assertEqual((rescued['id'], rescued['attempts']), (dead['id'], 2))
+        self.assertIsNone(self.table.claim('other'))
+        # The dead node can no longer renew or finish the job.
+        self.assertFalse(self.table.heartbeat(dead['id'], 'dead'))
+        self.assertFalse(self.table.complete(dead['id'], 'dead', {'status': 'ok'}))
+
+    def test_failures_retry_until_max_attempts(self):
+        self.table.enqueue([('a.pdf', 'a.csv')], max_attempts=2)
+        job = self.table.claim('n1')
+        self.assertTrue(self.table.fail(job['id'], 'n1', 'boom'))
+        self.assertEqual(self.table.counts()['pending'], 1)
+        job = self.table.claim('n1')
+        self.table.fail(job['id'], 'n1', 'boom again')
+        self.assertEqual(self.table.counts()['failed'], 1)
+        self.assertIsNone(self.table.claim('n1'))
+        # A lease that runs out on the last attempt also ends in 'failed'.
+        self.table.enqueue([('b.pdf', 'b.csv')], max_attempts=1)
+        self.table.claim('n1', lease_seconds=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.table.claim('n2'))
+        self.assertEqual(self.table.counts()['failed'], 2)
+
+    def test_local_nodes_drain_the_table(self):
+        input_dir = os.path.join(self.tmp.name, 'in')
+        output_dir = os.path.join(self.tmp.name, 'out')
+        os.makedirs(input_dir)
+        jobs = []
+        for i in range(4):
+            pdf = shutil.copy(SAMPLE_PDF, os.path.join(input_dir, f'doc{i}.pdf'))
+            jobs.append((pdf, os.path.join(output_dir, f'doc{i}.csv')))
+        jobs.append((os.path.join(input_dir, 'missing.pdf'), os.path.join(output_dir, 'missing.csv')))
+        self.table.enqueue(jobs, max_attempts=2)
+        self.assertEqual(run_local_nodes(self.path, nodes=2, lease_seconds=30), [0, 0])
+        self.assertEqual(self.table.counts(), {'pending': 0, 'running': 0, 'done': 4, 'failed': 1})
+        for _, csv_file in jobs[:4]:
+            self.assertTrue(os.path.exists(csv_file))
+        report = self.table.node_report()
+        self.assertEqual(sum(stats['documents'] for stats in report.values()), 4)
+        self.assertTrue(all(stats['pages'] == 9 * stats['documents'] for stats in report.values()))
+
+    def test_run_node_summary(self):
+        self.table.enqueue([(SAMPLE_PDF, os.path.join(self.tmp.name, 'out', 'a.csv'))])
+        summary = run_node(self.path, node='solo', lease_seconds=5)
+        self.assertEqual((summary['done'], summary['failed'], summary['lost']), (1, 0, 0))
+        self.assertEqual(self.table.jobs()[0]['pages'], 9)
+        self.assertGreater(self.table.jobs()[0]['fields'], 0)
+        self.assertIn('solo', self.table.node_report())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pdfplumber
+import layout_snapshot
+from layout_snapshot import take_snapshot, encode_snapshot, decode_snapshot, load_snapshot, snapshot_path
+from extract_fields_only import extract_text_from_pdf, extract_fields
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestLayoutSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = take_snapshot(SAMPLE_PDF)
+
+    def test_round_trip_keeps_every_char(self):
+        decoded = decode_snapshot(encode_snapshot(self.pages))
+        self.assertEqual(len(decoded), len(self.pages))
+        for page, replayed in zip(self.pages, decoded):
+            self.assertEqual((replayed.width, replayed.height, replayed.bbox, replayed.has_text),
+                             (page.width, page.height, page.bbox, page.has_text))
+            keys = list(page.chars[0]) if page.chars else []
+            self.assertEqual([{k: c[k] for k in keys} for c in replayed.chars], page.chars)
+        with self.assertRaises(ValueError):
+            decode_snapshot(b'%PDF-1.4')
+
+    def test_replayed_page_matches_pdfplumber(self):
+        replayed = decode_snapshot(encode_snapshot(self.pages))
+        with pdfplumber.open(SAMPLE_PDF) as pdf:
+            for page, snapshot_page in list(zip(pdf.pages, replayed))[:3]:
+                kwargs = dict(x_tolerance=3, y_tolerance=3, layout=True, keep_blank_chars=False)
+                self.assertEqual(snapshot_page.extract_text(**kwargs), page.extract_text(**kwargs))
+                self.assertEqual([w['text'] for w in snapshot_page.extract_words()], [w['text'] for w in page.extract_words()])
+                bbox = (0, 0, page.width / 2, page.height)
+                self.assertEqual(snapshot_page.crop(bbox).extract_text(), page.crop(bbox).extract_text())
+
+    def test_cache_is_reused_and_keyed_by_parameters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _, cached = load_snapshot(SAMPLE_PDF, tmp)
+            self.assertFalse(cached)
+            with patch('layout_snapshot.take_snapshot', side_effect=AssertionError("PDF interpreted")):
+                pages, cached = load_snapshot(SAMPLE_PDF, tmp)
+            self.assertTrue(cached)
+            self.assertEqual(len(pages), len(self.pages))
+            self.assertNotEqual(snapshot_path(tmp, SAMPLE_PDF), snapshot_path(tmp, SAMPLE_PDF, {'x_tolerance': 1}))
+            current = snapshot_path(tmp, SAMPLE_PDF)
+            with patch.object(layout_snapshot, 'FORMAT_VERSION', layout_snapshot.FORMAT_VERSION + 1):
+                self.assertNotEqual(snapshot_path(tmp, SAMPLE_PDF), current)
+            # A corrupt entry is rebuilt rather than failing.
+            with open(snapshot_path(tmp, SAMPLE_PDF), 'wb') as f:
+                f.write(b'PDFLAYOUT1\ngarbage')
+            _, cached = load_snapshot(SAMPLE_PDF, tmp)
+            self.assertFalse(cached)
+
+    def test_extract_fields_only_replays_the_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp, patch('builtins.print'):
+            live = extract_text_from_pdf(SAMPLE_PDF)
+            first = extract_text_from_pdf(SAMPLE_PDF, snapshot_cache=tmp)
+            with patch('pdfplumber.open', side_effect=AssertionError("PDF opened")):
+                replayed = extract_text_from_pdf(SAMPLE_PDF, snapshot_cache=tmp)
+            self.assertEqual(first, live)
+            self.assertEqual(replayed, live)
+            self.assertEqual(extract_fields(replayed, 'all'), extract_fields(live, 'all'))
+
+if __name__ == '__main__':
+    unittest.main()
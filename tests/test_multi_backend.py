@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import multi_backend
+from multi_backend import validate_rows, extract_with_fallback, parse_backend_list
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+def rows_for(*sections, fields=3):
+    return [{'Section': s, 'Field Name': f'F{i}', 'Field Description': 'd'} for s in sections for i in range(fields)]
+
+class TestValidateRows(unittest.TestCase):
+    def test_no_text(self):
+        self.assertEqual(validate_rows(None)[0], False)
+
+    def test_no_sections(self):
+        is_valid, sections, reason = validate_rows([])
+        self.assertFalse(is_valid)
+        self.assertEqual(sections, 0)
+
+    def test_too_few_fields_per_section(self):
+        self.assertFalse(validate_rows(rows_for('A', 'B', fields=1))[0])
+
+    def test_valid(self):
+        self.assertEqual(validate_rows(rows_for('A', 'B')), (True, 2, 'ok'))
+
+
+class TestExtractWithFallback(unittest.TestCase):
+    def test_first_valid_backend_wins_and_later_ones_are_not_run(self):
+        calls = []
+        def fake(name, rows):
+            def run(pdf_path):
+                calls.append(name)
+                return rows
+            return run
+        backends = {'a': fake('a', []), 'b': fake('b', rows_for('S')), 'c': fake('c', rows_for('T'))}
+        with patch.dict(multi_backend.BACKENDS, backends):
+            result = extract_with_fallback('doc.pdf', ('a', 'b', 'c'))
+        self.assertEqual(result['backend'], 'b')
+        self.assertEqual(calls, ['a', 'b'])
+        self.assertEqual([a['status'] for a in result['attempts']], ['rejected', 'accepted'])
+
+    def test_exception_is_recorded_and_falls_back(self):
+        def broken(pdf_path):
+            raise RuntimeError("boom")
+        with patch.dict(multi_backend.BACKENDS, {'a': broken, 'b': lambda p: rows_for('S')}):
+            result = extract_with_fallback('doc.pdf', ('a', 'b'))
+        self.assertEqual(result['backend'], 'b')
+        self.assertEqual(result['attempts'][0]['status'], 'failed')
+        self.assertEqual(result['attempts'][0]['reason'], 'boom')
+
+    def test_no_valid_backend_returns_largest_result(self):
+        with patch.dict(multi_backend.BACKENDS, {'a': lambda p: rows_for('S', fields=1), 'b': lambda p: None}):
+            result = extract_with_fallback('doc.pdf', ('a', 'b'))
+        self.assertIsNone(result['backend'])
+        self.assertEqual(len(result['rows']), 1)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            extract_with_fallback('doc.pdf', ('nope',))
+
+    def test_concurrent_mode_returns_a_valid_result(self):
+        result = extract_with_fallback(SAMPLE_PDF, ('pypdf2', 'pdfplumber'), concurrent=True)
+        self.assertIn(result['backend'], ('pypdf2', 'pdfplumber'))
+        self.assertGreater(len(result['rows']), 0)
+        self.assertEqual(len(result['attempts']), 2)
+
+
+class TestParseBackendList(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_backend_list('pdfminer, pypdf2,'), ('pdfminer', 'pypdf2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from page_headers import find_running_lines, strip_running_lines
+from synthetic_guides import generate_guide, write_guide_pdf
+from pdf_parser import parse_fields_from_text, ExtractionContext
+from batch_parser import process_document
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+def _page(n, body, header="ACME Data Guide", footer="Page {n}"):
+    return f"{header}\n\n{body}\n\n{footer.format(n=n)}\n\n"
+
+class TestRunningLines(unittest.TestCase):
+    def test_headers_and_page_numbers_are_blanked(self):
+        pages = [_page(n, f"FIELD_{'ABCDE'[n - 1]}  Description of field {n}.") for n in range(1, 6)]
+        cleaned, report = strip_running_lines(pages)
+        self.assertEqual(report['lines_removed'], 10)
+        self.assertEqual({e['text'] for e in report['running_lines']}, {'ACME Data Guide', 'Page #'})
+        self.assertNotIn('ACME', ''.join(cleaned))
+        self.assertIn('FIELD_C  Description of field 3.', cleaned[2])
+        # Lines are blanked, not deleted, so line numbers still match the extracted text.
+        self.assertEqual([p.count('\n') for p in cleaned], [p.count('\n') for p in pages])
+
+    def test_table_lines_and_repeated_values_are_kept(self):
+        pages = [_page(n, f"ACCESSIONNUMBER  Description {n}.\nALPHANUMERIC", header="Field Name", footer="20") for n in range(1, 6)]
+        self.assertEqual(find_running_lines(pages), {})
+        # Too few pages for a running line.
+        self.assertEqual(find_running_lines([_page(n, "Body.") for n in range(1, 3)]), {})
+
+    def test_synthetic_guide_descriptions_survive_page_breaks(self):
+        lines, expected = generate_guide(sections=3, fields_per_section=40, seed=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, 'guide.pdf')
+            write_guide_pdf(lines, pdf_path, lines_per_page=40, header="Synthetic Data Guide", footer="Page {page}")
+            with open(pdf_path, 'rb') as in_file:
+                page_texts = ExtractionContext().extract_pages(in_file)
+            with patch('builtins.print'):
+                record = process_document(pdf_path, os.path.join(tmp, 'guide.csv'), strip_headers=True)
+        cleaned, report = strip_running_lines(page_texts)
+        self.assertEqual(report['lines_removed'], 2 * len(page_texts))
+        with patch('builtins.print'):
+            self.assertNotEqual(parse_fields_from_text(''.join(page_texts)), expected)
+            self.assertEqual(parse_fields_from_text(''.join(cleaned)), expected)
+        self.assertEqual(record['running_lines_removed'], 2 * len(page_texts))
+        self.assertEqual(record['fields'], len(expected))
+
+    def test_guide_without_running_lines_is_unchanged(self):
+        with open(SAMPLE_PDF, 'rb') as in_file:
+            page_texts = ExtractionContext().extract_pages(in_file)
+        cleaned, report = strip_running_lines(page_texts)
+        self.assertEqual(report['lines_removed'], 0)
+        self.assertEqual(cleaned, page_texts)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from page_isolation import PageSandbox, extract_pages_isolated
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+def _page_numbers_by_id(pdf_path):
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    with open(pdf_path, 'rb') as in_file:
+        doc = PDFDocument(PDFParser(in_file))
+        return {page.pageid: number for number, page in enumerate(PDFPage.create_pages(doc), 1)}
+
+PAGE_NUMBERS = _page_numbers_by_id(SAMPLE_PDF)
+
+def _misbehaving_extract_page(self, page):
+    """Page 2 hangs, page 3 raises, page 4 allocates ~400 MB; the rest extract normally."""
+    number = PAGE_NUMBERS[page.pageid]
+    if number == 2:
+        time.sleep(30)
+    if number == 3:
+        raise ValueError("bad\noperator")
+    if number == 4:
+        hog = bytearray(400 * 1024 * 1024)
+        time.sleep(30)
+    return f"page {number}"
+
+class TestExtractPagesIsolated(unittest.TestCase):
+    def test_bad_pages_become_placeholders_and_the_rest_continue(self):
+        # The sandbox child is forked after the patch, so it inherits the fake extractor.
+        with patch('page_isolation.ExtractionContext.extract_page', _misbehaving_extract_page):
+            with PageSandbox(page_timeout=2, rss_limit_mb=300, poll_interval=0.01) as sandbox:
+                page_texts, failures = extract_pages_isolated(SAMPLE_PDF, sandbox)
+                restarts = sandbox.restarts
+
+        self.assertEqual(len(page_texts), 9)
+        self.assertEqual(page_texts[0], "page 1")
+        self.assertEqual(page_texts[1], "[PAGE_TIMEOUT:2]\n")
+        self.assertEqual(page_texts[2], "[ERROR_EXTRACTING_PAGE:3:bad operator]\n")
+        self.assertEqual(page_texts[3], "[PAGE_MEMORY_LIMIT:4]\n")
+        self.assertEqual(page_texts[4:], [f"page {n}" for n in range(5, 10)])
+        self.assertEqual([(f['page'], f['reason']) for f in failures], [(2, 'timeout'), (3, 'error'), (4, 'memory')])
+        self.assertEqual(restarts, 2)
+
+    def test_opening_is_not_bound_by_the_page_timeout(self):
+        from pdf_parser import ExtractionContext
+        open_document = ExtractionContext.open_document
+        def slow_open_document(self, in_file):
+            time.sleep(1)
+            return open_document(self, in_file)
+        def hanging_page_2(self, page):
+            if PAGE_NUMBERS[page.pageid] == 2:
+                time.sleep(30)
+            return f"page {PAGE_NUMBERS[page.pageid]}"
+        # Both the first open and the reopen after page 2 times out take longer than a page may.
+        with patch('page_isolation.ExtractionContext.open_document', slow_open_document), \
+             patch('page_isolation.ExtractionContext.extract_page', hanging_page_2):
+            with PageSandbox(page_timeout=0.5, poll_interval=0.01) as sandbox:
+                page_texts, failures = extract_pages_isolated(SAMPLE_PDF, sandbox)
+                restarts = sandbox.restarts
+        self.assertEqual(page_texts[1], "[PAGE_TIMEOUT:2]\n")
+        self.assertEqual(page_texts[2:], [f"page {n}" for n in range(3, 10)])
+        self.assertEqual([(f['page'], f['reason']) for f in failures], [(2, 'timeout')])
+        self.assertEqual(restarts, 1)
+        with patch('page_isolation.ExtractionContext.open_document', slow_open_document):
+            with PageSandbox(page_timeout=5, open_timeout=0.2, poll_interval=0.01) as sandbox:
+                with self.assertRaises(RuntimeError):
+                    sandbox.open(SAMPLE_PDF)
+
+    def test_matches_in_process_extraction_without_limits_hit(self):
+        from pdf_parser import extract_text_from_pdf
+        with PageSandbox(page_timeout=60) as sandbox:
+            page_texts, failures = extract_pages_isolated(SAMPLE_PDF, sandbox)
+        self.assertEqual(failures, [])
+        self.assertEqual(''.join(page_texts), extract_text_from_pdf(SAMPLE_PDF))
+
+    def test_missing_file_raises(self):
+        with PageSandbox(page_timeout=5) as sandbox:
+            with self.assertRaises(RuntimeError):
+                extract_pages_isolated('does_not_exist.pdf', sandbox)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pdfminer.pdftypes import PDFStream
+
+from page_router import extract_pages_routed, route_summary, choose_route, score_page
+from synthetic_guides import generate_guide, write_guide_pdf
+from pdf_parser import parse_fields_from_text, ExtractionContext
+from field_record import page_line_starts
+from multi_backend import run_backend
+
+PDF_DIR = os.path.join(os.path.dirname(__file__), '..', 'pdfs')
+SAMPLE_PDF = os.path.join(PDF_DIR, 'Form_D_pages_1-9.pdf')
+ENCRYPTED_PDF = os.path.join(PDF_DIR, 'Mutual.Fund.Risk&Return.MFRR.pdf')
+
+class FakePage:
+    def __init__(self, data):
+        self.contents = [PDFStream({}, data)]
+
+def _prose_line(y, x=54, text="This line of ordinary prose is long enough to fill most of the page width here."):
+    return f"1 0 0 1 {x} {y} Tm ({text}) Tj".encode()
+
+class TestPageRouter(unittest.TestCase):
+    def test_choose_route(self):
+        plain = {'chars': 900, 'rules': 2, 'lines': 40, 'columns': 1, 'header': False, 'caption': False}
+        self.assertEqual(choose_route(plain), 'pypdf2')
+        self.assertEqual(choose_route(dict(plain, columns=2)), 'pdfminer')
+        self.assertEqual(choose_route(dict(plain, columns=2), max_columns=2), 'pypdf2')
+        self.assertEqual(choose_route(dict(plain, header=True)), 'pdfminer')
+        self.assertEqual(choose_route(dict(plain, caption=True)), 'pdfminer')
+        self.assertEqual(choose_route(dict(plain, rules=300)), 'pdfminer')
+        self.assertEqual(choose_route(dict(plain, chars=40)), 'pdfminer')
+
+    def test_indents_and_bullets_are_not_columns(self):
+        lines = [_prose_line(700 - 12 * n, x=54 if n % 3 else 72) for n in range(30)]
+        # A bullet and its text, and a word in another font continuing the same line.
+        lines += [b"1 0 0 10 54 300 Tm (\x95) Tj 1 0 0 10 72 300 Tm (Bullet item text) Tj",
+                  b"1 0 0 10 54 288 Tm (Some words in one font and ) Tj (more in another.) Tj"]
+        score = score_page(FakePage(b"BT /F1 1 Tf " + b"\n".join(lines) + b" ET"))
+        self.assertEqual(score['columns'], 1)
+        self.assertEqual(choose_route(score), 'pypdf2')
+        two_columns = [_prose_line(700 - 12 * n, text="Left column text.") + b" " +
+                       _prose_line(700 - 12 * n, x=320, text="Right column text that is long.") for n in range(30)]
+        score = score_page(FakePage(b"BT /F1 9 Tf " + b"\n".join(two_columns) + b" ET"))
+        self.assertEqual(score['columns'], 2)
+        self.assertEqual(choose_route(score), 'pdfminer')
+
+    def test_simple_pages_go_to_pypdf2_and_parse_the_same(self):
+        lines, expected = generate_guide(sections=3, fields_per_section=40, seed=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, 'guide.pdf')
+            pages = write_guide_pdf(lines, pdf_path, lines_per_page=40)
+            page_texts, routes = extract_pages_routed(pdf_path)
+        summary = route_summary(routes)
+        self.assertEqual(len(page_texts), pages)
+        self.assertGreater(summary['pypdf2']['pages'], 0)
+        self.assertGreater(summary['pdfminer']['pages'], 0)
+        self.assertEqual(summary['pypdf2']['pages'] + summary['pdfminer']['pages'], pages)
+        self.assertEqual(parse_fields_from_text(''.join(page_texts)), expected)
+
+    def test_prose_pages_go_to_pypdf2_and_table_pages_are_unchanged(self):
+        page_texts, routes = extract_pages_routed(SAMPLE_PDF)
+        with open(SAMPLE_PDF, 'rb') as in_file:
+            baseline = ExtractionContext().extract_pages(in_file)
+        self.assertEqual([entry['route'] for entry in routes], ['pdfminer', 'pypdf2'] + ['pdfminer'] * 7)
+        table_pages = {entry['page'] for entry in routes if entry['score']['header']}
+        self.assertEqual(table_pages, set(range(3, 10)))
+        for page in table_pages:
+            self.assertEqual(page_texts[page - 1], baseline[page - 1])
+        with patch('builtins.print'):
+            routed = parse_fields_from_text(''.join(page_texts), page_line_starts=page_line_starts(page_texts))
+            plain = parse_fields_from_text(''.join(baseline), page_line_starts=page_line_starts(baseline))
+        rows = lambda parsed: [(r.section, r.name, r.description, r.page) for r in parsed if r.page in table_pages]
+        self.assertEqual(rows(routed), rows(plain))
+        self.assertEqual(len(rows(plain)), 111)
+
+    def test_unreadable_for_pypdf2_falls_back_to_pdfminer(self):
+        with patch('PyPDF2.PdfReader', side_effect=ValueError("cannot decrypt")) as reader:
+            page_texts, routes = extract_pages_routed(ENCRYPTED_PDF)
+        with open(ENCRYPTED_PDF, 'rb') as in_file:
+            baseline = ExtractionContext().extract_pages(in_file)
+        self.assertTrue(all(entry['route'] == 'pdfminer' for entry in routes))
+        self.assertEqual(page_texts, baseline)
+        # PyPDF2 is only opened once, when the first simple page is found.
+        self.assertEqual(reader.call_count, 1)
+
+    def test_failing_page_falls_back_to_pdfminer(self):
+        with patch('page_router.score_page', side_effect=KeyError('/Font')):
+            page_texts, routes = extract_pages_routed(SAMPLE_PDF)
+        self.assertEqual(len(routes), 9)
+        self.assertTrue(all(entry['route'] == 'pdfminer' for entry in routes))
+
+    def test_routed_backend(self):
+        rows, attempt = run_backend('routed', SAMPLE_PDF)
+        self.assertNotIn('error', attempt)
+        self.assertGreater(len(rows), 0)
+
+if __name__ == '__main__':
+    unittest.main()
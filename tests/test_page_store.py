@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+
+from pdf_parser import ExtractionContext, page_fingerprint
+from page_store import PageStore
+from batch_parser import run_batch
+
+PDF_DIR = os.path.join(os.path.dirname(__file__), '..', 'pdfs')
+SAMPLE_PDF = os.path.join(PDF_DIR, 'Form_D_pages_1-9.pdf')
+GUIDE_PDF = os.path.join(PDF_DIR, 'Form_D.SEC.Data.Guide.pdf')
+
+def _fingerprints(pdf_path):
+    with open(pdf_path, 'rb') as in_file:
+        return [page_fingerprint(page) for page in PDFPage.create_pages(PDFDocument(PDFParser(in_file)))]
+
+def _extract(pdf_path, context):
+    with open(pdf_path, 'rb') as in_file:
+        return context.extract_pages(in_file)
+
+class TestPageStore(unittest.TestCase):
+    def test_excerpt_pages_have_the_guides_fingerprints(self):
+        guide = _fingerprints(GUIDE_PDF)
+        self.assertEqual(_fingerprints(SAMPLE_PDF), guide[:9])
+        self.assertEqual(len(set(guide)), len(guide))
+
+    def test_shared_pages_are_extracted_once(self):
+        baseline = _extract(SAMPLE_PDF, ExtractionContext())
+        context = ExtractionContext(page_store=PageStore())
+        _extract(GUIDE_PDF, context)
+        self.assertEqual(context.stats()['page_store_misses'], 19)
+        with patch.object(context.interpreter, 'process_page', side_effect=AssertionError("page interpreted")):
+            pages = _extract(SAMPLE_PDF, context)
+        self.assertEqual(pages, baseline)
+        stats = context.stats()
+        self.assertEqual(stats['page_store_hits'], 9)
+        self.assertGreater(stats['page_store_seconds_saved'], 0)
+
+    def test_directory_store_is_shared_between_contexts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = _extract(SAMPLE_PDF, ExtractionContext(page_store=PageStore(tmp)))
+            self.assertEqual(len(PageStore(tmp)), 9)
+            context = ExtractionContext(page_store=PageStore(tmp))
+            self.assertEqual(_extract(SAMPLE_PDF, context), first)
+            self.assertEqual(context.stats()['page_store_hits'], 9)
+            # A damaged entry is a miss, not an error.
+            store = PageStore(tmp)
+            key = _fingerprints(SAMPLE_PDF)[0]
+            with open(store._file(key), 'wb') as f:
+                f.write(b'\x00')
+            self.assertIsNone(store.get(key))
+
+    def test_batch_report_shows_dedupe_hits_and_time_saved(self):
+        # Worker counters are cumulative, like the font cache's, so compare against the run before.
+        with tempfile.TemporaryDirectory() as output_dir, \
+             patch('batch_parser.get_page_store', return_value=PageStore()):
+            plain = run_batch([GUIDE_PDF, SAMPLE_PDF], output_dir, workers=1)
+            report = run_batch([GUIDE_PDF, SAMPLE_PDF], output_dir, workers=1, dedupe_pages=True)
+        before, dedup = plain['page_dedup'], report['page_dedup']
+        self.assertEqual((dedup['hits'] - before['hits'], dedup['misses'] - before['misses']), (9, 19))
+        self.assertGreater(dedup['seconds_saved'], before['seconds_saved'])
+        self.assertEqual([d['fields'] for d in report['documents']], [d['fields'] for d in plain['documents']])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import io
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyPDF2 import PdfReader, PdfWriter
+from pdfminer.pdftypes import PDFStream
+from pdfminer.psparser import LIT
+
+from page_triage import page_has_text
+from pdf_parser import ExtractionContext
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class FakePage:
+    def __init__(self, contents, resources=None):
+        self.contents = contents
+        self.resources = resources or {}
+
+class TestPageHasText(unittest.TestCase):
+    def test_text_block_is_detected(self):
+        page = FakePage([PDFStream({}, b'q BT /F1 12 Tf (Hello) Tj ET Q')])
+        self.assertTrue(page_has_text(page))
+
+    def test_image_only_page_has_no_text(self):
+        page = FakePage([PDFStream({}, b'q 612 0 0 792 0 0 cm /Im0 Do Q')])
+        self.assertFalse(page_has_text(page))
+
+    def test_bt_inside_a_name_is_not_a_text_block(self):
+        page = FakePage([PDFStream({}, b'/GS_BTX gs /Im0 Do')])
+        self.assertFalse(page_has_text(page))
+
+    def test_text_inside_form_xobject_is_detected(self):
+        form = PDFStream({'Subtype': LIT('Form')}, b'BT (x) Tj ET')
+        page = FakePage([PDFStream({}, b'/Fm0 Do')], {'XObject': {'Fm0': form}})
+        self.assertTrue(page_has_text(page))
+
+    def test_unknown_page_structure_is_kept(self):
+        self.assertTrue(page_has_text(object()))
+
+
+class TestSkipTextlessPages(unittest.TestCase):
+    def test_blank_page_is_skipped_and_recorded_as_empty(self):
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        writer.add_page(PdfReader(SAMPLE_PDF).pages[0])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        buffer.seek(0)
+
+        context = ExtractionContext()
+        page_texts = context.extract_pages(buffer)
+
+        self.assertEqual(len(page_texts), 2)
+        self.assertEqual(page_texts[0], '')
+        self.assertIn('Form D', page_texts[1])
+        self.assertEqual(context.skipped_pages, [1])
+        self.assertEqual(context.stats()['pages_skipped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pdf_parser
+from pdf_parser import ExtractionContext, parse_fields_from_text
+from parse_cache import ParseCache, cache_key, normalize_text
+from field_record import FieldRecord, page_line_starts
+import pdf_parser_pypdf2
+import extract_fields_only
+from batch_parser import run_batch
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+def _rows(rows):
+    return [(r.section, r.name, r.description, r.page, r.line) for r in rows]
+
+class TestParseCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(SAMPLE_PDF, 'rb') as in_file:
+            cls.pages = ExtractionContext().extract_pages(in_file)
+        cls.text = ''.join(cls.pages)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, 'parse.sqlite'))
+        self.print_patch = patch('builtins.print')
+        self.print_patch.start()
+
+    def tearDown(self):
+        self.print_patch.stop()
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_unchanged_sections_are_not_parsed_again(self):
+        starts = page_line_starts(self.pages)
+        fresh = parse_fields_from_text(self.text, page_line_starts=starts)
+        first = parse_fields_from_text(self.text, page_line_starts=starts, cache=self.cache)
+        with patch('pdf_parser.parse_section', side_effect=AssertionError("section parsed")):
+            cached = parse_fields_from_text(self.text, page_line_starts=starts, cache=self.cache)
+        self.assertEqual(_rows(first), _rows(fresh))
+        self.assertEqual(_rows(cached), _rows(fresh))
+        self.assertEqual(self.cache.hits, self.cache.misses)
+        # Trailing whitespace is normalized away, and a section that moves keeps its hit.
+        moved = "Preface\n\n" + '\n'.join(line + '  ' for line in self.text.split('\n'))
+        hits = self.cache.hits
+        shifted = parse_fields_from_text(moved, cache=self.cache)
+        self.assertEqual(self.cache.hits - hits, self.cache.misses)
+        self.assertEqual([r.line for r in shifted], [r.line + 2 for r in fresh])
+
+    def test_crlf_text_parses_like_lf_text(self):
+        crlf = self.text.replace('\n', '\r\n')
+        self.assertEqual(cache_key('p', 1, '', crlf), cache_key('p', 1, '', self.text))
+        self.assertEqual(_rows(parse_fields_from_text(crlf)), _rows(parse_fields_from_text(self.text)))
+        self.assertNotEqual(_rows(parse_fields_from_text(self.text.replace('\n', '\r'))),
+                            _rows(parse_fields_from_text(self.text)))
+
+    def test_parser_version_and_rules_change_the_key(self):
+        parse_fields_from_text(self.text, cache=self.cache)
+        misses = self.cache.misses
+        with patch.object(pdf_parser, 'PARSER_VERSION', pdf_parser.PARSER_VERSION + 1):
+            parse_fields_from_text(self.text, cache=self.cache)
+        self.assertEqual(self.cache.misses, 2 * misses)
+        parse_fields_from_text(self.text, columns='all', cache=self.cache)
+        self.assertEqual(self.cache.misses, 3 * misses)
+        stale = self.cache.invalidate(current_versions={'pdf_parser.parse_section': pdf_parser.PARSER_VERSION})
+        self.assertEqual(stale, misses)
+        self.assertEqual(self.cache.invalidate('pdf_parser.parse_section'), 2 * misses)
+
+    def test_eviction_keeps_the_cache_bounded(self):
+        rows = [FieldRecord('S', f'FIELD{n}', 'x' * 200, line=n) for n in range(20)]
+        self.cache.max_bytes = 600
+        for n in range(10):
+            self.cache.put(f'key{n}', 'test', 1, rows[:n + 1])
+        stored = self.cache.stats()['parsers']['test v1']
+        self.assertLessEqual(stored['bytes'], 600)
+        self.assertIsNotNone(self.cache.get('key9'))
+        self.assertIsNone(self.cache.get('key0'))
+
+    def test_normalization(self):
+        self.assertEqual(normalize_text("a  \r\nb\t\nc"), "a\nb\nc")
+        # The parsers do not end lines at a lone '\r', so it must not share a key with '\n'.
+        self.assertEqual(normalize_text("a\rb"), "a\rb")
+        self.assertNotEqual(cache_key('p', 1, '', "a\rb"), cache_key('p', 1, '', "a\nb"))
+        self.assertEqual(normalize_text("a  \nb", strip_lines=False), "a  \nb")
+        self.assertNotEqual(cache_key('p', 1, '', "a"), cache_key('p', 2, '', "a"))
+
+    def test_other_parsers(self):
+        fresh = pdf_parser_pypdf2.parse_fields_from_text(self.text)
+        self.assertEqual(pdf_parser_pypdf2.parse_fields_from_text(self.text, cache=self.cache), fresh)
+        self.assertEqual(pdf_parser_pypdf2.parse_fields_from_text(self.text, cache=self.cache), fresh)
+        fresh = extract_fields_only.extract_fields(self.text, 'all')
+        self.assertEqual(extract_fields_only.extract_fields(self.text, 'all', self.cache), fresh)
+        cached = extract_fields_only.extract_fields(self.text, 'all', self.cache)
+        self.assertEqual([(r.field_type, r.max_size, r.nullable, r.key) for r in cached],
+                         [(r.field_type, r.max_size, r.nullable, r.key) for r in fresh])
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_batch_reports_cache_hits(self):
+        cache_path = os.path.join(self.tmp.name, 'batch.sqlite')
+        first = run_batch([SAMPLE_PDF], self.tmp.name, workers=1, parse_cache=cache_path)
+        second = run_batch([SAMPLE_PDF], self.tmp.name, workers=1, parse_cache=cache_path)
+        self.assertEqual(first['parse_cache']['hits'], 0)
+        self.assertEqual(second['parse_cache']['misses'], 0)
+        self.assertEqual(second['parse_cache']['hits'], first['parse_cache']['misses'])
+        self.assertEqual(second['documents'][0]['fields'], first['documents'][0]['fields'])
+
+if __name__ == '__main__':
+    unittest.main()
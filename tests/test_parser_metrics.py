@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import io
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from parser_metrics import ParseMetrics, to_prometheus
+from pdf_parser import parse_fields_from_text, parse_fields_from_text_parallel, parse_section
+
+SAMPLE_TEXT = """
+Figure 1. Fields in the FIRST data file
+Field Name Field Description
+note: see the appendix.
+FIELD_A    Description A.
+VARCHAR
+continued words here
+
+Figure 2. Fields in the SECOND data file
+Field Name Field Description
+FIELD_B    Description B. VARCHAR
+"""
+
+class TestParseMetrics(unittest.TestCase):
+    def parse(self, text, **kwargs):
+        with patch('sys.stdout', new_callable=io.StringIO):
+            return parse_fields_from_text(text, **kwargs)
+
+    def test_metrics_do_not_change_output(self):
+        self.assertEqual(self.parse(SAMPLE_TEXT), self.parse(SAMPLE_TEXT, metrics=ParseMetrics()))
+
+    def test_branch_counters_per_section(self):
+        metrics = ParseMetrics()
+        rows = self.parse(SAMPLE_TEXT, metrics=metrics)
+        summary = metrics.summary()
+        first = summary['sections']['FIRST']
+        self.assertEqual(first['lines'], 4)
+        self.assertEqual(first['branch_hits'], {'ScenarioB': 1, 'ScenarioC': 1, 'StrictKeywordStart': 1, 'ScenarioD': 2})
+        # The keyword line is claimed by Scenario C, so only the lines before and after it are orphans.
+        self.assertEqual(first['orphan_lines'], 2)
+        self.assertEqual(summary['sections']['SECOND']['fields'], 1)
+        self.assertEqual(summary['document']['fields'], len(rows))
+        self.assertEqual(summary['document']['lines'], 5)
+        self.assertEqual(set(first['branch_seconds']), {'ScenarioB', 'ScenarioC', 'ScenarioD'})
+
+    def test_repeated_section_names_are_aggregated(self):
+        metrics = ParseMetrics()
+        with patch('sys.stdout', new_callable=io.StringIO):
+            parse_section('SAME', "FIELD_A Description A.\n", metrics)
+            parse_section('SAME', "FIELD_B Description B.\n", metrics)
+        self.assertEqual(metrics.summary()['sections']['SAME']['fields'], 2)
+
+    def test_parallel_merges_worker_counters(self):
+        serial, parallel = ParseMetrics(), ParseMetrics()
+        self.parse(SAMPLE_TEXT, metrics=serial)
+        with patch('sys.stdout', new_callable=io.StringIO):
+            parse_fields_from_text_parallel(SAMPLE_TEXT, workers=2, min_sections=1, metrics=parallel)
+        for name in ('FIRST', 'SECOND'):
+            self.assertEqual(serial.summary()['sections'][name]['branch_hits'],
+                             parallel.summary()['sections'][name]['branch_hits'])
+
+    def test_prometheus_output(self):
+        metrics = ParseMetrics()
+        self.parse(SAMPLE_TEXT, metrics=metrics)
+        output = to_prometheus({'doc "1".pdf': metrics.summary()})
+        self.assertIn('# TYPE pdf_parser_branch_hits_total counter', output)
+        self.assertIn('pdf_parser_branch_hits_total{branch="ScenarioB",document="doc \\"1\\".pdf",section="FIRST"} 1', output)
+        self.assertIn('pdf_parser_document_orphan_lines_total{document="doc \\"1\\".pdf"} 2', output)
+        self.assertTrue(output.endswith('\n'))
+
+if __name__ == '__main__':
+    unittest.main()
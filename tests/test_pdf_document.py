@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import patch
+import contextlib
+import tempfile
+import shutil
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pdf_parser
+import extract_fields_only
+import multi_backend
+import pdf_document
+from pdf_document import SharedDocument, DecodedStreamCache, get_shared_document, release_shared_document
+
+PDF_DIR = os.path.join(os.path.dirname(__file__), '..', 'pdfs')
+SAMPLE_PDF = os.path.join(PDF_DIR, 'Form_D_pages_1-9.pdf')
+ENCRYPTED_PDF = os.path.join(PDF_DIR, 'Mutual.Fund.Risk&Return.MFRR.pdf')
+
+def _extract_both(pdf_path, document=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return (pdf_parser.extract_text_from_pdf(pdf_path, document=document),
+                extract_fields_only.extract_text_from_pdf(pdf_path, document=document))
+
+class TestSharedDocument(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.separate = {path: _extract_both(path) for path in (SAMPLE_PDF, ENCRYPTED_PDF)}
+
+    def test_both_backends_use_one_parsed_document(self):
+        with SharedDocument(SAMPLE_PDF, DecodedStreamCache()) as document, \
+             patch('pdf_parser.PDFDocument', side_effect=AssertionError("parsed again")), \
+             patch('pdfplumber.open', side_effect=AssertionError("parsed again")):
+            texts = _extract_both(SAMPLE_PDF, document)
+            stats = document.stream_cache.stats()
+        self.assertEqual(texts, self.separate[SAMPLE_PDF])
+        # The pdfplumber pass reuses what the pdfminer pass decoded.
+        self.assertGreater(stats['hits'], 0)
+        self.assertEqual(stats['evictions'], 0)
+
+    def test_decoded_streams_stay_within_the_bound(self):
+        for pdf_path in (SAMPLE_PDF, ENCRYPTED_PDF):
+            cache = DecodedStreamCache(max_bytes=20000)
+            with SharedDocument(pdf_path, cache) as document:
+                self.assertEqual(_extract_both(pdf_path, document), self.separate[pdf_path])
+                self.assertGreater(cache.evictions, 0)
+                self.assertTrue(cache.bytes <= cache.max_bytes or cache.stats()['streams'] == 1)
+            self.assertEqual((cache.bytes, cache.stats()['streams']), (0, 0))
+
+    def test_process_handle_is_reused_until_the_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = shutil.copy(SAMPLE_PDF, os.path.join(tmp, 'doc.pdf'))
+            first = get_shared_document(pdf_path)
+            self.assertIs(get_shared_document(pdf_path), first)
+            os.utime(pdf_path, ns=(0, 0))
+            second = get_shared_document(pdf_path)
+            self.assertIsNot(second, first)
+            self.assertTrue(first._file.closed)
+            release_shared_document(pdf_path)
+            self.assertTrue(second._file.closed)
+
+    def test_fallback_parses_the_pdf_once(self):
+        with patch.object(pdf_document, 'SharedDocument', wraps=SharedDocument) as opened, \
+             patch('pdf_parser.parse_fields_from_text', return_value=[]):
+            result = multi_backend.extract_with_fallback(SAMPLE_PDF, ('pdfminer', 'pdfplumber'))
+        self.assertEqual(result['backend'], 'pdfplumber')
+        self.assertEqual([a['status'] for a in result['attempts']], ['rejected', 'accepted'])
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(pdf_document._shared_documents, {})
+
+if __name__ == '__main__':
+    unittest.main()
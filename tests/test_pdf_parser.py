@@ -14,6 +14,10 @@ from pdf_parser import (
     extract_text_from_pdf,
     parse_fields_from_text,
     write_to_csv,
+    ExtractionContext,
+    CachingResourceManager,
+    find_section_bounds,
+    parse_fields_from_text_parallel,
     PDFSyntaxError, # Make sure to import this if you're testing for it specifically
     PSError         # And this one too
 )
@@ -154,6 +158,42 @@ class TestExtractTextFromPdf(unittest.TestCase):
         mock_print.assert_called_with("An unexpected error occurred while processing PDF 'generic_error.pdf': Generic error")
 
 
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestExtractionContext(unittest.TestCase):
+    def test_shared_context_reuses_fonts_across_documents(self):
+        fresh_text = extract_text_from_pdf(SAMPLE_PDF)
+        context = ExtractionContext()
+        self.assertIsInstance(context.rsrcmgr, CachingResourceManager)
+        for _ in range(2):
+            with open(SAMPLE_PDF, 'rb') as in_file:
+                page_texts = context.extract_pages(in_file)
+            self.assertEqual(len(page_texts), 9)
+            self.assertEqual(''.join(page_texts), fresh_text)
+        stats = context.stats()
+        self.assertEqual(stats['documents'], 2)
+        self.assertEqual(stats['pages'], 18)
+        # Every font of the second document is served from the cross-document cache.
+        self.assertGreater(stats['font_cache_shared_hits'], 0)
+        self.assertEqual(extract_text_from_pdf(SAMPLE_PDF, context=context), fresh_text)
+
+    def test_deeply_nested_font_specs_do_not_share_a_key(self):
+        def nested(depth, leaf):
+            spec = leaf
+            for _ in range(depth):
+                spec = {'Next': spec}
+            return {'Subtype': 'Type0', 'DescendantFonts': spec}
+        manager = CachingResourceManager()
+        manager.begin_document()
+        with patch('pdf_parser.PDFResourceManager.get_font', side_effect=lambda objid, spec: object()):
+            # Fonts that differ only below the old depth limit of 8 are told apart.
+            self.assertIsNot(manager.get_font(None, nested(12, 'A')), manager.get_font(None, nested(12, 'B')))
+            self.assertIs(manager.get_font(None, nested(12, 'A')), manager.get_font(None, nested(12, 'A')))
+            # A spec nested past the fingerprint's depth is never served from the shared cache.
+            self.assertIsNot(manager.get_font(None, nested(70, 'A')), manager.get_font(None, nested(70, 'A')))
+        self.assertEqual(manager.font_cache_shared_hits, 2)
+
+
 class TestParseFieldsFromText(unittest.TestCase):
     def test_empty_text(self):
         self.assertEqual(parse_fields_from_text(""), [])
@@ -394,6 +434,136 @@ FIELD_REGULAR Regular description.
         ]
         self.assertEqual(parse_fields_from_text(text), expected)
 
+class TestSectionBounds(unittest.TestCase):
+    def test_section_ends_at_next_figure_line(self):
+        text = (
+            "Figure 1. Fields in the FIRST data file\nbody one\n\n  Figure 2. Data relationships\nignored\n"
+            "Figure 3. Fields in the SECOND data set\nbody two\n"
+        )
+        bounds = find_section_bounds(text)
+        self.assertEqual([b[0] for b in bounds], ['FIRST', 'SECOND'])
+        self.assertEqual(text[bounds[0][1]:bounds[0][2]], "\nbody one\n")
+        self.assertEqual(text[bounds[1][1]:bounds[1][2]], "\nbody two\n")
+
+    def test_section_ends_at_next_caption_when_caption_is_mid_line(self):
+        text = "Figure 1. Fields in the FIRST data file\nbody one see Figure 2. Fields in the SECOND data file\nbody two"
+        bounds = find_section_bounds(text)
+        self.assertEqual(text[bounds[0][1]:bounds[0][2]], "\nbody one see ")
+
+
+class TestParseFieldsFromTextParallel(unittest.TestCase):
+    def test_matches_serial_parser(self):
+        sections = []
+        for n in range(12):
+            sections.append(
+                f"Figure {n + 1}. Fields in the SECTION_{n} data file\n"
+                "Field Name Field Description Format\n"
+                f"FIELD_A{n}  First field of section {n}. ALPHANUMERIC\n"
+                f"FIELD_B{n}  Second field that\n   wraps onto a second line.\n   NUMERIC\n"
+            )
+        text = "Intro text.\n" + "\n".join(sections)
+        with patch('builtins.print'):
+            serial = parse_fields_from_text(text)
+            parallel = parse_fields_from_text_parallel(text, workers=2, min_sections=1)
+        self.assertEqual(len(serial), 24)
+        self.assertEqual(parallel, serial)
+
+    def test_few_sections_use_serial_path(self):
+        with patch('builtins.print'), patch('pdf_parser.ProcessPoolExecutor') as MockPool:
+            result = parse_fields_from_text_parallel("Figure 1. Fields in the S data file\nField Name Field Description\nFIELD_X  Desc.\n")
+        MockPool.assert_not_called()
+        self.assertEqual(result, [{'Section': 'S', 'Field Name': 'FIELD_X', 'Field Description': 'Desc.'}])
+
+
+class TestAllColumns(unittest.TestCase):
+    LAYOUT_TEXT = (
+        "Figure 1. Fields in the FORMDSUBMISSION data file\n"
+        "                                   Max  May be\n"
+        "   Field Name     Field Description      Format    Size  NULL  Key\n"
+        "ACCESSIONNUMBER  The 20-character string formed ALPHANUMERIC 20 No  *\n"
+        "                 from the 18-digit number assigned (nnnnnnnnnn-nn-\n"
+        "                 by the Commission. nnnnnn)\n"
+        "FILING_DATE      Date filed with the Commission. DATE (DD-MMM-YY) 8 Yes\n"
+    )
+
+    def test_one_pass_matches_generated_rows(self):
+        from synthetic_guides import generate_guide, WRAP_PATTERNS
+        for wrap in WRAP_PATTERNS:
+            lines, expected = generate_guide(sections=2, fields_per_section=30, wrap=wrap, seed=5, columns='all')
+            with patch('builtins.print'):
+                basic = parse_fields_from_text("\n".join(lines))
+                rows = parse_fields_from_text("\n".join(lines), columns='all')
+            self.assertEqual(rows, expected, wrap)
+            # Same rows and descriptions as the basic parse.
+            self.assertEqual([dict(r) for r in basic], [{k: r[k] for k in ('Section', 'Field Name', 'Field Description')} for r in rows])
+
+    def test_column_values_after_the_row_are_not_taken(self):
+        # A type line ends FIELD_A's row and a format split over lines continues it; the
+        # size and nullability that follow are lines of their own, as pdfminer writes other
+        # rows' values, so they are left empty rather than guessed.
+        text = ("Figure 1. Fields in the S data file\nField Name Field Description\n"
+                "FIELD_A  First field.\nALPHANUMERIC\n(nnnn-\nnn)\n20\nYes\n"
+                "FIELD_B  Second field sourced from EDGAR.\n*\n")
+        with patch('builtins.print'):
+            rows = parse_fields_from_text(text, columns='all')
+        self.assertEqual([(r['Field Type'], r['Max Size'], r['May be NULL'], r['Key']) for r in rows],
+                         [('ALPHANUMERIC (nnnn-nn)', '', '', ''), ('', '', '', '')])
+
+    def test_form_d_multi_line_rows(self):
+        import extract_fields_only
+        with patch('builtins.print'):
+            layout_text = extract_fields_only.extract_text_from_pdf(SAMPLE_PDF)
+            with open(SAMPLE_PDF, 'rb') as in_file:
+                pdfminer_text = ''.join(ExtractionContext().extract_pages(in_file))
+            parsed = {'extract_fields': extract_fields_only.extract_fields(layout_text, 'all'),
+                      'layout': parse_fields_from_text(layout_text, columns='all'),
+                      'pdfminer': parse_fields_from_text(pdfminer_text, columns='all')}
+        columns = {how: {(r.section, r.name): (r.field_type, r.max_size, r.nullable, r.key) for r in rows}
+                   for how, rows in parsed.items()}
+        # ACCESSIONNUMBER's format wraps over three lines; SIC_CODE's description wraps over
+        # five; "Response (if" / "Necessary)" wrap in BUSCOMBCLARIFICATIONOFRESP's description.
+        expected = {
+            ('FORMDSUBMISSION', 'ACCESSIONNUMBER'): ('ALPHANUMERIC (nnnnnnnnnn-nn-nnnnnn)', '20', 'No', '*'),
+            ('FORMDSUBMISSION', 'FILING_DATE'): ('DATE (DD-MMM-YY)', '8', 'Yes', ''),
+            ('FORMDSUBMISSION', 'SIC_CODE'): ('ALPHANUMERIC', '4', 'Yes', ''),
+            ('FORMDSUBMISSION', 'SUBMISSIONTYPE'): ('ALPHANUMERIC', '255', 'No', ''),
+            ('OFFERING', 'BUSCOMBCLARIFICATIONOFRESP'): ('ALPHANUMERIC', '255', 'Yes', ''),
+        }
+        for how in ('extract_fields', 'layout'):
+            self.assertEqual({key: columns[how][key] for key in expected}, expected, how)
+        # pdfminer writes the names, descriptions and values as separate blocks: SIC_CODE no
+        # longer takes ACCESSIONNUMBER's values, and only the type next to a field is read.
+        self.assertEqual(columns['pdfminer'][('FORMDSUBMISSION', 'SIC_CODE')], ('', '', '', ''))
+        self.assertEqual(columns['pdfminer'][('FORMDSUBMISSION', 'SUBMISSIONTYPE')], ('ALPHANUMERIC', '', '', ''))
+
+    def test_parallel_and_csv(self):
+        text = "".join(f"Figure {n + 1}. Fields in the S{n} data file\nField Name Field Description\n"
+                       f"FIELD_{n}  Field {n}. NUMERIC 10 No *\n" for n in range(3))
+        with patch('builtins.print'):
+            serial = parse_fields_from_text(text, columns='all')
+            parallel = parse_fields_from_text_parallel(text, workers=2, min_sections=1, columns='all')
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial[0]['Field Type'], 'NUMERIC')
+        with self.assertRaises(ValueError):
+            parse_fields_from_text_parallel(text, workers=2, min_sections=1, shared_memory=True, columns='all')
+        with self.assertRaises(ValueError):
+            parse_fields_from_text(text, columns='some')
+        with patch('builtins.open', mock_open()), patch('pdf_parser.csv.DictWriter') as MockDictWriter:
+            write_to_csv(serial, 'out.csv')
+        self.assertEqual(MockDictWriter.call_args.kwargs['fieldnames'],
+                         ['Section', 'Field Name', 'Field Description', 'Field Type', 'Max Size', 'May be NULL', 'Key'])
+
+    def test_extract_fields_only_reads_layout_rows(self):
+        import extract_fields_only
+        basic = extract_fields_only.extract_fields(self.LAYOUT_TEXT)
+        rows = extract_fields_only.extract_fields(self.LAYOUT_TEXT, columns='all')
+        self.assertEqual(rows, basic)
+        self.assertEqual([(r.name, r.field_type, r.max_size, r.nullable, r.key) for r in rows], [
+            ('ACCESSIONNUMBER', 'ALPHANUMERIC (nnnnnnnnnn-nn-nnnnnn)', '20', 'No', '*'),
+            ('FILING_DATE', 'DATE (DD-MMM-YY)', '8', 'Yes', ''),
+        ])
+
+
 class TestWriteToCsv(unittest.TestCase):
     @patch('builtins.open', new_callable=mock_open)
     @patch('csv.DictWriter')
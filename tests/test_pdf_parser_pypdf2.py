@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import runpy
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pdf_parser_pypdf2
+from pdf_parser_pypdf2 import extract_text_from_pdf, iter_page_texts, page_ranges
+
+SAMPLE_PDF = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf'))
+
+class TestPyPDF2Extraction(unittest.TestCase):
+    def test_page_ranges_cover_every_page_once(self):
+        self.assertEqual(page_ranges(10, 3), [(0, 4), (4, 7), (7, 10)])
+        self.assertEqual(page_ranges(2, 8), [(0, 1), (1, 2)])
+        for count, chunks in ((1, 1), (9, 4), (100, 7)):
+            ranges = page_ranges(count, chunks)
+            self.assertEqual([p for start, stop in ranges for p in range(start, stop)], list(range(count)))
+
+    def test_parallel_matches_serial(self):
+        serial = extract_text_from_pdf(SAMPLE_PDF)
+        parallel = extract_text_from_pdf(SAMPLE_PDF, workers=2, min_pages=1)
+        self.assertTrue(serial)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial, "".join(f"{text}\n" for text in iter_page_texts(SAMPLE_PDF)))
+
+    def test_failing_and_empty_pages_do_not_stop_extraction(self):
+        texts = ['page one', None, ValueError('bad font')] + [f'page {n}' for n in range(4, 10)]
+        failures = []
+        with patch('PyPDF2._page.PageObject.extract_text', side_effect=texts), patch('builtins.print'):
+            text = extract_text_from_pdf(SAMPLE_PDF, failures=failures)
+        self.assertEqual(text.split('\n')[:4], ['page one', '', '[ERROR_EXTRACTING_PAGE:3:bad font]', 'page 4'])
+        self.assertEqual(failures, [(3, 'bad font')])
+
+    def test_debug_dump_is_opt_in(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                argv = ['pdf_parser_pypdf2.py', '--pdf_file', SAMPLE_PDF, '--csv_file', 'out.csv']
+                with patch.object(sys, 'argv', argv), patch('builtins.print'):
+                    runpy.run_path(pdf_parser_pypdf2.__file__, run_name='__main__')
+                self.assertTrue(os.path.exists('out.csv'))
+                self.assertFalse(os.path.exists('debug_extracted_text.txt'))
+                with patch.object(sys, 'argv', argv + ['--debug_text', 'text.txt']), patch('builtins.print'):
+                    runpy.run_path(pdf_parser_pypdf2.__file__, run_name='__main__')
+                self.assertTrue(os.path.exists('text.txt'))
+            finally:
+                os.chdir(cwd)
+
+if __name__ == '__main__':
+    unittest.main()
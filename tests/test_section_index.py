@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import section_index
+from section_index import SectionIndex
+from pdf_parser import parse_fields_from_text
+
+RAW_TEXT = os.path.join(os.path.dirname(__file__), '..', 'output', 'form_d_1-9_raw_text.txt')
+
+SAMPLE_TEXT = """
+Figure 1. Fields in the FIRST data file
+Field Name Field Description
+FIELD_A    Description A.
+
+Figure 2. Data relationships
+
+Figure 3. Fields in the SECOND data file
+Field Name Field Description
+FIELD_B    Description B. VARCHAR
+FIELD_C    Description C. INTEGER
+"""
+
+class TestSectionIndex(unittest.TestCase):
+    def test_index_records_sections_and_captions(self):
+        index = SectionIndex(SAMPLE_TEXT)
+        self.assertEqual(index.names(), ['FIRST', 'SECOND'])
+        self.assertEqual(len(index), 2)
+        self.assertEqual([(c.number, c.title) for c in index.captions],
+                         [(1, 'Fields in the FIRST data file'), (2, 'Data relationships'), (3, 'Fields in the SECOND data file')])
+        self.assertTrue(SAMPLE_TEXT.startswith('Figure 2.', index.captions[1].offset))
+        self.assertIn('second', index)
+
+    def test_only_requested_sections_are_parsed_and_memoized(self):
+        index = SectionIndex(SAMPLE_TEXT)
+        with patch('builtins.print'), patch('section_index.parse_section', wraps=section_index.parse_section) as spy:
+            first = index.fields('SECOND')
+            second = index.fields('second')
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual([f['Field Name'] for f in first], ['FIELD_B', 'FIELD_C'])
+        self.assertEqual(index.parsed_sections, 1)
+
+    def test_unknown_section(self):
+        with self.assertRaises(KeyError):
+            SectionIndex(SAMPLE_TEXT).fields('MISSING')
+
+    def test_matches_full_parse_on_real_text(self):
+        with open(RAW_TEXT, encoding='utf-8') as f:
+            text = f.read()
+        with patch('builtins.print'):
+            expected = parse_fields_from_text(text)
+            index = SectionIndex(text)
+            for name in index.names():
+                self.assertEqual(index.fields(name), [row for row in expected if row['Section'] == name])
+            self.assertEqual(index.all_fields(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
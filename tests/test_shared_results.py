@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pdf_parser
+from shared_results import encode_rows, publish_rows, publish_text, read_text, SharedRows, ChainedRows, SegmentNames
+from pdf_parser import parse_fields_from_text, parse_fields_from_text_parallel
+
+RAW_TEXT = os.path.join(os.path.dirname(__file__), '..', 'output', 'form_d_1-9_raw_text.txt')
+
+ROWS = [
+    {'Section': 'ISSUERS', 'Field Name': 'CIK', 'Field Description': 'Central Index Key — “quoted”.'},
+    {'Section': 'ISSUERS', 'Field Name': 'NAME', 'Field Description': ''},
+    {'Section': 'OFFERING', 'Field Name': 'CIK', 'Field Description': 'Same name, other section.'},
+]
+
+class TestSharedRows(unittest.TestCase):
+    def test_round_trip(self):
+        with SharedRows(publish_rows(ROWS)) as rows:
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(list(rows), ROWS)
+            self.assertEqual(rows[-1], ROWS[-1])
+            self.assertEqual(rows[0:2], ROWS[0:2])
+            with self.assertRaises(IndexError):
+                rows[3]
+
+    def test_repeated_strings_are_stored_once(self):
+        many = [dict(ROWS[0], **{'Field Name': f'F{i}'}) for i in range(100)]
+        encoded = bytes(encode_rows(many))
+        self.assertEqual(encoded.count(ROWS[0]['Field Description'].encode('utf-8')), 1)
+        self.assertEqual(encoded.count(b'ISSUERS'), 1)
+
+    def test_empty_rows(self):
+        with SharedRows(publish_rows([])) as rows:
+            self.assertEqual(list(rows), [])
+
+    def test_segment_is_unlinked_when_attached(self):
+        handle = publish_rows(ROWS)
+        rows = SharedRows(handle)
+        self.assertFalse(os.path.exists('/dev/shm/' + handle[0].lstrip('/')))
+        # The mapping stays readable until closed.
+        self.assertEqual(rows[1], ROWS[1])
+        rows.close()
+        rows.close()
+
+    def test_text_round_trip(self):
+        handle = publish_text("Field Name Field Description\n“quoted”\n")
+        self.assertEqual(read_text(handle), "Field Name Field Description\n“quoted”\n")
+        self.assertFalse(os.path.exists('/dev/shm/' + handle[0]))
+
+    def test_unattached_segments_are_unlinked(self):
+        segments = SegmentNames()
+        attached = SharedRows(publish_rows(ROWS, segments.new()))
+        lost = publish_text("never read", segments.new())
+        self.assertTrue(os.path.exists('/dev/shm/' + lost[0]))
+        self.assertEqual(segments.unlink_all(), 1)
+        self.assertFalse(os.path.exists('/dev/shm/' + lost[0]))
+        self.assertEqual(list(attached), ROWS)
+        attached.close()
+
+    def test_chained_rows(self):
+        chained = ChainedRows([ROWS[:1], [], ROWS[1:]])
+        self.assertEqual(len(chained), 3)
+        self.assertEqual([chained[i] for i in range(3)], ROWS)
+        self.assertEqual(list(chained), ROWS)
+
+class TestParallelSharedMemory(unittest.TestCase):
+    def test_parallel_parse_through_shared_memory_matches_serial(self):
+        with open(RAW_TEXT, encoding='utf-8') as f:
+            text = f.read()
+        with patch('sys.stdout', new_callable=io.StringIO):
+            expected = parse_fields_from_text(text)
+            rows = parse_fields_from_text_parallel(text, workers=2, min_sections=1, shared_memory=True)
+        try:
+            self.assertEqual(len(rows), len(expected))
+            self.assertEqual(list(rows), expected)
+        finally:
+            rows.close()
+
+    def test_failed_section_leaves_no_segments(self):
+        with open(RAW_TEXT, encoding='utf-8') as f:
+            text = f.read()
+        before = {name for name in os.listdir('/dev/shm') if name.startswith('pfr_')}
+        parse_section = pdf_parser.parse_section
+        def failing(section_name, *args, **kwargs):
+            if section_name == 'NUM':
+                raise ValueError("bad section")
+            return parse_section(section_name, *args, **kwargs)
+        # Threads instead of processes, so the patched parse_section is the one the jobs call.
+        with ThreadPoolExecutor(max_workers=2) as pool, patch('pdf_parser.parse_section', failing), \
+             patch('sys.stdout', new_callable=io.StringIO):
+            with self.assertRaises(ValueError):
+                parse_fields_from_text_parallel(text, pool=pool, min_sections=1, shared_memory=True)
+        self.assertEqual({name for name in os.listdir('/dev/shm') if name.startswith('pfr_')}, before)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from synthetic_guides import generate_guide, write_guide_pdf, replicate_pages, WRAP_PATTERNS
+from pdf_parser import parse_fields_from_text, ExtractionContext
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestSyntheticGuides(unittest.TestCase):
+    def test_parser_returns_expected_rows_for_every_wrap_pattern(self):
+        for wrap in WRAP_PATTERNS:
+            lines, expected = generate_guide(sections=3, fields_per_section=25, wrap=wrap, seed=7)
+            self.assertEqual(len(expected), 75)
+            self.assertEqual(parse_fields_from_text("\n".join(lines)), expected, wrap)
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(generate_guide(seed=3), generate_guide(seed=3))
+        self.assertNotEqual(generate_guide(seed=3)[0], generate_guide(seed=4)[0])
+        with self.assertRaises(ValueError):
+            generate_guide(wrap='diagonal')
+
+    def test_pdf_round_trip(self):
+        lines, expected = generate_guide(sections=2, fields_per_section=30, seed=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, 'guide.pdf')
+            pages = write_guide_pdf(lines, pdf_path, lines_per_page=40)
+            with open(pdf_path, 'rb') as in_file:
+                page_texts = ExtractionContext().extract_pages(in_file)
+        self.assertEqual(len(page_texts), pages)
+        self.assertGreater(pages, 1)
+        self.assertEqual(parse_fields_from_text(''.join(page_texts)), expected)
+
+    def test_replicate_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = os.path.join(tmp, 'big.pdf')
+            replicate_pages(SAMPLE_PDF, pdf_path, 20)
+            with open(pdf_path, 'rb') as in_file:
+                page_texts = ExtractionContext().extract_pages(in_file)
+        self.assertEqual(len(page_texts), 20)
+        self.assertEqual(page_texts[0], page_texts[9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from text_store import TextStore, document_key
+import batch_parser
+from batch_parser import run_batch
+from pdf_parser import ExtractionContext
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+PAGES = ['First page\n', 'Zweite Seite — ü\n', '', 'Last page\n']
+
+class TestTextStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'corpus.store')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_plain_and_compressed(self):
+        with TextStore(self.path) as store:
+            store.add_document('a.pdf', PAGES)
+            store.add_document('b.pdf', PAGES, compress=True)
+            for doc in ('a.pdf', 'b.pdf'):
+                self.assertEqual(store.pages(doc), PAGES)
+                self.assertEqual(store.page(doc, 1), PAGES[1])
+                self.assertEqual(store.text(doc), ''.join(PAGES))
+            self.assertEqual(len(store), 2)
+        with TextStore(self.path) as reopened:
+            self.assertEqual(reopened.pages('b.pdf'), PAGES)
+
+    def test_readd_replaces_and_refresh_sees_other_writers(self):
+        reader = TextStore(self.path)
+        with TextStore(self.path) as writer:
+            writer.add_document('a.pdf', PAGES)
+            writer.add_document('a.pdf', ['new\n'])
+        self.assertNotIn('a.pdf', reader)
+        reader.refresh()
+        self.assertEqual(reader.pages('a.pdf'), ['new\n'])
+        reader.close()
+
+    def test_add_does_not_reread_the_index(self):
+        with TextStore(self.path) as store, \
+             patch.object(TextStore, 'refresh', side_effect=AssertionError("index read again")):
+            for n in range(50):
+                store.add_document(f'{n}.pdf', PAGES)
+            self.assertFalse(store.refresh_if_changed())
+            self.assertEqual(len(store), 50)
+            self.assertEqual(store.pages('49.pdf'), PAGES)
+
+    def test_reader_sees_a_readded_document(self):
+        with TextStore(self.path) as writer:
+            writer.add_document('a.pdf', PAGES)
+            with patch.dict(batch_parser._text_stores, clear=True):
+                self.assertEqual(batch_parser._stored_pages(self.path, 'a.pdf'), PAGES)
+                writer.add_document('a.pdf', ['new\n'])
+                self.assertEqual(batch_parser._stored_pages(self.path, 'a.pdf'), ['new\n'])
+                batch_parser._text_stores[self.path].close()
+
+    def test_interrupted_index_line_is_ignored(self):
+        with TextStore(self.path) as store:
+            store.add_document('a.pdf', PAGES)
+        with open(self.path + '.idx', 'a', encoding='utf-8') as f:
+            f.write('{"doc": "b.pdf", "pag')
+        with TextStore(self.path) as store:
+            self.assertEqual(list(store.documents), ['a.pdf'])
+
+    def test_is_current_tracks_source_changes(self):
+        source = os.path.join(self.tmp.name, 'source.pdf')
+        with open(source, 'wb') as f:
+            f.write(b'%PDF-1.4')
+        with TextStore(self.path) as store:
+            store.add_document('source.pdf', PAGES, source_path=source)
+            self.assertTrue(store.is_current('source.pdf', source))
+            with open(source, 'ab') as f:
+                f.write(b'more')
+            self.assertFalse(store.is_current('source.pdf', source))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a store')
+        with self.assertRaises(ValueError):
+            TextStore(self.path)
+
+    def test_batch_from_store_matches_extraction(self):
+        with open(SAMPLE_PDF, 'rb') as in_file:
+            page_texts = ExtractionContext().extract_pages(in_file)
+        with TextStore(self.path) as store:
+            store.add_document(document_key(SAMPLE_PDF), page_texts, compress=True)
+        extracted = run_batch([SAMPLE_PDF], os.path.join(self.tmp.name, 'a'))['documents'][0]
+        # The profile is picked from the stored text alone; the PDF is not parsed again.
+        with patch('pdfminer.pdfdocument.PDFDocument') as reader, patch('pdf_parser.PDFDocument') as parser:
+            stored = run_batch([SAMPLE_PDF], os.path.join(self.tmp.name, 'b'), from_store=self.path)['documents'][0]
+        reader.assert_not_called()
+        parser.assert_not_called()
+        self.assertEqual(stored['status'], 'ok')
+        self.assertEqual((stored['pages'], stored['fields'], stored['profile']),
+                         (extracted['pages'], extracted['fields'], extracted['profile']))
+        with open(os.path.join(self.tmp.name, 'a', 'Form_D_pages_1-9.csv'), encoding='utf-8') as a, \
+             open(os.path.join(self.tmp.name, 'b', 'Form_D_pages_1-9.csv'), encoding='utf-8') as b:
+            self.assertEqual(a.read(), b.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import shutil
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from watch_folder import FolderWatcher, InotifyWakeup, load_manifest
+from text_store import TextStore, document_key
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), '..', 'pdfs', 'Form_D_pages_1-9.pdf')
+
+class TestFolderWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, 'incoming')
+        self.output_dir = os.path.join(self.tmp.name, 'out')
+        os.makedirs(self.input_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def watcher(self, **kwargs):
+        kwargs.setdefault('settle_seconds', 0)
+        kwargs.setdefault('use_inotify', False)
+        return FolderWatcher(self.input_dir, self.output_dir, **kwargs)
+
+    def test_new_files_are_processed_once(self):
+        pdf = shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+        watcher = self.watcher()
+        self.assertEqual(watcher.step(), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'a.csv')))
+        self.assertEqual(watcher.processed[pdf]['status'], 'ok')
+        self.assertEqual(watcher.step(), 0)
+        watcher.close()
+        # A restarted watcher reads the manifest and does not reprocess the file.
+        restarted = self.watcher()
+        self.assertEqual(restarted.step(), 0)
+        restarted.close()
+        self.assertEqual(len(load_manifest(os.path.join(self.output_dir, 'watch_manifest.jsonl'))), 1)
+
+    def test_changed_files_are_reprocessed(self):
+        pdf = shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+        watcher = self.watcher()
+        watcher.step()
+        stat = os.stat(pdf)
+        os.utime(pdf, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(watcher.step(), 1)
+        watcher.close()
+        with open(watcher.manifest_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_failed_files_are_retried_a_bounded_number_of_times(self):
+        pdf = shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+        failure = {'pdf_file': pdf, 'status': 'error', 'error': 'disk busy'}
+        watcher = self.watcher(max_attempts=2)
+        with patch('watch_folder.process_document', return_value=failure):
+            self.assertEqual((watcher.step(), watcher.step(), watcher.step()), (1, 1, 0))
+        self.assertEqual((watcher.processed[pdf]['status'], watcher.processed[pdf]['attempts']), ('error', 2))
+        watcher.close()
+        # A transient failure is retried, and the success is recorded.
+        watcher = self.watcher()
+        self.assertEqual(watcher.processed[pdf]['attempts'], 2)
+        self.assertEqual(watcher.step(), 1)
+        self.assertEqual((watcher.processed[pdf]['status'], watcher.processed[pdf]['attempts']), ('ok', 3))
+        self.assertEqual(watcher.step(), 0)
+        watcher.close()
+
+    def test_partially_written_files_wait(self):
+        partial = os.path.join(self.input_dir, 'a.pdf')
+        with open(SAMPLE_PDF, 'rb') as f:
+            data = f.read()
+        with open(partial, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        watcher = self.watcher(settle_seconds=5)
+        self.assertEqual(watcher.scan(now=0), [])
+        self.assertEqual(watcher.scan(now=10), [])  # settled, but no %%EOF yet
+        with open(partial, 'ab') as f:
+            f.write(data[len(data) // 2:])
+        self.assertEqual(watcher.scan(now=11), [])  # changed: the settle clock restarts
+        self.assertEqual(watcher.scan(now=16), [partial])
+        watcher.close()
+
+    def test_store_is_reused_as_extraction_cache(self):
+        pdf = shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+        store = os.path.join(self.tmp.name, 'corpus.store')
+        watcher = self.watcher(store=store)
+        watcher.step()
+        self.assertFalse(watcher.processed[pdf]['from_store'])
+        fields = watcher.processed[pdf]['fields']
+        watcher.close()
+        with TextStore(store) as reader:
+            self.assertIn(document_key(pdf), reader)
+        # Output lost and manifest gone: the document is parsed again, from the stored text.
+        os.remove(os.path.join(self.output_dir, 'watch_manifest.jsonl'))
+        watcher = self.watcher(store=store)
+        watcher.step()
+        self.assertTrue(watcher.processed[pdf]['from_store'])
+        self.assertEqual(watcher.processed[pdf]['fields'], fields)
+        watcher.close()
+
+    def test_run_with_worker_pool(self):
+        pdf = shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+        watcher = self.watcher(workers=2, poll_interval=0.05, use_inotify=True)
+        watcher.run(idle_exit=0.2, duration=60)
+        self.assertEqual(watcher.processed[pdf]['status'], 'ok')
+        self.assertGreater(watcher.processed[pdf]['fields'], 0)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "inotify is Linux only")
+    def test_inotify_wakes_on_new_file(self):
+        wakeup = InotifyWakeup(self.input_dir)
+        try:
+            self.assertFalse(wakeup.wait(0))
+            shutil.copy(SAMPLE_PDF, os.path.join(self.input_dir, 'a.pdf'))
+            self.assertTrue(wakeup.wait(1))
+        finally:
+            wakeup.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import mmap
+import zlib
+import argparse
+
+_MAGIC = b'PDFTEXTSTORE1\n'
+
+def document_key(pdf_path):
+    """The key a PDF's text is stored under: its normalized path as given."""
+    return os.path.normpath(pdf_path)
+
+class TextStore:
+    """
+    Append-only store of extracted page texts for a corpus, read through mmap.
+
+    `path` holds the page texts back to back (UTF-8, or zlib-compressed per page);
+    `path + '.idx'` holds one JSON line per stored document with the offset and length
+    of each of its pages. Adding a document appends its pages and then its index line,
+    so an interrupted write never leaves a readable but truncated document. Storing a
+    document again appends a new copy and the index points at the latest one. Readers
+    pick up documents added by other processes with refresh() or refresh_if_changed().
+
+    One process should write at a time; any number may read.
+
+    Example:
+        with TextStore('output/corpus.store') as store:
+            store.add_document('pdfs/a.pdf', page_texts, compress=True)
+            text = store.text('pdfs/a.pdf')
+    """
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.documents = {}
+        self._file = None
+        self._map = None
+        self._mapped_size = 0
+        self._read_signature = None
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(_MAGIC)
+            open(self.index_path, 'a').close()
+        self._file = open(path, 'rb')
+        if self._file.read(len(_MAGIC)) != _MAGIC:
+            self._file.close()
+            raise ValueError(f"'{path}' is not a text store")
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the index and remaps the data file, picking up documents added since opening."""
+        documents = {}
+        signature = self._index_signature()
+        if signature is not None:
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A partially written last line from an interrupted add.
+                        continue
+                    documents[entry['doc']] = entry
+        self.documents = documents
+        self._read_signature = signature
+        self._remap()
+
+    def refresh_if_changed(self):
+        """Refreshes only if the index file's size or mtime changed since it was last read. Returns True if it did."""
+        if self._index_signature() == self._read_signature:
+            return False
+        self.refresh()
+        return True
+
+    def _index_signature(self):
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _remap(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size != self._mapped_size:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+
+    def add_document(self, doc, page_texts, compress=False, source_path=None):
+        """
+        Appends a document's page texts and indexes them under `doc`.
+
+        Args:
+            doc (str): Document key, e.g. document_key(pdf_path).
+            page_texts (list): Page texts in page order.
+            compress (bool): zlib-compress each page.
+            source_path (str, optional): The PDF the text came from; its size and mtime are
+                recorded so callers can tell whether the stored text is stale.
+        """
+        pages = []
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            for text in page_texts:
+                data = text.encode('utf-8')
+                if compress:
+                    data = zlib.compress(data)
+                f.write(data)
+                pages.append([offset, len(data)])
+                offset += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+        entry = {'doc': doc, 'codec': 'zlib' if compress else 'utf-8', 'pages': pages}
+        if source_path is not None:
+            stat = os.stat(source_path)
+            entry['source_size'] = stat.st_size
+            entry['source_mtime'] = stat.st_mtime
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            unchanged = f.tell() == (self._read_signature or (0,))[0]
+            f.write(json.dumps(entry) + '\n')
+        # The new entry goes straight into the in-memory index. If another writer appended
+        # since the index was read, the signature stays stale and the next
+        # refresh_if_changed reads the whole index again.
+        self.documents[doc] = entry
+        if unchanged:
+            self._read_signature = self._index_signature()
+        self._remap()
+
+    def is_current(self, doc, source_path):
+        """True if `doc` is stored and source_path has not changed size or mtime since."""
+        entry = self.documents.get(doc)
+        if entry is None or 'source_size' not in entry:
+            return False
+        stat = os.stat(source_path)
+        return entry['source_size'] == stat.st_size and entry['source_mtime'] == stat.st_mtime
+
+    def __contains__(self, doc):
+        return doc in self.documents
+
+    def __len__(self):
+        return len(self.documents)
+
+    def page_count(self, doc):
+        return len(self.documents[doc]['pages'])
+
+    def page(self, doc, page_index):
+        """Returns one page's text (0-based page_index). Raises KeyError for an unknown document."""
+        entry = self.documents[doc]
+        offset, length = entry['pages'][page_index]
+        data = self._map[offset:offset + length]
+        if entry['codec'] == 'zlib':
+            data = zlib.decompress(data)
+        return data.decode('utf-8')
+
+    def pages(self, doc):
+        """Returns all of a document's page texts."""
+        return [self.page(doc, i) for i in range(self.page_count(doc))]
+
+    def text(self, doc):
+        """Returns a document's full text, as extract_text_from_pdf would."""
+        return ''.join(self.pages(doc))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract PDFs into an append-only text store, or list a store's documents.")
+    parser.add_argument("--store", type=str, required=True, help="Path of the store file (created if missing; the index is STORE.idx).")
+    parser.add_argument("--input_dir", type=str, default=None, help="Extract every PDF in this directory into the store.")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress each stored page.")
+    parser.add_argument("--force", action="store_true", help="Re-extract documents whose stored text is still current.")
+    parser.add_argument("--list", action="store_true", help="List the stored documents.")
+    args = parser.parse_args()
+
+    with TextStore(args.store) as store:
+        if args.input_dir:
+            from pdf_parser import get_worker_context
+            from batch_parser import find_pdfs
+            if not os.path.isdir(args.input_dir):
+                print(f"Error: Input directory not found: {args.input_dir}")
+                sys.exit(1)
+            context = get_worker_context()
+            for pdf_path in find_pdfs(args.input_dir):
+                doc = document_key(pdf_path)
+                if not args.force and store.is_current(doc, pdf_path):
+                    print(f"  {doc}: unchanged, skipped")
+                    continue
+                try:
+                    with open(pdf_path, 'rb') as in_file:
+                        page_texts = context.extract_pages(in_file)
+                except Exception as e:
+                    print(f"  {doc}: extraction failed: {e}")
+                    continue
+                store.add_document(doc, page_texts, compress=args.compress, source_path=pdf_path)
+                print(f"  {doc}: stored {len(page_texts)} pages")
+        if args.list:
+            for doc, entry in store.documents.items():
+                size = sum(length for _, length in entry['pages'])
+                print(f"  {doc}: {len(entry['pages'])} pages, {size} bytes ({entry['codec']})")
@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import errno
+import select
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from batch_parser import _init_worker, process_document, find_pdfs, csv_path_for
+from text_store import TextStore, document_key
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+
+class InotifyWakeup:
+    """
+    Wakes the watcher when something changes in a directory, using Linux inotify through libc.
+
+    Events are only used as a wake-up; the watcher always rescans the directory, so a missed
+    or coalesced event costs latency, never correctness. Raises OSError where inotify is not
+    available, and the watcher falls back to polling.
+    """
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        """Blocks until an event arrives or timeout seconds pass. Returns True on an event."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+class PollingWakeup:
+    """Sleeps for the poll interval; used where inotify is not available."""
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return False
+
+    def close(self):
+        pass
+
+def _looks_complete(pdf_path):
+    """True if the file ends with a %%EOF marker, as a fully written PDF does."""
+    try:
+        with open(pdf_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 1024))
+            return b'%%EOF' in f.read()
+    except OSError:
+        return False
+
+def load_manifest(manifest_path):
+    """Returns {pdf_file: latest entry} from a watch manifest, skipping unreadable lines."""
+    entries = {}
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['pdf_file']] = entry
+    return entries
+
+class FolderWatcher:
+    """
+    Processes PDFs as they land in a directory, and again whenever they change.
+
+    Each scan compares the directory's PDFs with the manifest. A new or changed file is
+    queued once its size and mtime have stayed the same for `settle_seconds` and it ends
+    with %%EOF, so files still being copied in are left alone. Queued files go to a pool of
+    batch_parser workers, whose long-lived ExtractionContexts keep their font caches across
+    documents. Each result is written to its CSV and appended to the JSON-lines manifest as
+    soon as it finishes. Files whose size and mtime match their manifest entry are never
+    reprocessed, including after a restart. A file that failed (status other than 'ok')
+    is retried, after settling again, until it has been tried `max_attempts` times; the
+    manifest entry counts the tries under 'attempts'.
+
+    With `store` (a text_store.py path), extracted page texts are kept in the store and a
+    document whose stored text is still current is parsed from the store without extraction.
+
+    Example:
+        watcher = FolderWatcher('incoming', 'output/watch', workers=4)
+        watcher.run()
+    """
+    def __init__(self, input_dir, output_dir, workers=1, poll_interval=1.0, settle_seconds=2.0,
+                 manifest=None, store=None, use_inotify=True, verbose=False, max_attempts=3):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.manifest_path = manifest or os.path.join(output_dir, 'watch_manifest.jsonl')
+        self.store_path = store
+        self.verbose = verbose
+        self.max_attempts = max_attempts
+        os.makedirs(output_dir, exist_ok=True)
+        self.processed = load_manifest(self.manifest_path)
+        self._pending = {}
+        self._running = {}
+        self._pool = None
+        self._store = TextStore(store) if store else None
+        self._wakeup = PollingWakeup()
+        if use_inotify:
+            try:
+                self._wakeup = InotifyWakeup(input_dir)
+            except OSError:
+                pass
+
+    @property
+    def mode(self):
+        return 'inotify' if isinstance(self._wakeup, InotifyWakeup) else 'polling'
+
+    def _same_file(self, pdf_path, stat):
+        """The file's manifest entry if it has the file's current size and mtime, else None."""
+        entry = self.processed.get(pdf_path)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return entry
+        return None
+
+    def _is_unchanged(self, pdf_path, stat):
+        """True if this version of the file is done: processed, or out of attempts."""
+        entry = self._same_file(pdf_path, stat)
+        return entry is not None and (entry['status'] == 'ok' or entry.get('attempts', 1) >= self.max_attempts)
+
+    def scan(self, now=None):
+        """
+        Checks the directory once and returns the PDFs that are ready to process.
+
+        A file is ready when it is new or changed, not already being processed, and has
+        settled: same size and mtime as when first seen at least settle_seconds ago.
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        present = set()
+        for pdf_path in find_pdfs(self.input_dir):
+            present.add(pdf_path)
+            try:
+                stat = os.stat(pdf_path)
+            except OSError:
+                continue
+            if pdf_path in self._running or self._is_unchanged(pdf_path, stat):
+                self._pending.pop(pdf_path, None)
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+            seen = self._pending.get(pdf_path)
+            if seen is None or seen['signature'] != signature:
+                # New, or still being written: restart the settle clock.
+                self._pending[pdf_path] = {'signature': signature, 'since': now,
+                                           'detected': seen['detected'] if seen else time.time()}
+                if self.settle_seconds > 0:
+                    continue
+                seen = self._pending[pdf_path]
+            if now - seen['since'] >= self.settle_seconds and stat.st_size > 0 and _looks_complete(pdf_path):
+                ready.append(pdf_path)
+        for pdf_path in list(self._pending):
+            if pdf_path not in present:
+                del self._pending[pdf_path]
+        return ready
+
+    def _options(self, pdf_path):
+        if self._store is None:
+            return {}
+        if self._store.is_current(document_key(pdf_path), pdf_path):
+            return {'from_store': self.store_path}
+        return {'return_pages': True}
+
+    def _submit(self, pdf_path):
+        stat = os.stat(pdf_path)
+        pending = self._pending.pop(pdf_path)
+        args = (pdf_path, csv_path_for(pdf_path, self.output_dir))
+        options = self._options(pdf_path)
+        if self._pool is None:
+            self._finish(pdf_path, stat, pending['detected'], options, process_document(*args, **options))
+        else:
+            future = self._pool.submit(process_document, *args, **options)
+            self._running[pdf_path] = (future, stat, pending['detected'], options)
+
+    def _finish(self, pdf_path, stat, detected, options, record):
+        page_texts = record.pop('page_texts', None)
+        if page_texts is not None and self._store is not None:
+            self._store.add_document(document_key(pdf_path), page_texts, compress=True, source_path=pdf_path)
+        previous = self._same_file(pdf_path, stat)
+        entry = {
+            'pdf_file': pdf_path,
+            'csv_file': record.get('csv_file'),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'status': record.get('status'),
+            'error': record.get('error'),
+            'attempts': previous.get('attempts', 1) + 1 if previous is not None else 1,
+            'pages': record.get('pages', 0),
+            'fields': record.get('fields', 0),
+            'from_store': 'from_store' in options,
+            'extract_seconds': record.get('extract_seconds'),
+            'parse_seconds': record.get('parse_seconds'),
+            'latency_seconds': round(time.time() - detected, 3),
+            'processed_at': time.time(),
+        }
+        self.processed[pdf_path] = entry
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        if entry['status'] == 'ok':
+            print(f"  {pdf_path}: {entry['fields']} fields from {entry['pages']} pages ({entry['latency_seconds']}s after it landed)")
+        else:
+            retry = " (will retry)" if entry['attempts'] < self.max_attempts else ""
+            print(f"  {pdf_path}: {entry['status']} {entry['error'] or ''}".rstrip() + retry)
+        return entry
+
+    def _collect(self, timeout=0):
+        """Records finished documents; waits up to timeout seconds for one."""
+        if not self._running:
+            return 0
+        futures = {running[0]: pdf_path for pdf_path, running in self._running.items()}
+        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            pdf_path = futures[future]
+            _, stat, detected, options = self._running.pop(pdf_path)
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {'pdf_file': pdf_path, 'status': 'error', 'error': str(e)}
+            self._finish(pdf_path, stat, detected, options, record)
+        return len(done)
+
+    def step(self):
+        """One scan: submits ready files and records any that have finished. Returns the number submitted."""
+        ready = self.scan()
+        for pdf_path in ready:
+            self._submit(pdf_path)
+        self._collect()
+        return len(ready)
+
+    def run(self, duration=None, idle_exit=None):
+        """
+        Watches until interrupted, for `duration` seconds, or until nothing has been pending
+        or running for `idle_exit` seconds.
+        """
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.verbose,))
+        else:
+            _init_worker(self.verbose)
+        start = last_busy = time.monotonic()
+        try:
+            while True:
+                self.step()
+                now = time.monotonic()
+                if self._pending or self._running:
+                    last_busy = now
+                if duration is not None and now - start >= duration:
+                    break
+                if idle_exit is not None and now - last_busy >= idle_exit:
+                    break
+                if self._running:
+                    # Finished documents are recorded as soon as they complete.
+                    self._collect(timeout=self.poll_interval)
+                elif self._pending:
+                    # Re-check partially written files once they could have settled.
+                    time.sleep(min(self.poll_interval, max(self.settle_seconds, 0.05)))
+                else:
+                    self._wakeup.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopping watcher...")
+        finally:
+            self.close()
+
+    def close(self):
+        if self._pool is not None:
+            while self._running:
+                self._collect(timeout=None)
+            self._pool.shutdown()
+            self._pool = None
+        self._wakeup.close()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a directory and parse new or changed PDFs into per-document CSV files.")
+    parser.add_argument("--input_dir", type=str, required=True, help="Directory to watch for PDF files.")
+    parser.add_argument("--output_dir", type=str, required=True, help="Directory for the output CSV files and the manifest.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--poll_interval", type=float, default=1.0, help="Seconds between directory scans when inotify is not used (default: 1).")
+    parser.add_argument("--settle_seconds", type=float, default=2.0,
+                        help="A file must keep the same size and mtime this long before it is processed (default: 2).")
+    parser.add_argument("--manifest", type=str, default=None, help="JSON-lines manifest (default: OUTPUT_DIR/watch_manifest.jsonl).")
+    parser.add_argument("--store", type=str, default=None, help="Keep extracted text in this text store and reuse it when it is current.")
+    parser.add_argument("--max_attempts", type=int, default=3,
+                        help="Times a file that fails is tried before it is left alone until it changes (default: 3).")
+    parser.add_argument("--no_inotify", action="store_true", help="Always poll, even where inotify is available.")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds (default: run until interrupted).")
+    parser.add_argument("--verbose", action="store_true", help="Keep the parser's DEBUG output.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    watcher = FolderWatcher(args.input_dir, args.output_dir, workers=args.workers, poll_interval=args.poll_interval,
+                            settle_seconds=args.settle_seconds, manifest=args.manifest, store=args.store,
+                            use_inotify=not args.no_inotify, verbose=args.verbose, max_attempts=args.max_attempts)
+    print(f"Watching '{args.input_dir}' ({watcher.mode}, {args.workers} worker(s)); {len(watcher.processed)} file(s) already in the manifest.")
+    watcher.run(duration=args.duration)